@@ -0,0 +1,203 @@
+"""
+HistoryManager — bounded conversation history for the interviewer prompt.
+
+The prompt carries the system prompt, a rolling summary of older turns and
+the last HISTORY_KEEP_TURNS exchanges verbatim, trimmed to the model's token
+budget. Only messages newer than the summary are read from the database.
+Whenever HISTORY_SUMMARIZE_EVERY exchanges have fallen out of the verbatim
+window, a background task folds them into the summary with a small model.
+"""
+
+import asyncio
+from datetime import datetime
+from core.config import settings
+from core.database import connect
+from core.llm import llm_client, estimate_tokens
+
+SUMMARY_PROMPT = """You maintain a running summary of a job interview for the interviewer.
+Update the summary with the new exchanges below. Keep: topics and questions already
+covered, key facts and claims from the candidate's answers, notable strengths or
+weaknesses, and anything the interviewer promised to come back to. Write compact
+plain prose, at most 200 words. Return only the updated summary.
+
+CURRENT SUMMARY:
+{summary}
+
+NEW EXCHANGES:
+{exchanges}"""
+
+# Offline fallback: keep this much of each message and of the whole summary
+FALLBACK_LINE_CHARS = 160
+FALLBACK_SUMMARY_CHARS = 2400
+
+
+def _label(role: str) -> str:
+    return "Interviewer" if role == "ai" else "Candidate"
+
+
+class HistoryManager:
+    def __init__(
+        self,
+        keep_turns: int,
+        summarize_every: int,
+        budgets: dict,
+        default_budget: int,
+        summary_model: str,
+    ):
+        self.keep_turns = keep_turns
+        self.summarize_every = summarize_every
+        self.budgets = budgets
+        self.default_budget = default_budget
+        self.summary_model = summary_model
+        self._running = set()  # interview ids with a summary update in flight
+        self._tasks = set()
+
+    def budget_for(self, model: str) -> int:
+        return self.budgets.get(model, self.default_budget)
+
+    # ─── Prompt ──────────────────────────────────────────────────────────────
+
+    def load(self, db, interview_id: int) -> tuple:
+        """Returns (summary, turns) — turns are the messages newer than the summary."""
+        row = db.execute(
+            "SELECT summary, covered_message_id FROM interview_summaries WHERE interview_id = ?",
+            (interview_id,),
+        ).fetchone()
+        summary, covered = (row["summary"], row["covered_message_id"]) if row else ("", 0)
+        msgs = db.execute(
+            "SELECT id, role, content FROM interview_messages WHERE interview_id = ? AND id > ? ORDER BY id",
+            (interview_id, covered),
+        ).fetchall()
+        return summary, [dict(m) for m in msgs]
+
+    def compose(
+        self,
+        interview_id: int,
+        system_prompt: str,
+        summary: str,
+        turns: list,
+        model: str,
+        on_summary=None,
+    ) -> list:
+        """
+        Assemble the prompt history from a summary and the stored turns after it
+        ({"role", "content"} rows), scheduling a summary update when due.
+        """
+        head = [{"role": "system", "content": system_prompt}]
+        if summary:
+            head.append(
+                {"role": "system", "content": f"[SUMMARY OF THE INTERVIEW SO FAR]: {summary}"}
+            )
+        messages = [
+            {"role": "assistant" if m["role"] == "ai" else m["role"], "content": m["content"]}
+            for m in turns
+        ]
+        keep = self.keep_turns * 2
+        split = max(len(messages) - keep, 0)
+        older, recent = messages[:split], messages[split:]
+
+        # Not-yet-summarized turns go first when over budget, then the oldest
+        # recent ones — but the latest exchange is always sent
+        budget = self.budget_for(model)
+        while older and estimate_tokens(head + older + recent) > budget:
+            older.pop(0)
+        while len(recent) > 2 and estimate_tokens(head + recent) > budget:
+            recent.pop(0)
+
+        if split >= self.summarize_every * 2:
+            self.schedule_update(interview_id, on_summary)
+        return head + older + recent
+
+    # ─── Rolling summary ─────────────────────────────────────────────────────
+
+    def schedule_update(self, interview_id: int, on_summary=None):
+        if interview_id in self._running:
+            return
+        self._running.add(interview_id)
+        task = asyncio.get_running_loop().create_task(
+            self.update_summary(interview_id, on_summary)
+        )
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def update_summary(self, interview_id: int, on_summary=None):
+        """
+        Fold messages that left the verbatim window into the stored summary.
+        on_summary(summary, covered_message_id) is called after it is saved.
+        """
+        self._running.add(interview_id)
+        try:
+            conn = connect()
+            try:
+                row = conn.execute(
+                    "SELECT summary, covered_message_id FROM interview_summaries WHERE interview_id = ?",
+                    (interview_id,),
+                ).fetchone()
+                summary, covered = (row["summary"], row["covered_message_id"]) if row else ("", 0)
+                msgs = conn.execute(
+                    "SELECT id, role, content FROM interview_messages WHERE interview_id = ? AND id > ? ORDER BY id",
+                    (interview_id, covered),
+                ).fetchall()
+                fold = msgs[: len(msgs) - self.keep_turns * 2]
+                if not fold:
+                    return
+
+                summary = await self._summarize(summary, fold)
+                conn.execute(
+                    """INSERT INTO interview_summaries (interview_id, summary, covered_message_id, updated_at)
+                       VALUES (?, ?, ?, ?)
+                       ON CONFLICT(interview_id) DO UPDATE SET
+                       summary = excluded.summary,
+                       covered_message_id = excluded.covered_message_id,
+                       updated_at = excluded.updated_at""",
+                    (interview_id, summary, fold[-1]["id"], datetime.utcnow().isoformat()),
+                )
+                conn.commit()
+                if on_summary is not None:
+                    on_summary(summary, fold[-1]["id"])
+            finally:
+                conn.close()
+        except Exception as e:
+            print(f"History summary error: {e}")
+        finally:
+            self._running.discard(interview_id)
+
+    async def _summarize(self, summary: str, fold: list) -> str:
+        exchanges = "\n".join(f"{_label(m['role'])}: {m['content']}" for m in fold)
+        if llm_client.enabled:
+            try:
+                text = await llm_client.chat(
+                    model=self.summary_model,
+                    messages=[
+                        {
+                            "role": "user",
+                            "content": SUMMARY_PROMPT.format(
+                                summary=summary or "(none yet)", exchanges=exchanges
+                            ),
+                        }
+                    ],
+                    max_tokens=400,
+                    temperature=0.2,
+                )
+                return text.strip()
+            except Exception as e:
+                print(f"GROQ Error: {e}")
+
+        # No LLM: keep a truncated transcript, newest lines win
+        lines = [
+            f"{_label(m['role'])}: {' '.join(m['content'].split())[:FALLBACK_LINE_CHARS]}"
+            for m in fold
+        ]
+        return "\n".join(filter(None, [summary, *lines]))[-FALLBACK_SUMMARY_CHARS:]
+
+    def delete(self, db, interview_id: int):
+        db.execute("DELETE FROM interview_summaries WHERE interview_id = ?", (interview_id,))
+
+
+history_manager = HistoryManager(
+    keep_turns=settings.HISTORY_KEEP_TURNS,
+    summarize_every=settings.HISTORY_SUMMARIZE_EVERY,
+    budgets=settings.HISTORY_TOKEN_BUDGETS,
+    default_budget=settings.HISTORY_DEFAULT_TOKEN_BUDGET,
+    summary_model=settings.HISTORY_SUMMARY_MODEL,
+)
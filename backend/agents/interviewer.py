@@ -2,28 +2,94 @@
 InterviewerAgent — RAG-aware, time-limited, type-aware AI interviewer.
 """
 
+import asyncio
 import os
-import uuid
-from gtts import gTTS
+import re
+import time
 from core.config import settings
+from core.llm import llm_client, estimate_tokens
+from core.llm_scheduler import INTERACTIVE
+from core.cassette import cassette
+from core.storage import storage
+from agents.tts import tts
+from agents.tts_cache import tts_cache
+
+FALLBACK_QUESTIONS = [
+    "Can you walk me through a challenging project you've worked on?",
+    "How do you approach debugging complex issues?",
+    "Describe your experience with the technologies listed on your resume.",
+    "What is your greatest professional achievement so far?",
+    "Where do you see yourself in 5 years?",
+]
+ERROR_FALLBACK = "Thank you for your response. Let's continue — can you tell me about a time you had to learn something new quickly?"
+INTERVIEW_MODEL = "llama-3.3-70b-versatile"
+CLOSE_TEXT = "Time is up! Thank you for your responses today. Your interview session has ended. Your detailed report will be ready shortly."
+
+# Sentence boundary: terminal punctuation followed by whitespace and a capital
+SENTENCE_END = re.compile(r"(?<=[.!?])\s+(?=[A-Z\"'])")
+
+
+def split_sentences(text: str) -> tuple:
+    """Split off complete sentences. Returns (sentences, unfinished_remainder)."""
+    parts = SENTENCE_END.split(text)
+    return parts[:-1], parts[-1]
+
+
+class SpeechPipeline:
+    """
+    Voices a streamed reply sentence by sentence. Each complete sentence is
+    synthesized in a worker thread while the model keeps generating, and the
+    resulting segments are handed out strictly in order.
+    """
+
+    def __init__(self, agent, min_chars: int = 24):
+        self.agent = agent
+        self.min_chars = min_chars
+        self._buffer = ""
+        self._pending = ""  # complete sentences too short to voice on their own
+        self._tasks = []
+        self._emitted = 0
+
+    def feed(self, delta: str):
+        self._buffer += delta
+        sentences, self._buffer = split_sentences(self._buffer)
+        for sentence in sentences:
+            self._pending = f"{self._pending} {sentence}".strip()
+            if len(self._pending) >= self.min_chars:
+                self._submit(self._pending)
+                self._pending = ""
+
+    def _submit(self, text: str):
+        self._tasks.append(asyncio.create_task(asyncio.to_thread(self.agent.text_to_audio, text)))
+
+    def ready(self) -> list:
+        """Segments finished since the last call, in order: [(index, path)]."""
+        out = []
+        while self._emitted < len(self._tasks) and self._tasks[self._emitted].done():
+            out.append((self._emitted, self._tasks[self._emitted].result()))
+            self._emitted += 1
+        return out
+
+    async def finish(self):
+        """Voice whatever is left and yield the remaining segments in order."""
+        tail = f"{self._pending} {self._buffer}".strip()
+        self._pending = self._buffer = ""
+        if tail:
+            self._submit(tail)
+        while self._emitted < len(self._tasks):
+            path = await self._tasks[self._emitted]
+            yield self._emitted, path
+            self._emitted += 1
+
+    @property
+    def segments(self) -> list:
+        return [t.result() for t in self._tasks if t.done()]
 
 
 class InterviewerAgent:
     def __init__(self):
-        api_key = settings.GROQ_API_KEY.strip()
-        if api_key and api_key.startswith("gsk_"):
-            try:
-                from groq import Groq
-
-                self.client = Groq(api_key=api_key)
-                self.enabled = True
-            except Exception as e:
-                print(f"GROQ API Error: {e}")
-                self.enabled = False
-                self.client = None
-        else:
-            self.enabled = False
-            self.client = None
+        self.enabled = llm_client.enabled
+        self._synthesize = cassette.wrap_synthesize(tts.synthesize, tts.voice)
 
     def build_system_prompt(
         self, interview_type: str, skills: str, duration_minutes: int
@@ -56,24 +122,14 @@ class InterviewerAgent:
             "Do NOT provide answers or hints. Be professional and strict."
         )
 
-    def get_response(
+    def _build_messages(
         self,
         history: list,
         user_text: str,
         resume_context: str = "",
         time_warning: bool = False,
         is_last: bool = False,
-    ) -> str:
-        if not self.enabled:
-            fallback = [
-                "Can you walk me through a challenging project you've worked on?",
-                "How do you approach debugging complex issues?",
-                "Describe your experience with the technologies listed on your resume.",
-                "What is your greatest professional achievement so far?",
-                "Where do you see yourself in 5 years?",
-            ]
-            return fallback[hash(user_text) % len(fallback)]
-
+    ) -> list:
         messages = list(history)
         if resume_context:
             messages.insert(
@@ -100,30 +156,116 @@ class InterviewerAgent:
             )
 
         messages.append({"role": "user", "content": user_text})
+        return messages
+
+    async def get_response(
+        self,
+        history: list,
+        user_text: str,
+        resume_context: str = "",
+        time_warning: bool = False,
+        is_last: bool = False,
+        usage: dict = None,
+    ) -> str:
+        """
+        Generate the interviewer's next message. If a usage dict is given it
+        receives estimated_prompt_tokens and, from the API, prompt_tokens.
+        """
+        messages = self._build_messages(
+            history, user_text, resume_context, time_warning, is_last
+        )
+        if usage is not None:
+            usage["estimated_prompt_tokens"] = estimate_tokens(messages)
+        if not self.enabled:
+            return FALLBACK_QUESTIONS[hash(user_text) % len(FALLBACK_QUESTIONS)]
 
         try:
-            completion = self.client.chat.completions.create(
-                model="llama-3.3-70b-versatile",
+            result = await llm_client.complete(
+                model=INTERVIEW_MODEL,
                 messages=messages,
                 max_tokens=300,
                 temperature=0.7,
+                priority=INTERACTIVE,
             )
-            return completion.choices[0].message.content
         except Exception as e:
             print(f"GROQ Error: {e}")
-            return "Thank you for your response. Let's continue — can you tell me about a time you had to learn something new quickly?"
+            return ERROR_FALLBACK
+        if usage is not None:
+            usage.update({k: v for k, v in result.items() if k != "text"})
+        return result["text"]
 
-    def text_to_audio(self, text: str) -> str:
-        """Convert text to MP3 and save to static/audio/. Returns relative path."""
-        audio_id = f"{uuid.uuid4()}.mp3"
-        audio_path = os.path.join("static", "audio", audio_id)
-        os.makedirs(os.path.dirname(audio_path), exist_ok=True)
+    async def stream_response(
+        self,
+        history: list,
+        user_text: str,
+        resume_context: str = "",
+        time_warning: bool = False,
+        is_last: bool = False,
+        usage: dict = None,
+    ):
+        """Same as get_response, but yields text chunks as the model produces them."""
+        messages = self._build_messages(
+            history, user_text, resume_context, time_warning, is_last
+        )
+        if usage is not None:
+            usage["estimated_prompt_tokens"] = estimate_tokens(messages)
+        if not self.enabled:
+            yield FALLBACK_QUESTIONS[hash(user_text) % len(FALLBACK_QUESTIONS)]
+            return
+
+        emitted = False
         try:
-            tts = gTTS(text=text, lang="en", slow=False)
-            tts.save(audio_path)
+            async for delta in llm_client.stream_chat(
+                model=INTERVIEW_MODEL,
+                messages=messages,
+                max_tokens=300,
+                temperature=0.7,
+                usage=usage,
+                priority=INTERACTIVE,
+            ):
+                emitted = True
+                yield delta
         except Exception as e:
-            print(f"TTS Error: {e}")
-        return f"static/audio/{audio_id}"
+            print(f"GROQ Error: {e}")
+            if not emitted:
+                yield ERROR_FALLBACK
+
+    def speech_pipeline(self) -> SpeechPipeline:
+        return SpeechPipeline(self, min_chars=settings.TTS_PIPELINE_MIN_CHARS)
+
+    # ─── Speech ──────────────────────────────────────────────────────────────
+
+    def text_to_audio(self, text: str) -> str:
+        """Convert text to speech in static/audio/ (cached by content). Returns relative path."""
+        path = tts_cache.get_or_create(text, tts.voice, self._synthesize, ext=tts.ext)
+        storage.touch(path)  # a cache hit counts as a use for retention
+        return path.replace(os.sep, "/")
+
+    def request_audio(self, text: str) -> str:
+        """Like text_to_audio, but returns the path at once and synthesizes in the background."""
+        path = tts_cache.submit(text, tts.voice, self._synthesize, ext=tts.ext)
+        storage.touch(path)
+        return path.replace(os.sep, "/")
+
+    def resume_audio(self, name: str):
+        """
+        Restart the synthesis of a requested file that was never written.
+        Returns 0 once restarted, the seconds left while a failed synthesis is
+        backing off, or None if the file is unknown (or was given up on).
+        """
+        request = tts_cache.requested(name, tts.voice)
+        if request is None:
+            return None
+        wait = request["retry_at"] - time.time()
+        if wait > 0:
+            return wait
+        self.request_audio(request["text"])
+        return 0
+
+    def warm_audio_cache(self):
+        """Synthesize the fixed phrases (closing line, fallbacks) ahead of time."""
+        phrases = [CLOSE_TEXT, ERROR_FALLBACK, *FALLBACK_QUESTIONS]
+        tts_cache.warm(phrases, tts.voice, self._synthesize, ext=tts.ext)
 
 
 interviewer = InterviewerAgent()
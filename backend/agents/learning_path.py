@@ -3,29 +3,22 @@ LearningPathAgent — generates a personalized learning path based on interview
 """
 
 import json
-from core.config import settings
+from core.llm import llm_client
 
 
 class LearningPathAgent:
     def __init__(self):
-        api_key = settings.GROQ_API_KEY.strip()
-        if api_key and api_key.startswith("gsk_"):
-            try:
-                from groq import Groq
+        self.enabled = llm_client.enabled
 
-                self.client = Groq(api_key=api_key)
-                self.enabled = True
-            except Exception as e:
-                self.enabled = False
-                self.client = None
-        else:
-            self.enabled = False
-            self.client = None
-
-    def generate(
-        self, scores: dict, skills: str, interview_type: str, improvements: list
+    async def generate(
+        self,
+        scores: dict,
+        skills: str,
+        interview_type: str,
+        improvements: list,
+        raise_errors: bool = False,
     ) -> list:
-        """Returns a list of learning path items."""
+        """Returns a list of learning path items (a mock path on LLM failure unless raise_errors)."""
         if not self.enabled:
             return self._mock_path(skills)
 
@@ -55,18 +48,21 @@ Generate a learning path JSON array with 5-7 items. Each item must have this str
 Return ONLY the JSON array, no markdown."""
 
         try:
-            completion = self.client.chat.completions.create(
+            raw = await llm_client.chat(
                 model="llama-3.1-8b-instant",
                 messages=[{"role": "user", "content": prompt}],
                 max_tokens=1000,
                 temperature=0.4,
             )
-            raw = completion.choices[0].message.content.strip()
+            raw = raw.strip()
             start = raw.find("[")
             end = raw.rfind("]") + 1
             if start != -1 and end != 0:
                 return json.loads(raw[start:end])
+            raise ValueError(f"no JSON in learning path: {raw[:80]!r}")
         except Exception as e:
+            if raise_errors:
+                raise
             print(f"Learning path error: {e}")
         return self._mock_path(skills)
 
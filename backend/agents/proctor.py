@@ -3,39 +3,381 @@ import mediapipe as mp
 import numpy as np
 import base64
 import os
+import struct
+import time
 from mediapipe.tasks import python
 from mediapipe.tasks.python import vision
 
-class ProctorAgent:
+# Binary frame protocol: 6-byte little-endian header followed by the payload.
+#   format (u8) | reserved (u8) | width (u16) | height (u16)
+# JPEG frames may leave width/height at 0; raw frames must set them.
+FRAME_HEADER = struct.Struct("<BBHH")
+FORMAT_JPEG = 0
+FORMAT_GRAY = 1
+FORMAT_RGB = 2
+FORMAT_RGBA = 3
+_CHANNELS = {FORMAT_GRAY: 1, FORMAT_RGB: 3, FORMAT_RGBA: 4}
+
+
+def decode_frame(payload):
+    """Decode a base64 data URL or a binary frame into an RGB array (or None)."""
+    if isinstance(payload, str):
+        encoded_data = payload.split(',')[1]
+        nparr = np.frombuffer(base64.b64decode(encoded_data), np.uint8)
+        return _decode_jpeg(nparr)
+
+    buf = memoryview(payload)
+    if buf.nbytes < FRAME_HEADER.size:
+        return None
+    fmt, _, width, height = FRAME_HEADER.unpack_from(buf)
+    # View over the received buffer — no copy before the decoder
+    body = np.frombuffer(buf, np.uint8, offset=FRAME_HEADER.size)
+
+    if fmt == FORMAT_JPEG:
+        return _decode_jpeg(body)
+    channels = _CHANNELS.get(fmt)
+    if channels is None or body.size != width * height * channels:
+        return None
+    if fmt == FORMAT_RGB:
+        return body.reshape(height, width, 3)
+    if fmt == FORMAT_RGBA:
+        return cv2.cvtColor(body.reshape(height, width, 4), cv2.COLOR_RGBA2RGB)
+    return cv2.cvtColor(body.reshape(height, width), cv2.COLOR_GRAY2RGB)
+
+
+def _decode_jpeg(nparr):
+    frame = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
+    if frame is None:
+        return None
+    return cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=frame)
+
+
+# Gaze thresholds for 640px width
+LEFT_X = 150
+RIGHT_X = 490
+
+# FaceLandmarker indices: nose tip, cheek edges, eye corners and iris centres
+NOSE_TIP = 1
+FACE_EDGES = (234, 454)
+EYES = ((33, 133, 468), (362, 263, 473))  # (corner, corner, iris)
+
+# Motion gate: frames are compared as tiny grayscale thumbnails
+THUMB_SIZE = (32, 24)
+PIXEL_DELTA = 20  # per-cell change (0-255) that counts as "moved"
+
+
+class _SessionState:
+    """Per-session reference frame and cached verdict for the motion gate."""
+
     def __init__(self):
-        # Path is root since main.py runs from backend/
-        model_path = os.path.join(os.getcwd(), 'face_detector_full_range.tflite')
-        base_options = python.BaseOptions(model_asset_path=model_path)
-        options = vision.FaceDetectorOptions(base_options=base_options)
-        self.detector = vision.FaceDetector.create_from_options(options)
+        self.thumb = None  # thumbnail of the last frame that went through the detector
+        self.verdict = None
+        self.detected_at = 0.0
+        self.bbox = None  # (x, y, w, h) of the tracked face in full-frame pixels
+        self.since_full = 0  # ROI-only detections since the last full-frame pass
+        self.full_at = 0.0  # monotonic time of the last full-frame pass
+        # LIVE_STREAM mode: private async detector and its most recent result
+        self.live_detector = None
+        self.live_verdict = "PENDING"
+        self.live_ts = 0
 
-    def analyze_frame(self, base64_image):
-        try:
-            encoded_data = base64_image.split(',')[1]
-            nparr = np.frombuffer(base64.b64decode(encoded_data), np.uint8)
-            frame = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
-            
-            if frame is None: return "INVALID"
+    def unchanged(self, thumb, threshold, max_age):
+        if self.thumb is None or time.monotonic() - self.detected_at > max_age:
+            return False
+        # Compare against the last *detected* frame so slow drift still triggers
+        moved = cv2.absdiff(thumb, self.thumb) > PIXEL_DELTA
+        return np.count_nonzero(moved) < threshold * moved.size
+
+    def update(self, thumb, verdict):
+        self.thumb = thumb
+        self.verdict = verdict
+        self.detected_at = time.monotonic()
+
+
+def _create_detector(model_file, **kwargs):
+    # Path is root since main.py runs from backend/
+    model_path = os.path.join(os.getcwd(), model_file)
+    base_options = python.BaseOptions(model_asset_path=model_path)
+    options = vision.FaceDetectorOptions(base_options=base_options, **kwargs)
+    return vision.FaceDetector.create_from_options(options)
+
+
+class ProctorAgent:
+    def __init__(
+        self,
+        motion_threshold: float = 0.0,
+        max_verdict_age: float = 5.0,
+        track_full_every: int = 0,
+        track_full_max_s: float = 0.0,
+        track_min_score: float = 0.0,
+        track_margin: float = 0.6,
+        running_mode: str = "image",
+        cascade: bool = False,
+        cascade_band_px: float = 40,
+        cascade_min_score: float = 0.75,
+    ):
+        self.detector = _create_detector('face_detector_full_range.tflite')
+
+        # "image": detect synchronously per frame. "live_stream": each session
+        # gets its own async detector and a frame returns the latest result.
+        self.live = running_mode == "live_stream"
+        self.running_mode = "live_stream" if self.live else "image"
+
+        # Fraction of thumbnail cells that must change to re-detect (0 = always detect)
+        self.motion_threshold = motion_threshold
+        self.max_verdict_age = max_verdict_age
 
-            rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=rgb_frame)
-            res = self.detector.detect(mp_image)
+        # ROI tracking: between full-frame passes, re-find the face in a crop
+        # around its last bbox with the (cheaper) short-range model. The full
+        # pass still runs every track_full_every runs, every track_full_max_s
+        # seconds (0 = no limit) and when the crop score is below track_min_score.
+        self.track_full_every = track_full_every
+        self.track_full_max_s = track_full_max_s
+        self.track_min_score = track_min_score
+        self.track_margin = track_margin
+        self.roi_detector = None
+        if track_full_every > 1:
+            self.roi_detector = _create_detector('face_detector.tflite')
 
-            if not res.detections: return "NO_FACE"
-            if len(res.detections) > 1: return "MULTIPLE_PEOPLE"
+        # Gaze cascade: the landmarker (real head pose + iris) only runs when the
+        # bbox centre is within cascade_band_px of a threshold or the detector
+        # is unsure. Built on first use.
+        self.cascade = cascade
+        self.cascade_band_px = cascade_band_px
+        self.cascade_min_score = cascade_min_score
+        self.landmarker = None
 
-            bbox = res.detections[0].bounding_box
-            center_x = bbox.origin_x + (bbox.width / 2)
+        self.sessions = {}
+        self.frames = 0
+        self.detections = 0
+        self.roi_detections = 0
+        self.full_detections = 0  # scheduled full-frame passes
+        self.fallback_detections = 0  # full-frame passes after the ROI lost the face
+        self.detect_seconds = 0.0
+        self.live_results = 0
+        self.live_latency_ms = 0.0
+        self.landmark_calls = 0
+
+    def analyze_frame(self, frame_data, session_id=None):
+        """frame_data: base64 data URL (legacy) or a binary frame, see FRAME_HEADER."""
+        try:
+            rgb_frame = decode_frame(frame_data)
             
-            # Thresholds for 640px width
-            if center_x < 150: return "LOOKING_LEFT"
-            if center_x > 490: return "LOOKING_RIGHT"
+            if rgb_frame is None: return "INVALID"
+            self.frames += 1
+
+            state = None
+            thumb = None
+            if session_id is not None:
+                state = self.sessions.setdefault(session_id, _SessionState())
+            if state is not None and self.motion_threshold > 0:
+                small = cv2.resize(rgb_frame, THUMB_SIZE, interpolation=cv2.INTER_AREA)
+                thumb = cv2.cvtColor(small, cv2.COLOR_RGB2GRAY)
+                if state.unchanged(thumb, self.motion_threshold, self.max_verdict_age):
+                    return state.live_verdict if self.live else state.verdict
 
-            return "OK"
+            if self.live and state is not None:
+                verdict = self._detect_live(rgb_frame, state)
+                state.update(thumb, verdict)
+                return verdict
+
+            verdict = None
+            roi_runs = self.roi_detections
+            if (
+                state is not None
+                and self.roi_detector is not None
+                and state.bbox is not None
+                and state.since_full < self.track_full_every - 1
+                and (
+                    not self.track_full_max_s
+                    or time.monotonic() - state.full_at < self.track_full_max_s
+                )
+            ):
+                verdict = self._track(rgb_frame, state)
+            if verdict is None:
+                verdict = self._detect(rgb_frame, state, fallback=self.roi_detections > roi_runs)
+            if state is not None:
+                state.update(thumb, verdict)
+            return verdict
         except Exception as e:
-            return f"ERROR"
\ No newline at end of file
+            return f"ERROR"
+
+    def _detect(self, rgb_frame, state=None, fallback=False):
+        """Full-frame pass — the only place NO_FACE / MULTIPLE_PEOPLE come from."""
+        self.detections += 1
+        if fallback:
+            self.fallback_detections += 1
+        else:
+            self.full_detections += 1
+        mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=rgb_frame)
+        started = time.perf_counter()
+        res = self.detector.detect(mp_image)
+        self.detect_seconds += time.perf_counter() - started
+
+        if state is not None:
+            state.since_full = 0
+            state.full_at = time.monotonic()
+            state.bbox = None
+            if len(res.detections) == 1:
+                bbox = res.detections[0].bounding_box
+                state.bbox = (bbox.origin_x, bbox.origin_y, bbox.width, bbox.height)
+        return self._verdict(res.detections, rgb_frame)
+
+    def _verdict(self, detections, rgb_frame=None):
+        if not detections: return "NO_FACE"
+        if len(detections) > 1: return "MULTIPLE_PEOPLE"
+
+        bbox = detections[0].bounding_box
+        return self._gaze(
+            (bbox.origin_x, bbox.origin_y, bbox.width, bbox.height),
+            detections[0].categories[0].score,
+            rgb_frame,
+        )
+
+    def _detect_live(self, rgb_frame, state):
+        """Queue the frame on the session's LIVE_STREAM detector; return the newest result."""
+        if state.live_detector is None:
+            def on_result(result, output_image, timestamp_ms):
+                state.live_verdict = self._verdict(result.detections)
+                self.live_results += 1
+                self.live_latency_ms += time.monotonic() * 1000 - timestamp_ms
+
+            state.live_detector = _create_detector(
+                'face_detector_full_range.tflite',
+                running_mode=vision.RunningMode.LIVE_STREAM,
+                result_callback=on_result,
+            )
+        # Timestamps must be strictly increasing per detector
+        state.live_ts = max(int(time.monotonic() * 1000), state.live_ts + 1)
+        self.detections += 1
+        started = time.perf_counter()
+        state.live_detector.detect_async(
+            mp.Image(image_format=mp.ImageFormat.SRGB, data=rgb_frame), state.live_ts
+        )
+        self.detect_seconds += time.perf_counter() - started
+        return state.live_verdict
+
+    def _track(self, rgb_frame, state):
+        """Re-find the face inside a crop around its last bbox. None = lost it."""
+        x, y, w, h = state.bbox
+        frame_h, frame_w = rgb_frame.shape[:2]
+        x0 = max(0, int(x - self.track_margin * w))
+        y0 = max(0, int(y - self.track_margin * h))
+        x1 = min(frame_w, int(x + w + self.track_margin * w))
+        y1 = min(frame_h, int(y + h + self.track_margin * h))
+        if x1 - x0 < 16 or y1 - y0 < 16:
+            return None
+
+        self.detections += 1
+        self.roi_detections += 1
+        crop = np.ascontiguousarray(rgb_frame[y0:y1, x0:x1])
+        started = time.perf_counter()
+        res = self.roi_detector.detect(
+            mp.Image(image_format=mp.ImageFormat.SRGB, data=crop)
+        )
+        self.detect_seconds += time.perf_counter() - started
+        # Zero or several faces in the crop, or an unsure one: let the
+        # full-frame pass decide
+        if len(res.detections) != 1:
+            return None
+        detection = res.detections[0]
+        if detection.categories[0].score < self.track_min_score:
+            return None
+
+        bbox = detection.bounding_box
+        state.bbox = (bbox.origin_x + x0, bbox.origin_y + y0, bbox.width, bbox.height)
+        state.since_full += 1
+        return self._gaze(state.bbox, detection.categories[0].score, rgb_frame)
+
+    def _gaze(self, bbox, score, rgb_frame=None):
+        center_x = bbox[0] + (bbox[2] / 2)
+        if (
+            self.cascade
+            and rgb_frame is not None
+            and (
+                min(abs(center_x - LEFT_X), abs(center_x - RIGHT_X)) < self.cascade_band_px
+                or score < self.cascade_min_score
+            )
+        ):
+            verdict = self._landmark_gaze(rgb_frame, bbox)
+            if verdict is not None:
+                return verdict
+
+        if center_x < LEFT_X: return "LOOKING_LEFT"
+        if center_x > RIGHT_X: return "LOOKING_RIGHT"
+
+        return "OK"
+
+    def _landmark_gaze(self, rgb_frame, bbox):
+        """Second stage: head yaw from the nose vs cheek edges, then iris position."""
+        if self.landmarker is None:
+            model_path = os.path.join(os.getcwd(), 'face_landmarker.task')
+            options = vision.FaceLandmarkerOptions(
+                base_options=python.BaseOptions(model_asset_path=model_path),
+                num_faces=1,
+            )
+            self.landmarker = vision.FaceLandmarker.create_from_options(options)
+
+        x, y, w, h = bbox
+        frame_h, frame_w = rgb_frame.shape[:2]
+        x0, y0 = max(0, int(x - w / 2)), max(0, int(y - h / 2))
+        x1, y1 = min(frame_w, int(x + 1.5 * w)), min(frame_h, int(y + 1.5 * h))
+        if x1 - x0 < 16 or y1 - y0 < 16:
+            return None
+
+        self.landmark_calls += 1
+        crop = np.ascontiguousarray(rgb_frame[y0:y1, x0:x1])
+        res = self.landmarker.detect(mp.Image(image_format=mp.ImageFormat.SRGB, data=crop))
+        if not res.face_landmarks:
+            return None
+        points = res.face_landmarks[0]
+
+        # Where the nose sits between the cheek edges: ~0.5 when facing the camera
+        left, right = sorted(points[i].x for i in FACE_EDGES)
+        if right - left <= 0:
+            return None
+        yaw = (points[NOSE_TIP].x - left) / (right - left)
+        if yaw < 0.3: return "LOOKING_LEFT"
+        if yaw > 0.7: return "LOOKING_RIGHT"
+
+        if len(points) > max(i for eye in EYES for i in eye):
+            ratios = []
+            for a, b, iris in EYES:
+                lo, hi = sorted((points[a].x, points[b].x))
+                if hi > lo:
+                    ratios.append((points[iris].x - lo) / (hi - lo))
+            if ratios:
+                gaze = sum(ratios) / len(ratios)
+                if gaze < 0.3: return "LOOKING_LEFT"
+                if gaze > 0.7: return "LOOKING_RIGHT"
+
+        return "OK"
+
+    def release(self, session_id):
+        state = self.sessions.pop(session_id, None)
+        if state is not None and state.live_detector is not None:
+            state.live_detector.close()
+
+    def stats(self) -> dict:
+        detections = max(self.detections, 1)
+        stats = {
+            "running_mode": self.running_mode,
+            "frames": self.frames,
+            "detections": self.detections,
+            "roi_detections": self.roi_detections,
+            "full_detections": self.full_detections,
+            "fallback_detections": self.fallback_detections,
+            # A fallback frame already ran an ROI pass
+            "skipped": self.frames - (self.detections - self.fallback_detections),
+            # Time the calling thread spent in detect()/detect_async()
+            "detect_call_ms": round(1000 * self.detect_seconds / detections, 2),
+            # Expensive second stage — keep this rate low
+            "landmark_calls": self.landmark_calls,
+            "landmark_rate": round(self.landmark_calls / detections, 3),
+        }
+        if self.live:
+            stats["live_results"] = self.live_results
+            stats["live_latency_ms"] = round(
+                self.live_latency_ms / max(self.live_results, 1), 2
+            )
+        return stats
\ No newline at end of file
@@ -0,0 +1,189 @@
+"""
+ProctorPool — multi-process face-detection pool for /ws/proctor frames.
+
+Every worker is a single-process executor holding its own ProctorAgent (and so
+its own MediaPipe FaceDetector). A session is pinned to one worker for its whole
+lifetime so any per-session detector state stays inside that process.
+"""
+
+import asyncio
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from agents import proctor_worker
+from core.config import settings
+
+
+class _Worker:
+    def __init__(self, index: int, options: dict, in_process: bool = False):
+        self.index = index
+        self.options = options
+        self.in_process = in_process
+        self.executor = None
+        self.pid = None
+        self.sessions = set()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.frames = 0
+        self.errors = 0
+        self.restarts = 0
+        self.busy_seconds = 0.0  # time spent inside analyze_frame
+        self.latency_seconds = 0.0  # submit -> result, including queueing
+        self.started_at = 0.0
+        self.agent_stats = {}  # detector counters reported by the worker
+
+    def start(self):
+        if self.in_process:
+            self.executor = ThreadPoolExecutor(
+                max_workers=1,
+                initializer=proctor_worker.init_worker,
+                initargs=(self.options,),
+            )
+        else:
+            self.executor = ProcessPoolExecutor(
+                max_workers=1,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=proctor_worker.init_worker,
+                initargs=(self.options,),
+            )
+        self.started_at = time.monotonic()
+
+    def restart(self):
+        self.shutdown()
+        self.restarts += 1
+        self.start()
+
+    def shutdown(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+
+    def stats(self) -> dict:
+        uptime = max(time.monotonic() - self.started_at, 1e-9)
+        frames = max(self.frames, 1)
+        return {
+            "worker": self.index,
+            "pid": self.pid,
+            "sessions": len(self.sessions),
+            "queue_depth": self.in_flight,
+            "max_queue_depth": self.max_in_flight,
+            "frames": self.frames,
+            "errors": self.errors,
+            "restarts": self.restarts,
+            "fps": round(self.frames / uptime, 2),
+            "utilization": round(self.busy_seconds / uptime, 3),
+            "avg_detect_ms": round(1000 * self.busy_seconds / frames, 2),
+            "avg_latency_ms": round(1000 * self.latency_seconds / frames, 2),
+            **self.agent_stats,
+        }
+
+
+class ProctorPool:
+    def __init__(self, workers: int, options: dict = None):
+        # workers == 0 runs a single in-process thread (dev / debugging)
+        self.options = options or {}
+        self.in_process = workers <= 0
+        self.size = max(1, workers)
+        self.workers = []
+        self.assignments = {}  # interview_id -> _Worker
+
+    def start(self):
+        if self.workers:
+            return
+        for i in range(self.size):
+            worker = _Worker(i, self.options, in_process=self.in_process)
+            worker.start()
+            self.workers.append(worker)
+        mode = "in-process" if self.in_process else "process"
+        print(f"✅ Proctor pool started ({self.size} {mode} worker(s))")
+
+    def shutdown(self):
+        for worker in self.workers:
+            worker.shutdown()
+        self.workers = []
+        self.assignments.clear()
+
+    def _worker_for(self, interview_id: int) -> _Worker:
+        worker = self.assignments.get(interview_id)
+        if worker is None:
+            worker = min(self.workers, key=lambda w: (len(w.sessions), w.in_flight))
+            worker.sessions.add(interview_id)
+            self.assignments[interview_id] = worker
+        return worker
+
+    async def analyze(self, interview_id: int, image) -> str:
+        """Run analyze_frame on the session's worker without blocking the loop."""
+        self.start()
+        worker = self._worker_for(interview_id)
+        loop = asyncio.get_running_loop()
+        worker.in_flight += 1
+        worker.max_in_flight = max(worker.max_in_flight, worker.in_flight)
+        executor = worker.executor
+        submitted = time.perf_counter()
+        try:
+            alert, busy, pid, agent_stats = await loop.run_in_executor(
+                executor, proctor_worker.analyze, interview_id, image
+            )
+        except BrokenProcessPool:
+            worker.errors += 1
+            if worker.executor is executor:
+                print(f"Proctor worker {worker.index} died — restarting")
+                worker.restart()
+            return "ERROR"
+        except Exception as e:
+            worker.errors += 1
+            print(f"Proctor worker {worker.index} error: {e}")
+            return "ERROR"
+        finally:
+            worker.in_flight -= 1
+        worker.pid = pid
+        worker.agent_stats = agent_stats
+        worker.frames += 1
+        worker.busy_seconds += busy
+        worker.latency_seconds += time.perf_counter() - submitted
+        return alert
+
+    def release(self, interview_id: int):
+        """Unpin a session once its socket closes."""
+        worker = self.assignments.pop(interview_id, None)
+        if worker is not None:
+            worker.sessions.discard(interview_id)
+            if worker.executor is not None:
+                worker.executor.submit(proctor_worker.release, interview_id)
+
+    def load(self) -> float:
+        """Average number of frames queued or running per worker."""
+        if not self.workers:
+            return 0.0
+        return sum(w.in_flight for w in self.workers) / len(self.workers)
+
+    def stats(self) -> dict:
+        workers = [w.stats() for w in self.workers]
+        return {
+            "workers": workers,
+            "sessions": len(self.assignments),
+            "queue_depth": sum(w["queue_depth"] for w in workers),
+            "frames": sum(w["frames"] for w in workers),
+            "fps": round(sum(w["fps"] for w in workers), 2),
+        }
+
+
+def agent_options() -> dict:
+    """ProctorAgent keyword arguments from settings (also used by the replay benchmark)."""
+    return {
+        "motion_threshold": settings.PROCTOR_MOTION_THRESHOLD,
+        "max_verdict_age": settings.PROCTOR_MAX_VERDICT_AGE_S,
+        "track_full_every": settings.PROCTOR_TRACK_FULL_EVERY,
+        "track_full_max_s": settings.PROCTOR_TRACK_FULL_MAX_S,
+        "track_min_score": settings.PROCTOR_TRACK_MIN_SCORE,
+        "track_margin": settings.PROCTOR_TRACK_MARGIN,
+        "running_mode": settings.PROCTOR_RUNNING_MODE,
+        "cascade": settings.PROCTOR_CASCADE,
+        "cascade_band_px": settings.PROCTOR_CASCADE_BAND_PX,
+        "cascade_min_score": settings.PROCTOR_CASCADE_MIN_SCORE,
+    }
+
+
+proctor_pool = ProctorPool(settings.PROCTOR_WORKERS, agent_options())
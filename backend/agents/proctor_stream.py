@@ -0,0 +1,131 @@
+"""
+ProctorStream — per-connection frame mailbox and adaptive sampling for /ws/proctor.
+
+The socket reader only ever keeps the newest frame; the analysis loop takes it
+when the previous detection finishes, so alerts always describe the present.
+A message that holds no frame is handed to the same loop as an InvalidMessage,
+so every reply is sent (and recorded) from one task.
+The suggested capture interval follows detection latency and pool load.
+"""
+
+import asyncio
+import json
+import time
+from core.config import settings
+
+
+class InvalidMessage:
+    """Stands in for a frame when a socket message could not be parsed."""
+
+    def __init__(self, error: Exception):
+        self.error = f"malformed frame message: {error!r}"
+
+
+class FrameMailbox:
+    """Single-slot mailbox: a new frame replaces any frame not yet analysed."""
+
+    def __init__(self):
+        self._frame = None
+        self._invalid = None  # newest InvalidMessage not yet answered
+        self._event = asyncio.Event()
+        self.closed = False
+        self.received = 0
+        self.dropped = 0
+
+    def put(self, frame):
+        self.received += 1
+        if self._frame is not None:
+            self.dropped += 1
+        self._frame = frame
+        self._event.set()
+
+    def reject(self, message: InvalidMessage):
+        self.received += 1
+        self._invalid = message
+        self._event.set()
+
+    async def get(self):
+        """
+        Wait for the newest frame (or InvalidMessage, answered first). Returns
+        None once the mailbox is closed.
+        """
+        while self._frame is None and self._invalid is None and not self.closed:
+            self._event.clear()
+            await self._event.wait()
+        if self._invalid is not None:
+            invalid, self._invalid = self._invalid, None
+            return invalid
+        frame, self._frame = self._frame, None
+        return frame
+
+    def close(self):
+        self.closed = True
+        self._event.set()
+
+
+class ProctorStream:
+    def __init__(self, interview_id: int):
+        self.interview_id = interview_id
+        self.mailbox = FrameMailbox()
+        self.connected_at = time.monotonic()
+        self.analyzed = 0
+        self.invalid = 0
+        self.latency_ewma = 0.0
+        self.interval_ms = settings.PROCTOR_START_INTERVAL_MS
+
+    async def receive(self, websocket):
+        """Reader task: drain the socket into the mailbox until it closes."""
+        try:
+            while True:
+                message = await websocket.receive()
+                if message["type"] == "websocket.disconnect":
+                    break
+                # Binary messages carry a raw frame; text is the legacy base64 JSON
+                frame = message.get("bytes")
+                if frame is None:
+                    try:
+                        frame = json.loads(message["text"])["image"]
+                    except (KeyError, TypeError, ValueError) as e:
+                        # One bad message must not end the session
+                        self.invalid += 1
+                        self.mailbox.reject(InvalidMessage(e))
+                        continue
+                self.mailbox.put(frame)
+        except Exception:
+            pass
+        finally:
+            self.mailbox.close()
+
+    def record(self, latency_seconds: float, pool_load: float):
+        """Fold one detection latency into the suggested capture interval."""
+        self.analyzed += 1
+        if self.analyzed == 1:
+            self.latency_ewma = latency_seconds
+        else:
+            self.latency_ewma += 0.3 * (latency_seconds - self.latency_ewma)
+        # Leave headroom over detection time, and back off further when the
+        # pool is queueing frames from other sessions.
+        target = self.latency_ewma * 1000 * settings.PROCTOR_RATE_HEADROOM
+        target *= 1 + pool_load
+        self.interval_ms = int(
+            min(
+                settings.PROCTOR_MAX_INTERVAL_MS,
+                max(settings.PROCTOR_MIN_INTERVAL_MS, target),
+            )
+        )
+
+    def stats(self) -> dict:
+        return {
+            "interview_id": self.interview_id,
+            "connected_seconds": round(time.monotonic() - self.connected_at, 1),
+            "received": self.mailbox.received,
+            "analyzed": self.analyzed,
+            "dropped": self.mailbox.dropped,
+            "invalid": self.invalid,
+            "avg_latency_ms": round(1000 * self.latency_ewma, 2),
+            "analysis_interval_ms": self.interval_ms,
+        }
+
+
+# Live sockets, for /api/proctor/stats
+proctor_streams = set()
@@ -0,0 +1,29 @@
+"""
+Proctor worker — entry points executed inside ProctorPool worker processes.
+
+Kept free of app/config imports so that spawning a worker only loads
+OpenCV + MediaPipe and its own ProctorAgent.
+"""
+
+import os
+import time
+from agents.proctor import ProctorAgent
+
+_agent = None
+
+
+def init_worker(options: dict):
+    """Executor initializer: build this worker's private FaceDetector."""
+    global _agent
+    _agent = ProctorAgent(**options)
+
+
+def analyze(interview_id: int, image) -> tuple:
+    """Returns (alert, busy_seconds, pid, agent_stats)."""
+    start = time.perf_counter()
+    alert = _agent.analyze_frame(image, session_id=interview_id)
+    return alert, time.perf_counter() - start, os.getpid(), _agent.stats()
+
+
+def release(interview_id: int):
+    _agent.release(interview_id)
@@ -0,0 +1,288 @@
+"""
+ReportJobQueue — persistent background queue for interview reports.
+
+Ending an interview (explicitly, on timeout or after three proctoring
+strikes) only enqueues a row in report_jobs; REPORT_WORKERS asyncio workers
+then score the answers, build the learning path and render the PDF. Job
+state (queued → running → done | failed) and the current stage are kept in
+the database, failed attempts are retried with exponential backoff up to
+REPORT_MAX_ATTEMPTS, and jobs left running by a crash or restart are queued
+again at startup.
+"""
+
+import asyncio
+import json
+import time
+from datetime import datetime
+from core.config import settings
+from core.database import connect
+from agents.scorer import scorer
+from agents.learning_path import learning_path_agent
+from agents.report_generator import report_generator
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+# Idle workers re-check the table at least this often (seconds)
+POLL_INTERVAL_S = 5.0
+
+
+async def generate_report(db, interview_id: int, on_stage=None) -> int:
+    """
+    Score interview, generate learning path and PDF. Returns report DB id.
+    LLM failures raise instead of falling back to mock scores, so the job is
+    retried and eventually marked failed rather than reported with fake data.
+    """
+    on_stage = on_stage or (lambda stage: None)
+    interview = db.execute("SELECT * FROM interviews WHERE id = ?", (interview_id,)).fetchone()
+    if not interview:
+        raise LookupError(f"interview {interview_id} not found")
+    interview = dict(interview)
+    user = dict(db.execute("SELECT * FROM users WHERE id = ?", (interview["user_id"],)).fetchone())
+
+    # Get transcript
+    msgs = db.execute(
+        "SELECT role, content FROM interview_messages WHERE interview_id = ? ORDER BY id",
+        (interview_id,),
+    ).fetchall()
+    transcript = [{"role": m["role"], "content": m["content"]} for m in msgs]
+
+    # Score — aggregate the per-answer grades, else grade the whole transcript
+    on_stage("scoring")
+    answer_scores = []
+    if settings.ANSWER_SCORING:
+        answer_scores = await scorer.finish_answers(
+            db,
+            interview_id,
+            interview.get("interview_type", "mixed"),
+            interview.get("skills", ""),
+        )
+    if answer_scores:
+        scores = await scorer.aggregate(
+            answer_scores,
+            interview.get("interview_type", "mixed"),
+            interview.get("skills", ""),
+            raise_errors=True,
+        )
+    else:
+        scores = await scorer.score_interview(
+            transcript,
+            interview.get("interview_type", "mixed"),
+            interview.get("skills", ""),
+            raise_errors=True,
+        )
+
+    # Learning path
+    on_stage("learning_path")
+    lp = await learning_path_agent.generate(
+        scores,
+        interview.get("skills", ""),
+        interview.get("interview_type", "mixed"),
+        scores.get("improvements", []),
+        raise_errors=True,
+    )
+
+    # PDF — reportlab is CPU-bound, keep it off the event loop
+    on_stage("pdf")
+    pdf_path = await asyncio.to_thread(
+        report_generator.generate, user, interview, scores, transcript, lp
+    )
+
+    # Save to DB
+    cursor = db.execute(
+        """INSERT INTO interview_reports
+        (interview_id, overall_score, technical_score, communication_score, hr_score,
+         strengths, improvements, summary, learning_path, pdf_path)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT(interview_id) DO UPDATE SET
+        overall_score=excluded.overall_score, technical_score=excluded.technical_score,
+        communication_score=excluded.communication_score, hr_score=excluded.hr_score,
+        strengths=excluded.strengths, improvements=excluded.improvements,
+        summary=excluded.summary, learning_path=excluded.learning_path,
+        pdf_path=excluded.pdf_path
+        RETURNING id""",
+        (
+            interview_id,
+            scores["overall_score"],
+            scores["technical_score"],
+            scores["communication_score"],
+            scores["hr_score"],
+            json.dumps(scores["strengths"]),
+            json.dumps(scores["improvements"]),
+            scores["summary"],
+            json.dumps(lp),
+            pdf_path,
+        ),
+    )
+    report_id = cursor.fetchone()["id"]
+    db.commit()
+    return report_id
+
+
+class ReportJobQueue:
+    def __init__(self, workers: int, max_attempts: int, retry_base_s: float):
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.retry_base_s = retry_base_s
+        self._tasks = []
+        self._wake = None
+
+    # ─── Jobs ────────────────────────────────────────────────────────────────
+
+    def enqueue(self, db, interview_id: int) -> int:
+        """Queue (or re-queue) the report for an interview. Returns the job id."""
+        now = datetime.utcnow().isoformat()
+        row = db.execute(
+            """INSERT INTO report_jobs (interview_id, status, stage, attempts, error,
+                                        next_attempt_at, report_id, created_at, updated_at)
+               VALUES (?, ?, ?, 0, '', 0, NULL, ?, ?)
+               ON CONFLICT(interview_id) DO UPDATE SET
+               status = excluded.status, stage = excluded.stage, attempts = 0, error = '',
+               next_attempt_at = 0, report_id = NULL, updated_at = excluded.updated_at
+               RETURNING id""",
+            (interview_id, QUEUED, QUEUED, now, now),
+        ).fetchone()
+        db.commit()
+        if self._wake is not None:
+            self._wake.set()
+        return row["id"]
+
+    def get(self, db, interview_id: int):
+        row = db.execute(
+            "SELECT * FROM report_jobs WHERE interview_id = ?", (interview_id,)
+        ).fetchone()
+        return dict(row) if row else None
+
+    def delete(self, db, interview_id: int):
+        db.execute("DELETE FROM report_jobs WHERE interview_id = ?", (interview_id,))
+
+    @staticmethod
+    def describe(job: dict) -> dict:
+        """The public view of a job, as returned while a report is pending."""
+        return {
+            "job_id": job["id"],
+            "status": job["status"],
+            "stage": job["stage"],
+            "attempts": job["attempts"],
+            "error": job["error"],
+            "updated_at": job["updated_at"],
+        }
+
+    # ─── Workers ─────────────────────────────────────────────────────────────
+
+    def start(self):
+        """Requeue jobs interrupted by a restart and start the workers (in the event loop)."""
+        conn = connect()
+        try:
+            resumed = conn.execute(
+                "UPDATE report_jobs SET status = ?, stage = ? WHERE status = ?",
+                (QUEUED, QUEUED, RUNNING),
+            ).rowcount
+            conn.commit()
+        finally:
+            conn.close()
+        if resumed:
+            print(f"📄 Requeued {resumed} interrupted report job(s)")
+
+        loop = asyncio.get_running_loop()
+        self._wake = asyncio.Event()
+        self._tasks = [loop.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _worker(self):
+        while True:
+            job, wait = self._claim()
+            if job is None:
+                self._wake.clear()
+                try:
+                    await asyncio.wait_for(self._wake.wait(), wait)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            await self._run(job)
+
+    def _claim(self) -> tuple:
+        """Mark the next due job running. Returns (job, None) or (None, seconds to wait)."""
+        now = time.time()
+        conn = connect()
+        try:
+            # Workers share the event loop, so select + update cannot interleave
+            job = conn.execute(
+                """SELECT * FROM report_jobs WHERE status = ? AND next_attempt_at <= ?
+                   ORDER BY next_attempt_at, id LIMIT 1""",
+                (QUEUED, now),
+            ).fetchone()
+            if job is None:
+                due = conn.execute(
+                    "SELECT MIN(next_attempt_at) AS due FROM report_jobs WHERE status = ?",
+                    (QUEUED,),
+                ).fetchone()["due"]
+                wait = POLL_INTERVAL_S if due is None else min(max(due - now, 0.05), POLL_INTERVAL_S)
+                return None, wait
+            conn.execute(
+                "UPDATE report_jobs SET status = ?, stage = ?, attempts = attempts + 1, updated_at = ? WHERE id = ?",
+                (RUNNING, "starting", datetime.utcnow().isoformat(), job["id"]),
+            )
+            conn.commit()
+            job = dict(job)
+            job["attempts"] += 1
+            return job, None
+        finally:
+            conn.close()
+
+    async def _run(self, job: dict):
+        conn = connect()
+        try:
+
+            def on_stage(stage: str):
+                self._update(conn, job["id"], stage=stage)
+
+            start = time.perf_counter()
+            try:
+                report_id = await generate_report(conn, job["interview_id"], on_stage)
+            except Exception as e:
+                conn.rollback()
+                if job["attempts"] < self.max_attempts:
+                    delay = self.retry_base_s * 2 ** (job["attempts"] - 1)
+                    print(
+                        f"Report generation error (interview {job['interview_id']}, "
+                        f"attempt {job['attempts']}): {e} — retrying in {delay:.1f}s"
+                    )
+                    self._update(
+                        conn, job["id"], status=QUEUED, stage=QUEUED, error=str(e),
+                        next_attempt_at=time.time() + delay,
+                    )
+                else:
+                    print(f"Report generation error (interview {job['interview_id']}): {e} — giving up")
+                    self._update(conn, job["id"], status=FAILED, stage=FAILED, error=str(e))
+                return
+            self._update(conn, job["id"], status=DONE, stage=DONE, error="", report_id=report_id)
+            print(
+                f"📄 Report {report_id} for interview {job['interview_id']} ready "
+                f"in {time.perf_counter() - start:.1f}s"
+            )
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _update(conn, job_id: int, **fields):
+        fields["updated_at"] = datetime.utcnow().isoformat()
+        assignments = ", ".join(f"{name} = ?" for name in fields)
+        conn.execute(
+            f"UPDATE report_jobs SET {assignments} WHERE id = ?", (*fields.values(), job_id)
+        )
+        conn.commit()
+
+
+report_jobs = ReportJobQueue(
+    workers=settings.REPORT_WORKERS,
+    max_attempts=settings.REPORT_MAX_ATTEMPTS,
+    retry_base_s=settings.REPORT_RETRY_BASE_S,
+)
@@ -1,34 +1,79 @@
 """
 ScorerAgent — generates structured scores and feedback from interview transcript.
+
+Answers are graded one at a time in the background while the interview runs
+(answer_scores table); the final report aggregates those grades and makes
+one short summary call, so its cost does not grow with the interview length.
+score_interview (the whole transcript in one prompt) remains the fallback.
 """
 
+import asyncio
 import json
+from collections import Counter
 from core.config import settings
+from core.database import connect
+from core.llm import llm_client
+
+ANSWER_PROMPT = """You are grading a single answer from a job interview.
+
+Interview Type: {interview_type}
+Candidate Skills: {skills}
+
+QUESTION:
+{question}
+
+ANSWER:
+{answer}
+
+Return a JSON object with EXACTLY this structure (no markdown, pure JSON):
+{{
+  "technical_score": <0-100 integer>,
+  "communication_score": <0-100 integer>,
+  "hr_score": <0-100 integer>,
+  "strength": "<one short phrase, or empty>",
+  "improvement": "<one short phrase, or empty>",
+  "note": "<one sentence on what this answer showed>"
+}}
+
+Be strict and honest: technical_score for depth and accuracy, communication_score
+for clarity and structure, hr_score for professionalism and behavioral quality."""
+
+ASSESSMENT_PROMPT = """Write the overall assessment for a {interview_type} interview
+(candidate skills: {skills}) in 2-3 sentences, based on these per-answer grades.
+
+Average scores: technical {technical_score}, communication {communication_score}, HR {hr_score}
+Notes on individual answers:
+{notes}
+
+Return only the assessment."""
+
+SCORE_KEYS = ("technical_score", "communication_score", "hr_score")
+
+# Sent by the client as the answer when the interview timer runs out
+TIME_EXPIRED_ANSWER = "[Time expired]"
+
+# Per-answer notes sent to the assessment call (evenly sampled beyond this)
+MAX_ASSESSMENT_NOTES = 12
+
+
+def is_gradable(answer: str) -> bool:
+    """A real answer from the candidate, not the time-up placeholder."""
+    answer = answer.strip()
+    return bool(answer) and answer != TIME_EXPIRED_ANSWER
 
 
 class ScorerAgent:
     def __init__(self):
-        api_key = settings.GROQ_API_KEY.strip()
-        if api_key and api_key.startswith("gsk_"):
-            try:
-                from groq import Groq
-
-                self.client = Groq(api_key=api_key)
-                self.enabled = True
-            except Exception as e:
-                print(f"GROQ Scorer Error: {e}")
-                self.enabled = False
-                self.client = None
-        else:
-            self.enabled = False
-            self.client = None
-
-    def score_interview(
-        self, transcript: list, interview_type: str, skills: str
+        self.enabled = llm_client.enabled
+        self._tasks = {}  # interview_id -> {message_id: grading task}
+
+    async def score_interview(
+        self, transcript: list, interview_type: str, skills: str, raise_errors: bool = False
     ) -> dict:
         """
         transcript: list of {"role": "ai"|"user", "content": str}
-        Returns a scoring dict.
+        Returns a scoring dict. LLM failures fall back to a mock score unless
+        raise_errors is set (the report queue retries them instead).
         """
         if not self.enabled or not transcript:
             return self._mock_score()
@@ -66,22 +111,251 @@ Be strict and honest. Score based on:
 - overall_score: weighted average"""
 
         try:
-            completion = self.client.chat.completions.create(
+            raw = await llm_client.chat(
                 model="llama-3.1-8b-instant",
                 messages=[{"role": "user", "content": prompt}],
                 max_tokens=600,
                 temperature=0.3,
             )
-            raw = completion.choices[0].message.content.strip()
+            raw = raw.strip()
             # Extract JSON
             start = raw.find("{")
             end = raw.rfind("}") + 1
             if start != -1 and end != 0:
                 return json.loads(raw[start:end])
+            raise ValueError(f"no JSON in interview score: {raw[:80]!r}")
         except Exception as e:
+            if raise_errors:
+                raise
             print(f"Scoring error: {e}")
         return self._mock_score()
 
+    # ─── Per-answer scoring ──────────────────────────────────────────────────
+
+    def schedule_answer(
+        self,
+        interview_id: int,
+        message_id: int,
+        question: str,
+        answer: str,
+        interview_type: str,
+        skills: str,
+    ):
+        """Grade an answer in the background (stored in answer_scores)."""
+        task = asyncio.get_running_loop().create_task(
+            self.score_answer(interview_id, message_id, question, answer, interview_type, skills)
+        )
+        tasks = self._tasks.setdefault(interview_id, {})
+        tasks[message_id] = task
+        task.add_done_callback(lambda _: self._forget(interview_id, message_id))
+
+    def _forget(self, interview_id: int, message_id: int):
+        tasks = self._tasks.get(interview_id, {})
+        tasks.pop(message_id, None)
+        if not tasks:
+            self._tasks.pop(interview_id, None)
+
+    async def score_answer(
+        self,
+        interview_id: int,
+        message_id: int,
+        question: str,
+        answer: str,
+        interview_type: str,
+        skills: str,
+    ) -> dict:
+        """Grade one answer and store it. Returns the grade, or None if it failed."""
+        try:
+            grade = await self._grade(question, answer, interview_type, skills)
+            conn = connect()
+            try:
+                conn.execute(
+                    """INSERT OR REPLACE INTO answer_scores
+                    (message_id, interview_id, technical_score, communication_score, hr_score,
+                     strength, improvement, note)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
+                    (
+                        message_id,
+                        interview_id,
+                        grade["technical_score"],
+                        grade["communication_score"],
+                        grade["hr_score"],
+                        grade["strength"],
+                        grade["improvement"],
+                        grade["note"],
+                    ),
+                )
+                conn.commit()
+            finally:
+                conn.close()
+            return grade
+        except Exception as e:
+            print(f"Answer scoring error: {e}")
+            return None
+
+    async def _grade(self, question: str, answer: str, interview_type: str, skills: str) -> dict:
+        if not self.enabled:
+            return self._mock_answer_score()
+        raw = await llm_client.chat(
+            model=settings.ANSWER_SCORE_MODEL,
+            messages=[
+                {
+                    "role": "user",
+                    "content": ANSWER_PROMPT.format(
+                        interview_type=interview_type,
+                        skills=skills,
+                        question=question or "(opening question)",
+                        answer=answer,
+                    ),
+                }
+            ],
+            max_tokens=200,
+            temperature=0.2,
+        )
+        start = raw.find("{")
+        end = raw.rfind("}") + 1
+        if start == -1 or end == 0:
+            raise ValueError(f"no JSON in answer grade: {raw[:80]!r}")
+        data = json.loads(raw[start:end])
+        grade = {key: min(max(float(data[key]), 0.0), 100.0) for key in SCORE_KEYS}
+        for key in ("strength", "improvement", "note"):
+            grade[key] = str(data.get(key) or "").strip()
+        return grade
+
+    async def finish_answers(
+        self, db, interview_id: int, interview_type: str, skills: str
+    ) -> list:
+        """
+        Wait (up to ANSWER_SCORE_WAIT_S) for grading still in flight, grade any
+        answer that never got a grade, and return the interview's answer_scores.
+        Raises if any answer is still ungraded, so the report is never averaged
+        over a partial set.
+        """
+        in_flight = dict(self._tasks.get(interview_id, {}))
+        if in_flight:
+            await asyncio.wait(in_flight.values(), timeout=settings.ANSWER_SCORE_WAIT_S)
+
+        rows = db.execute(
+            """SELECT m.id, m.role, m.content, s.message_id AS scored
+               FROM interview_messages m
+               LEFT JOIN answer_scores s ON s.message_id = m.id
+               WHERE m.interview_id = ? ORDER BY m.id""",
+            (interview_id,),
+        ).fetchall()
+        missing, question = [], ""
+        for row in rows:
+            if row["role"] == "ai":
+                question = row["content"]
+            elif (
+                row["scored"] is None
+                and row["id"] not in in_flight
+                and is_gradable(row["content"])
+            ):
+                missing.append((row["id"], question, row["content"]))
+        if missing:
+            await asyncio.gather(
+                *(
+                    self.score_answer(interview_id, message_id, q, answer, interview_type, skills)
+                    for message_id, q, answer in missing
+                )
+            )
+        scores = self.load_answer_scores(db, interview_id)
+        answers = sum(1 for row in rows if row["role"] == "user" and is_gradable(row["content"]))
+        if len(scores) < answers:
+            raise RuntimeError(f"{answers - len(scores)} of {answers} answers could not be graded")
+        return scores
+
+    def load_answer_scores(self, db, interview_id: int) -> list:
+        # Time-up placeholders graded before they were excluded do not count
+        rows = db.execute(
+            """SELECT s.* FROM answer_scores s
+               JOIN interview_messages m ON m.id = s.message_id
+               WHERE s.interview_id = ? AND TRIM(m.content) != ?
+               ORDER BY s.message_id""",
+            (interview_id, TIME_EXPIRED_ANSWER),
+        ).fetchall()
+        return [dict(r) for r in rows]
+
+    async def aggregate(
+        self, answer_scores: list, interview_type: str, skills: str, raise_errors: bool = False
+    ) -> dict:
+        """Combine per-answer grades into the report's scoring dict."""
+        if not self.enabled:
+            return self._mock_score()
+
+        scores = {
+            key: round(sum(a[key] for a in answer_scores) / len(answer_scores), 1)
+            for key in SCORE_KEYS
+        }
+        scores["overall_score"] = round(sum(scores.values()) / len(SCORE_KEYS), 1)
+
+        # Strengths from the best answers, improvements from the weakest
+        ranked = sorted(answer_scores, key=lambda a: sum(a[k] for k in SCORE_KEYS), reverse=True)
+        scores["strengths"] = self._distinct(a["strength"] for a in ranked)
+        scores["improvements"] = self._distinct(a["improvement"] for a in reversed(ranked))
+        scores["summary"] = await self._assessment(
+            scores, answer_scores, interview_type, skills, raise_errors
+        )
+        return scores
+
+    @staticmethod
+    def _distinct(phrases, limit: int = 3) -> list:
+        counts = Counter(p for p in phrases if p)
+        return [p for p, _ in counts.most_common()][:limit]
+
+    async def _assessment(
+        self,
+        scores: dict,
+        answer_scores: list,
+        interview_type: str,
+        skills: str,
+        raise_errors: bool = False,
+    ) -> str:
+        notes = [a["note"] for a in answer_scores if a["note"]]
+        if len(notes) > MAX_ASSESSMENT_NOTES:
+            step = len(notes) / MAX_ASSESSMENT_NOTES
+            notes = [notes[int(i * step)] for i in range(MAX_ASSESSMENT_NOTES)]
+        try:
+            text = await llm_client.chat(
+                model=settings.ANSWER_SCORE_MODEL,
+                messages=[
+                    {
+                        "role": "user",
+                        "content": ASSESSMENT_PROMPT.format(
+                            interview_type=interview_type,
+                            skills=skills,
+                            notes="\n".join(f"- {n}" for n in notes) or "- (none)",
+                            **scores,
+                        ),
+                    }
+                ],
+                max_tokens=200,
+                temperature=0.3,
+            )
+            return text.strip()
+        except Exception as e:
+            if raise_errors:
+                raise
+            print(f"Scoring error: {e}")
+        return (
+            f"Across {len(answer_scores)} answers the candidate averaged "
+            f"{scores['technical_score']:.0f} technical, {scores['communication_score']:.0f} "
+            f"communication and {scores['hr_score']:.0f} HR out of 100."
+        )
+
+    def delete(self, db, interview_id: int):
+        db.execute("DELETE FROM answer_scores WHERE interview_id = ?", (interview_id,))
+
+    def _mock_answer_score(self) -> dict:
+        return {
+            "technical_score": 68.0,
+            "communication_score": 78.0,
+            "hr_score": 70.0,
+            "strength": "",
+            "improvement": "",
+            "note": "",
+        }
+
     def _mock_score(self) -> dict:
         return {
             "overall_score": 72,
@@ -0,0 +1,125 @@
+"""
+ChatSessionCache — in-memory chat state for interviews in progress.
+
+Holds each interview's row, system prompt, rolling summary, the messages
+after it and the round counter, so a chat turn does not re-read the
+interview or its transcript. Every change is written through to SQLite
+first; entries expire after SESSION_TTL_S without use and the cache is
+capped at SESSION_MAX_ENTRIES (least recently used evicted).
+"""
+
+import time
+from collections import OrderedDict
+from core.config import settings
+from agents.interviewer import interviewer, INTERVIEW_MODEL
+from agents.history import history_manager
+
+
+class ChatSession:
+    def __init__(self, interview: dict, summary: str, turns: list):
+        self.interview = interview
+        self.system_prompt = interviewer.build_system_prompt(
+            interview["interview_type"], interview["skills"], interview["duration_minutes"]
+        )
+        self.summary = summary
+        self.turns = turns  # {"id", "role", "content"} after the summary
+        self.last_used = time.monotonic()
+
+    @property
+    def interview_id(self) -> int:
+        return self.interview["id"]
+
+    @property
+    def round(self) -> int:
+        return self.interview["round"]
+
+    def history(self, model: str = INTERVIEW_MODEL) -> list:
+        return history_manager.compose(
+            self.interview_id,
+            self.system_prompt,
+            self.summary,
+            self.turns,
+            model,
+            on_summary=self._apply_summary,
+        )
+
+    def last_question(self) -> str:
+        """The interviewer's latest message (the question being answered)."""
+        return next((m["content"] for m in reversed(self.turns) if m["role"] == "ai"), "")
+
+    def add_message(self, db, role: str, content: str) -> int:
+        """Write-through: insert the message, then append it here. Returns its id."""
+        cursor = db.execute(
+            "INSERT INTO interview_messages (interview_id, role, content) VALUES (?, ?, ?)",
+            (self.interview_id, role, content),
+        )
+        self.turns.append({"id": cursor.lastrowid, "role": role, "content": content})
+        return cursor.lastrowid
+
+    def set_round(self, db, new_round: int):
+        db.execute("UPDATE interviews SET round=? WHERE id=?", (new_round, self.interview_id))
+        self.interview["round"] = new_round
+
+    def _apply_summary(self, summary: str, covered_message_id: int):
+        self.summary = summary
+        self.turns = [m for m in self.turns if m["id"] > covered_message_id]
+
+
+class ChatSessionCache:
+    def __init__(self, ttl: float, max_entries: int):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._sessions = OrderedDict()  # interview_id -> ChatSession
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, db, interview_id: int, user_id: int):
+        """The session for an interview the user owns, loading it on a miss (else None)."""
+        self._expire()
+        session = self._sessions.get(interview_id)
+        if session is not None:
+            if session.interview["user_id"] != user_id:
+                return None
+            self.hits += 1
+            self._sessions.move_to_end(interview_id)
+            session.last_used = time.monotonic()
+            return session
+
+        row = db.execute(
+            "SELECT * FROM interviews WHERE id = ? AND user_id = ?", (interview_id, user_id)
+        ).fetchone()
+        if not row:
+            return None
+        self.misses += 1
+        summary, turns = history_manager.load(db, interview_id)
+        session = ChatSession(dict(row), summary, turns)
+        self._sessions[interview_id] = session
+        while len(self._sessions) > self.max_entries:
+            self._sessions.popitem(last=False)
+        return session
+
+    def drop(self, interview_id: int):
+        """Forget an interview (ended, terminated, restarted or deleted)."""
+        self._sessions.pop(interview_id, None)
+
+    def _expire(self):
+        cutoff = time.monotonic() - self.ttl
+        while self._sessions:
+            interview_id, session = next(iter(self._sessions.items()))
+            if session.last_used >= cutoff:
+                break
+            del self._sessions[interview_id]
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "sessions": len(self._sessions),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
+
+
+chat_sessions = ChatSessionCache(
+    ttl=settings.SESSION_TTL_S, max_entries=settings.SESSION_MAX_ENTRIES
+)
@@ -0,0 +1,164 @@
+"""
+Text-to-speech engines behind InterviewerAgent.text_to_audio.
+
+  gtts    Google Translate TTS (network round trip per phrase)
+  espeak  espeak-ng / espeak CLI, fully local
+  piper   piper CLI with a local .onnx voice, fully local
+
+Engine, voice, sample rate and output codec come from core/config.py. When the
+requested codec (mp3, wav, or opus for compact Ogg/Opus speech) or sample rate
+differs from what the engine produces, the output is transcoded with ffmpeg.
+"""
+
+import os
+import shutil
+import subprocess
+import uuid
+from core.config import settings
+
+# ffmpeg output arguments per codec (mono speech)
+CODEC_ARGS = {
+    "mp3": ["-ac", "1", "-codec:a", "libmp3lame", "-q:a", "4", "-f", "mp3"],
+    "wav": ["-ac", "1", "-codec:a", "pcm_s16le", "-f", "wav"],
+    # Opus in an Ogg container, VoIP mode: intelligible speech at ~16-32 kbps
+    "opus": [
+        "-ac", "1", "-codec:a", "libopus", "-b:a", settings.TTS_OPUS_BITRATE,
+        "-application", "voip", "-f", "ogg",
+    ],
+}
+
+# File extension per codec (when it differs from the codec name)
+CODEC_EXT = {"opus": "ogg"}
+
+
+class TTSEngine:
+    name = ""
+    native_ext = "wav"
+
+    def __init__(self, voice: str = ""):
+        self.voice = voice
+
+    def available(self) -> bool:
+        return True
+
+    def synthesize(self, text: str, path: str):
+        """Write speech for text to path in this engine's native format."""
+        raise NotImplementedError
+
+
+class GTTSEngine(TTSEngine):
+    name = "gtts"
+    native_ext = "mp3"
+
+    def __init__(self, voice: str = ""):
+        super().__init__(voice or "en")
+
+    def synthesize(self, text: str, path: str):
+        from gtts import gTTS
+
+        gTTS(text=text, lang=self.voice, slow=False).save(path)
+
+
+class EspeakEngine(TTSEngine):
+    name = "espeak"
+
+    def __init__(self, voice: str = ""):
+        super().__init__(voice or "en-us")
+        self.binary = shutil.which("espeak-ng") or shutil.which("espeak")
+
+    def available(self) -> bool:
+        return self.binary is not None
+
+    def synthesize(self, text: str, path: str):
+        subprocess.run(
+            [self.binary, "-v", self.voice, "-w", path, "--stdin"],
+            input=text.encode("utf-8"),
+            check=True,
+            capture_output=True,
+        )
+
+
+class PiperEngine(TTSEngine):
+    name = "piper"
+
+    def __init__(self, voice: str = ""):
+        # voice is the path to a piper .onnx model
+        super().__init__(voice or settings.TTS_PIPER_MODEL)
+        self.binary = shutil.which("piper")
+
+    def available(self) -> bool:
+        return self.binary is not None and os.path.exists(self.voice)
+
+    def synthesize(self, text: str, path: str):
+        subprocess.run(
+            [self.binary, "--model", self.voice, "--output_file", path],
+            input=text.encode("utf-8"),
+            check=True,
+            capture_output=True,
+        )
+
+
+ENGINES = {engine.name: engine for engine in (GTTSEngine, EspeakEngine, PiperEngine)}
+
+
+class SpeechSynthesizer:
+    """An engine plus the output codec/sample rate the app serves."""
+
+    def __init__(self, engine: TTSEngine, codec: str = "mp3", sample_rate: int = 0):
+        self.engine = engine
+        self.codec = codec
+        self.sample_rate = sample_rate
+        self.transcode = codec != engine.native_ext or bool(sample_rate)
+        if self.transcode and not shutil.which("ffmpeg"):
+            print(
+                f"⚠️ ffmpeg not found — serving {engine.name} output as "
+                f"{engine.native_ext} at its native sample rate"
+            )
+            self.codec, self.sample_rate, self.transcode = engine.native_ext, 0, False
+
+    @property
+    def ext(self) -> str:
+        return CODEC_EXT.get(self.codec, self.codec)
+
+    @property
+    def voice(self) -> str:
+        """Everything besides the text that changes the audio (part of the cache key)."""
+        codec = f"opus@{settings.TTS_OPUS_BITRATE}" if self.codec == "opus" else self.codec
+        return f"{self.engine.name}|{self.engine.voice}|{codec}|{self.sample_rate or 'native'}"
+
+    def synthesize(self, text: str, path: str):
+        if not self.transcode:
+            self.engine.synthesize(text, path)
+            return
+        # .tmp suffix: storage sweeps leave in-flight files alone
+        raw_path = f"{path}.{uuid.uuid4().hex}.{self.engine.native_ext}.tmp"
+        try:
+            self.engine.synthesize(text, raw_path)
+            cmd = ["ffmpeg", "-y", "-loglevel", "error", "-i", raw_path]
+            if self.sample_rate:
+                cmd += ["-ar", str(self.sample_rate)]
+            subprocess.run(cmd + CODEC_ARGS[self.codec] + [path], check=True, capture_output=True)
+        finally:
+            if os.path.exists(raw_path):
+                os.remove(raw_path)
+
+
+def create_synthesizer(
+    engine: str = None, voice: str = None, codec: str = None, sample_rate: int = None
+) -> SpeechSynthesizer:
+    """Build the synthesizer from settings (arguments override them)."""
+    name = engine or settings.TTS_ENGINE
+    if name not in ENGINES:
+        raise ValueError(f"TTS_ENGINE must be one of {list(ENGINES)}")
+    selected = ENGINES[name](settings.TTS_VOICE if voice is None else voice)
+    if not selected.available():
+        print(f"❌ TTS engine '{name}' is not available here — falling back to gtts")
+        selected = GTTSEngine()
+    return SpeechSynthesizer(
+        selected,
+        codec=codec or settings.TTS_CODEC,
+        sample_rate=settings.TTS_SAMPLE_RATE if sample_rate is None else sample_rate,
+    )
+
+
+tts = create_synthesizer()
@@ -0,0 +1,221 @@
+"""
+TTSCache — content-addressed store for synthesized speech in static/audio.
+
+Files are named by a hash of the normalized text plus the voice settings, so
+the same sentence spoken with the same voice is synthesized once and then
+served from disk. Writes are atomic (temp file + rename) and concurrent
+requests for the same phrase share one synthesis through a per-key lock.
+
+submit() returns the (deterministic) path immediately and synthesizes in a
+background executor; pending(name) exposes the job so the audio endpoint can
+wait on it. The text of each submitted job is kept in tts_requests until its
+file exists, so a synthesis interrupted by a restart can be started again;
+one that keeps failing is retried with backoff, RESYNTH_MAX_FAILURES times.
+submit() and requested() touch the database — call them off the event loop.
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from core.config import settings
+from core.database import connect
+
+AUDIO_DIR = os.path.join("static", "audio")
+
+# Failed syntheses of a requested file before its text is dropped (then 404)
+RESYNTH_MAX_FAILURES = 3
+RESYNTH_RETRY_BASE_S = 5.0
+
+
+def normalize_text(text: str) -> str:
+    """Collapse whitespace so trivially different renderings share one file."""
+    return " ".join(text.split())
+
+
+class TTSCache:
+    def __init__(self, directory: str = AUDIO_DIR, workers: int = 4):
+        self.directory = directory
+        self.workers = workers
+        self._lock = threading.Lock()
+        self._key_locks = {}  # key -> [lock, users]
+        self._executor = None
+        self._pending = {}  # file name -> Future of a background synthesis
+        self.hits = 0
+        self.misses = 0
+        self.synth_seconds = 0.0
+
+    def key(self, text: str, voice: str) -> str:
+        payload = f"{voice}\n{normalize_text(text)}".encode("utf-8")
+        return hashlib.sha256(payload).hexdigest()[:32]
+
+    def path_for(self, key: str, ext: str = "mp3") -> str:
+        return os.path.join(self.directory, f"{key}.{ext}")
+
+    def get_or_create(self, text: str, voice: str, synthesize, ext: str = "mp3") -> str:
+        """
+        Return the cached file for (text, voice), calling synthesize(text, path)
+        to create it on a miss. Returns the path even if synthesis failed, so
+        callers keep their old "URL may 404" behaviour.
+        """
+        key = self.key(text, voice)
+        path = self.path_for(key, ext)
+        if self._exists(path):
+            self.hits += 1
+            return path
+
+        key_lock = self._acquire(key)
+        try:
+            with key_lock:
+                # Another request may have finished it while we waited
+                if self._exists(path):
+                    self.hits += 1
+                    return path
+                self.misses += 1
+                os.makedirs(self.directory, exist_ok=True)
+                tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+                start = time.perf_counter()
+                try:
+                    synthesize(normalize_text(text), tmp_path)
+                    if self._exists(tmp_path):
+                        os.replace(tmp_path, path)
+                except Exception as e:
+                    print(f"TTS Error: {e}")
+                finally:
+                    self.synth_seconds += time.perf_counter() - start
+                    if os.path.exists(tmp_path):
+                        os.remove(tmp_path)
+        finally:
+            self._release(key)
+        return path
+
+    def submit(self, text: str, voice: str, synthesize, ext: str = "mp3") -> str:
+        """Return the path for (text, voice) at once; synthesize it in the background."""
+        path = self.path_for(self.key(text, voice), ext)
+        if self._exists(path):
+            self.hits += 1
+            return path
+        name = os.path.basename(path)
+        with self._lock:
+            if name in self._pending:
+                return path
+        # Stored before the job exists, so _finish can never run ahead of it
+        self._remember(name, text, voice)
+        with self._lock:
+            if name in self._pending:
+                return path
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix="tts"
+                )
+            future = self._executor.submit(self.get_or_create, text, voice, synthesize, ext)
+            self._pending[name] = future
+            future.add_done_callback(lambda _, name=name, path=path: self._finish(name, path))
+        return path
+
+    def pending(self, name: str):
+        """The Future of an in-flight background synthesis for this file, if any."""
+        with self._lock:
+            return self._pending.get(name)
+
+    def requested(self, name: str, voice: str):
+        """
+        A submitted file that was never written (e.g. lost to a restart), as
+        {"text", "retry_at"}, or None.
+        """
+        conn = connect()
+        try:
+            row = conn.execute(
+                "SELECT text, retry_at FROM tts_requests WHERE name = ? AND voice = ?",
+                (name, voice),
+            ).fetchone()
+        finally:
+            conn.close()
+        return dict(row) if row else None
+
+    def _remember(self, name: str, text: str, voice: str):
+        conn = connect()
+        try:
+            conn.execute(
+                "INSERT OR IGNORE INTO tts_requests (name, text, voice) VALUES (?, ?, ?)",
+                (name, normalize_text(text), voice),
+            )
+            conn.commit()
+        except sqlite3.Error as e:
+            print(f"TTS request log error: {e}")
+        finally:
+            conn.close()
+
+    def _finish(self, name: str, path: str):
+        with self._lock:
+            self._pending.pop(name, None)
+        conn = connect()
+        try:
+            row = conn.execute(
+                "SELECT failures FROM tts_requests WHERE name = ?", (name,)
+            ).fetchone()
+            failures = (row["failures"] if row else 0) + 1
+            if self._exists(path) or failures >= RESYNTH_MAX_FAILURES:
+                conn.execute("DELETE FROM tts_requests WHERE name = ?", (name,))
+            else:
+                # Keep the text: a later request for the file retries it
+                conn.execute(
+                    "UPDATE tts_requests SET failures = ?, retry_at = ? WHERE name = ?",
+                    (failures, time.time() + RESYNTH_RETRY_BASE_S * 2 ** (failures - 1), name),
+                )
+            conn.commit()
+        except sqlite3.Error as e:
+            print(f"TTS request log error: {e}")
+        finally:
+            conn.close()
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def warm(self, phrases: list, voice: str, synthesize, ext: str = "mp3"):
+        """Pre-synthesize known phrases (blocking; run it off the request path)."""
+        ready = sum(
+            self._exists(self.get_or_create(phrase, voice, synthesize, ext))
+            for phrase in phrases
+        )
+        print(f"🔊 TTS cache warmed ({ready}/{len(phrases)} phrases ready)")
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "synth_seconds": round(self.synth_seconds, 2),
+            "pending": len(self._pending),
+        }
+
+    # ─── Per-key locks ───────────────────────────────────────────────────────
+
+    @staticmethod
+    def _exists(path: str) -> bool:
+        try:
+            return os.path.getsize(path) > 0
+        except OSError:
+            return False
+
+    def _acquire(self, key: str) -> threading.Lock:
+        with self._lock:
+            entry = self._key_locks.setdefault(key, [threading.Lock(), 0])
+            entry[1] += 1
+            return entry[0]
+
+    def _release(self, key: str):
+        with self._lock:
+            entry = self._key_locks[key]
+            entry[1] -= 1
+            if entry[1] == 0:
+                del self._key_locks[key]
+
+
+tts_cache = TTSCache(workers=settings.TTS_WORKERS)
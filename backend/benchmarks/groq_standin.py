@@ -0,0 +1,336 @@
+"""
+Groq stand-in — a local OpenAI/Groq-compatible chat-completions server.
+
+Lets the backend run its real LLM code path offline: point it here with
+LLM_BASE_URL and every agent talks to this server instead of api.groq.com.
+
+  - POST /openai/v1/chat/completions (also /v1/...), streaming or not, with
+    usage reported like Groq (x_groq.usage on the last stream chunk)
+  - latency profiles: time to first token (lognormal) and tokens/sec (normal)
+  - injected failures: random 500s and 429s (with Retry-After), an optional
+    per-model requests/min limit, or force one with an X-Standin-Fail header
+  - deterministic replies: the same messages always get the same text, and
+    scorer (whole interview or per answer) / learning-path / summary / resume
+    prompts get well-formed canned output of the shape those agents parse
+
+Run from backend/, then start the API with LLM_BASE_URL set:
+
+    python benchmarks/groq_standin.py --port 8100 --profile groq
+    python benchmarks/groq_standin.py --profile slow --error-rate 0.02 --rate-limit-rate 0.05
+    LLM_BASE_URL=http://127.0.0.1:8100 uvicorn main:app
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import random
+import time
+import uuid
+from collections import Counter, defaultdict, deque
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+# name -> (median time to first token s, its lognormal sigma, tokens/s mean, tokens/s stddev)
+PROFILES = {
+    "instant": (0.0, 0.0, 0.0, 0.0),  # no delays at all
+    "groq": (0.25, 0.35, 280.0, 40.0),
+    "slow": (1.2, 0.5, 45.0, 10.0),
+    "congested": (3.0, 0.8, 25.0, 10.0),
+}
+
+QUESTIONS = [
+    "Thanks for walking me through that. What was the hardest technical trade-off you made there, and why?",
+    "Interesting. How did you measure whether that change actually improved things?",
+    "Let's go a bit deeper. How would you design that component if traffic grew tenfold?",
+    "Can you tell me about a time you disagreed with a teammate and how you resolved it?",
+    "How do you decide what to test, and what does your testing setup usually look like?",
+    "If you had to debug a slow endpoint in production right now, where would you start?",
+    "What is a technology on your resume you would choose differently today, and why?",
+    "How do you keep a codebase maintainable as more people start contributing to it?",
+]
+
+TOPICS = [
+    ("Technical", "System Design Fundamentals", ["System Design Primer (GitHub)", "Designing Data-Intensive Applications"]),
+    ("Technical", "Data Structures & Algorithms", ["LeetCode", "Cracking the Coding Interview"]),
+    ("Technical", "Testing and Debugging Practice", ["Google Testing Blog", "Effective Debugging"]),
+    ("Communication", "STAR Method for Behavioral Answers", ["Big Interview", "YouTube: STAR Method tutorial"]),
+    ("Communication", "Explaining Technical Trade-offs", ["Toastmasters", "The Pyramid Principle"]),
+    ("Behavioral", "Leadership & Conflict Resolution", ["Harvard Business Review", "Crucial Conversations"]),
+    ("Behavioral", "Ownership and Impact Stories", ["The Manager's Path", "Staff Engineer (Will Larson)"]),
+]
+
+
+def count_tokens(text: str) -> int:
+    """Same rough ~4 characters per token the backend uses for its estimates."""
+    return max(len(text) // 4, 1)
+
+
+# ─── Canned replies ──────────────────────────────────────────────────────────
+
+
+def reply_for(messages: list) -> str:
+    """Deterministic reply text: seeded by the messages, shaped by the prompt kind."""
+    digest = hashlib.sha256(json.dumps(messages, sort_keys=True).encode()).digest()
+    rng = random.Random(digest)
+    prompt = messages[-1]["content"] if messages else ""
+
+    if "expert interview evaluator" in prompt:
+        technical, communication, hr = (rng.randint(45, 92) for _ in range(3))
+        return json.dumps(
+            {
+                "overall_score": round(0.4 * technical + 0.35 * communication + 0.25 * hr),
+                "technical_score": technical,
+                "communication_score": communication,
+                "hr_score": hr,
+                "strengths": rng.sample(
+                    [
+                        "Clear structure in answers",
+                        "Solid grasp of core concepts",
+                        "Good use of concrete examples",
+                        "Calm and professional tone",
+                        "Honest about knowledge gaps",
+                    ],
+                    3,
+                ),
+                "improvements": rng.sample(
+                    [
+                        "Quantify the impact of past work",
+                        "Go deeper on system design trade-offs",
+                        "Keep answers more concise",
+                        "Use the STAR method for behavioral questions",
+                        "Discuss testing strategy proactively",
+                    ],
+                    3,
+                ),
+                "summary": "The candidate answered most questions clearly and showed practical "
+                "experience. More depth on trade-offs and measurable outcomes would strengthen "
+                "their performance.",
+            }
+        )
+
+    if prompt.startswith("You are grading a single answer"):
+        return json.dumps(
+            {
+                "technical_score": rng.randint(40, 95),
+                "communication_score": rng.randint(50, 95),
+                "hr_score": rng.randint(50, 95),
+                "strength": rng.choice(
+                    ["Concrete example", "Clear structure", "Accurate terminology", "Owned the outcome", ""]
+                ),
+                "improvement": rng.choice(
+                    ["Quantify the impact", "Explain the trade-offs", "Be more concise", "Mention testing", ""]
+                ),
+                "note": "The answer addressed the question with some relevant detail.",
+            }
+        )
+
+    if prompt.startswith("Write the overall assessment"):
+        return (
+            "The candidate gave mostly clear, relevant answers with practical examples. "
+            "Quantifying impact and discussing trade-offs in more depth would raise the scores."
+        )
+
+    if "personalized learning path" in prompt:
+        return json.dumps(
+            [
+                {
+                    "category": category,
+                    "topic": topic,
+                    "description": f"Focused practice on {topic.lower()} addresses the gaps seen in this interview.",
+                    "resources": resources,
+                    "estimated_hours": rng.choice([4, 6, 10, 15, 20, 30]),
+                    "priority": priority,
+                }
+                for (category, topic, resources), priority in zip(
+                    rng.sample(TOPICS, 5), ["High", "High", "Medium", "Medium", "Low"]
+                )
+            ]
+        )
+
+    if "running summary of a job interview" in prompt:
+        return (
+            "The candidate described their recent projects and answered questions on design, "
+            "debugging and teamwork. Answers were generally clear; the interviewer still wants "
+            "more detail on measurable impact and scaling trade-offs."
+        )
+
+    if prompt.startswith("Analyze this resume"):
+        return (
+            "Top skills: Python (backend services, FastAPI), JavaScript/React, and SQL data "
+            "modelling. Projects include a REST API with background workers and a dashboard "
+            "front end deployed on a cloud VM."
+        )
+
+    return rng.choice(QUESTIONS)
+
+
+# ─── Server ──────────────────────────────────────────────────────────────────
+
+
+class StandIn:
+    def __init__(self, args):
+        self.ttft_median, self.ttft_sigma, self.tps_mean, self.tps_std = PROFILES[args.profile]
+        if args.ttft_ms is not None:
+            self.ttft_median = args.ttft_ms / 1000
+        if args.tps is not None:
+            self.tps_mean = args.tps
+        self.error_rate = args.error_rate
+        self.rate_limit_rate = args.rate_limit_rate
+        self.rpm = args.rpm
+        self.rng = random.Random(args.seed)
+        self.calls = defaultdict(deque)  # model -> request times in the last minute
+        self.counts = Counter()
+
+    def ttft(self) -> float:
+        if not self.ttft_median:
+            return 0.0
+        return self.rng.lognormvariate(0.0, self.ttft_sigma) * self.ttft_median
+
+    def token_delay(self) -> float:
+        if not self.tps_mean:
+            return 0.0
+        return 1.0 / max(self.rng.gauss(self.tps_mean, self.tps_std), 1.0)
+
+    def failure(self, request: Request, model: str):
+        """An error response to send instead of a completion, or None."""
+        forced = request.headers.get("x-standin-fail")
+        now = time.monotonic()
+        calls = self.calls[model]
+        while calls and calls[0] < now - 60:
+            calls.popleft()
+
+        if forced == "429" or (self.rpm and len(calls) >= self.rpm):
+            retry_after = max(60 - (now - calls[0]), 1) if calls and not forced else 2
+            return self._error(429, "rate_limit_exceeded", f"Rate limit reached for {model}", retry_after)
+        if forced == "500":
+            return self._error(500, "internal_server_error", "Injected failure")
+
+        roll = self.rng.random()
+        if roll < self.rate_limit_rate:
+            return self._error(429, "rate_limit_exceeded", f"Rate limit reached for {model}", 2)
+        if roll < self.rate_limit_rate + self.error_rate:
+            return self._error(500, "internal_server_error", "Injected failure")
+        calls.append(now)
+        return None
+
+    def _error(self, status: int, code: str, message: str, retry_after: float = None):
+        self.counts[str(status)] += 1
+        headers = {"retry-after": f"{retry_after:.0f}"} if retry_after else None
+        return JSONResponse(
+            {"error": {"message": message, "type": code, "code": code}},
+            status_code=status,
+            headers=headers,
+        )
+
+    async def complete(self, request: Request):
+        body = await request.json()
+        model = body.get("model", "standin")
+        failed = self.failure(request, model)
+        if failed is not None:
+            return failed
+
+        messages = body.get("messages", [])
+        words = reply_for(messages).split(" ")
+        max_tokens = body.get("max_tokens")
+        if max_tokens:
+            # Cut at roughly max_tokens, like a real length stop
+            kept, tokens = [], 0
+            for word in words:
+                tokens += count_tokens(word + " ")
+                if tokens > max_tokens:
+                    break
+                kept.append(word)
+            words = kept or words[:1]
+        text = " ".join(words)
+        usage = {
+            "prompt_tokens": sum(count_tokens(m.get("content") or "") + 4 for m in messages),
+            "completion_tokens": count_tokens(text),
+        }
+        usage["total_tokens"] = usage["prompt_tokens"] + usage["completion_tokens"]
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:24]}"
+        created = int(time.time())
+        self.counts["ok"] += 1
+        self.counts["tokens"] += usage["total_tokens"]
+
+        if not body.get("stream"):
+            await asyncio.sleep(
+                self.ttft() + sum(self.token_delay() for _ in range(usage["completion_tokens"]))
+            )
+            return {
+                "id": completion_id,
+                "object": "chat.completion",
+                "created": created,
+                "model": model,
+                "choices": [
+                    {
+                        "index": 0,
+                        "message": {"role": "assistant", "content": text},
+                        "finish_reason": "stop",
+                        "logprobs": None,
+                    }
+                ],
+                "usage": usage,
+            }
+
+        def chunk(delta: dict, finish_reason=None, **extra) -> str:
+            data = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": created,
+                "model": model,
+                "choices": [
+                    {"index": 0, "delta": delta, "finish_reason": finish_reason, "logprobs": None}
+                ],
+                **extra,
+            }
+            return f"data: {json.dumps(data)}\n\n"
+
+        async def events():
+            await asyncio.sleep(self.ttft())
+            yield chunk({"role": "assistant", "content": ""})
+            for i, word in enumerate(words):
+                piece = word if i == 0 else " " + word
+                await asyncio.sleep(self.token_delay() * count_tokens(piece))
+                yield chunk({"content": piece})
+            yield chunk({}, "stop", x_groq={"id": completion_id, "usage": usage})
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+
+def create_app(args) -> FastAPI:
+    standin = StandIn(args)
+    app = FastAPI(title="Groq stand-in")
+    app.add_api_route("/openai/v1/chat/completions", standin.complete, methods=["POST"])
+    app.add_api_route("/v1/chat/completions", standin.complete, methods=["POST"])
+
+    @app.get("/stats")
+    def stats():
+        return dict(standin.counts)
+
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--profile", choices=list(PROFILES), default="groq")
+    parser.add_argument("--ttft-ms", type=float, help="override the profile's median TTFT")
+    parser.add_argument("--tps", type=float, help="override the profile's mean tokens/sec")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction answered 500")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="fraction answered 429")
+    parser.add_argument("--rpm", type=int, default=0, help="per-model requests/min before 429")
+    parser.add_argument("--seed", type=int, default=0, help="seed for latency and failures")
+    args = parser.parse_args()
+
+    import uvicorn
+
+    print(f"🧪 Groq stand-in on http://{args.host}:{args.port} (profile {args.profile})")
+    uvicorn.run(create_app(args), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+"""
+Interview flow benchmark — end-to-end /start → /chat×N → /end → report timings.
+
+Drives main.app in-process with a scripted candidate (same answers and
+elapsed times every run) against a throwaway database. Combine it with the
+cassette to make runs reproducible: record once against Groq (or the
+stand-in), then replay with the recorded latency or with none. Reports
+p50/p95/mean per step and the cassette hit/miss counts. Run from backend/:
+
+    python benchmarks/interview_flow.py --mode record --cassette cassettes/flow.db
+    python benchmarks/interview_flow.py --mode replay --cassette cassettes/flow.db
+    python benchmarks/interview_flow.py --mode replay --latency zero --interviews 5 --stream
+
+Speech already in static/audio is served from the TTS cache without reaching
+the cassette; clear it for a cold-audio run.
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+os.chdir(BACKEND_DIR)
+
+ANSWERS = [
+    "I led the rewrite of our order service from a monolith module into a FastAPI service with a Postgres backend.",
+    "The hardest part was migrating live data; we ran both paths in parallel and compared results for two weeks.",
+    "I profiled the slow endpoints with py-spy, found N+1 queries and replaced them with a single joined query.",
+    "We added contract tests between services and a load test in CI that fails on p95 regressions.",
+    "When I disagreed with a teammate on caching, we wrote a short design doc and benchmarked both options.",
+    "Next I want to get better at capacity planning and at explaining trade-offs to non-engineers.",
+]
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--mode", choices=["off", "record", "replay"], default="replay")
+    parser.add_argument("--cassette", default="cassettes/interview_flow.db")
+    parser.add_argument("--latency", choices=["recorded", "zero"], default="recorded")
+    parser.add_argument("--interviews", type=int, default=1)
+    parser.add_argument("--chats", type=int, default=len(ANSWERS))
+    parser.add_argument("--stream", action="store_true", help="use /chat/stream for the turns")
+    parser.add_argument("--json", help="write the results to this file")
+    return parser.parse_args()
+
+
+def run_interview(client, headers: dict, args, timings: dict):
+    def timed(step, fn):
+        start = time.perf_counter()
+        response = fn()
+        timings[step].append(time.perf_counter() - start)
+        if response.status_code >= 400:
+            raise RuntimeError(f"{step} failed: {response.status_code} {response.text}")
+        return response
+
+    interview_id = timed(
+        "setup",
+        lambda: client.post(
+            "/api/interview/setup",
+            json={"duration_minutes": 10, "interview_type": "technical", "skills": "python, fastapi, sql"},
+            headers=headers,
+        ),
+    ).json()["interview_id"]
+    timed(
+        "start",
+        lambda: client.post(
+            f"/api/interview/start/{interview_id}",
+            files={"file": ("resume.pdf", b"%PDF-1.4 benchmark resume", "application/pdf")},
+            headers=headers,
+        ),
+    )
+
+    for i in range(args.chats):
+        form = {
+            "interview_id": interview_id,
+            "user_answer": ANSWERS[i % len(ANSWERS)],
+            "elapsed_seconds": 60 * (i + 1),
+        }
+        if args.stream:
+            # The test client buffers the body, so this is the full streamed turn
+            start = time.perf_counter()
+            with client.stream(
+                "POST", "/api/interview/chat/stream", data=form, headers=headers
+            ) as response:
+                for _ in response.iter_lines():
+                    pass
+            timings["chat"].append(time.perf_counter() - start)
+        else:
+            timed(
+                "chat", lambda: client.post("/api/interview/chat", data=form, headers=headers)
+            )
+
+    start = time.perf_counter()
+    timed("end", lambda: client.post(f"/api/interview/end/{interview_id}", headers=headers))
+    # The report is generated by a background job — poll until it is ready
+    while True:
+        response = client.get(f"/api/report/{interview_id}", headers=headers)
+        if response.status_code != 202:
+            break
+        time.sleep(0.05)
+    if response.status_code != 200:
+        raise RuntimeError(f"report failed: {response.status_code} {response.text}")
+    timings["report_ready"].append(time.perf_counter() - start)
+
+
+def main():
+    args = parse_args()
+    # The cassette and database are configured before the app is imported
+    os.environ["CASSETTE_MODE"] = args.mode
+    os.environ["CASSETTE_PATH"] = os.path.abspath(args.cassette)
+    os.environ["CASSETTE_LATENCY"] = args.latency
+    os.environ.setdefault("PROCTOR_WORKERS", "0")
+    os.environ.setdefault("TTS_CACHE_WARM", "0")
+
+    import numpy as np
+    from fastapi.testclient import TestClient
+    from core.config import settings
+
+    workdir = tempfile.mkdtemp(prefix="interview_flow_")
+    settings.DB_PATH = os.path.join(workdir, "flow.db")
+    settings.CHROMA_PATH = os.path.join(workdir, "chroma")
+
+    import main as app_main
+    from core.cassette import cassette
+
+    timings = defaultdict(list)
+    total_start = time.perf_counter()
+    with TestClient(app_main.app) as client:
+        account = {"name": "Bench", "email": "bench@example.com", "password": "benchmark"}
+        client.post("/api/auth/register", json=account)
+        token = client.post(
+            "/api/auth/login-json", json={"email": account["email"], "password": account["password"]}
+        ).json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+        for _ in range(args.interviews):
+            run_interview(client, headers, args, timings)
+    total = time.perf_counter() - total_start
+
+    steps = {}
+    for step, values in timings.items():
+        ms = np.array(values) * 1000
+        steps[step] = {
+            "n": len(values),
+            "p50_ms": round(float(np.percentile(ms, 50)), 1),
+            "p95_ms": round(float(np.percentile(ms, 95)), 1),
+            "mean_ms": round(float(ms.mean()), 1),
+        }
+    results = {
+        "mode": args.mode,
+        "latency": args.latency,
+        "interviews": args.interviews,
+        "chats": args.chats,
+        "stream": args.stream,
+        "total_s": round(total, 2),
+        "steps": steps,
+        "cassette": cassette.stats(),
+    }
+
+    print(f"\n📊 Interview flow — {args.interviews} interview(s) × {args.chats} turns ({args.mode})")
+    for step, r in steps.items():
+        print(
+            f"  {step:<17} n {r['n']:>4}  p50 {r['p50_ms']:>8} ms  p95 {r['p95_ms']:>8} ms  "
+            f"mean {r['mean_ms']:>8} ms"
+        )
+    c = results["cassette"]
+    print(f"  total {results['total_s']} s — cassette hits {c['hits']}, misses {c['misses']}, recorded {c['recorded']}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,285 @@
+"""
+Proctoring replay benchmark — replays recorded frames through the proctor.
+
+Targets:
+  agent  ProctorAgent.analyze_frame in this process (detector cost only)
+  ws     the full /ws/proctor/{id} websocket path of main.app, in-process,
+         for an interview created in a throwaway database
+
+Reports frames/sec, p50/p95/p99 latency, CPU per frame and how often each
+alert fires. Runs offline on CPU. Run from backend/:
+
+    python benchmarks/proctor_replay.py --frames recordings/session1/
+    python benchmarks/proctor_replay.py --video session.mp4 --target ws --json out.json
+    python benchmarks/proctor_replay.py --video session.mp4 --baseline out.json
+"""
+
+import argparse
+import base64
+import json
+import os
+import sys
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+os.chdir(BACKEND_DIR)  # model files are resolved relative to the cwd
+
+import cv2
+import numpy as np
+
+from agents.proctor import FRAME_HEADER, FORMAT_JPEG, FORMAT_RGB
+
+IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".bmp"}
+
+
+# ─── Frames ──────────────────────────────────────────────────────────────────
+
+
+def load_frames(args) -> list:
+    width, height = (int(v) for v in args.size.split("x"))
+    frames = []
+    if args.frames:
+        paths = sorted(
+            p for p in Path(args.frames).iterdir() if p.suffix.lower() in IMAGE_EXTENSIONS
+        )
+        for path in paths:
+            frame = cv2.imread(str(path))
+            if frame is not None:
+                frames.append(frame)
+    else:
+        cap = cv2.VideoCapture(args.video)
+        while True:
+            ok, frame = cap.read()
+            if not ok:
+                break
+            frames.append(frame)
+        cap.release()
+    if args.limit:
+        frames = frames[: args.limit]
+    return [cv2.resize(f, (width, height)) for f in frames]
+
+
+def encode_frames(frames: list, fmt: str) -> list:
+    """Encode frames the way a client would send them over the socket."""
+    payloads = []
+    for frame in frames:
+        if fmt == "rgb":
+            h, w = frame.shape[:2]
+            rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+            payloads.append(FRAME_HEADER.pack(FORMAT_RGB, 0, w, h) + rgb.tobytes())
+            continue
+        jpg = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, 80])[1].tobytes()
+        if fmt == "base64":
+            payloads.append("data:image/jpeg;base64," + base64.b64encode(jpg).decode())
+        else:
+            payloads.append(FRAME_HEADER.pack(FORMAT_JPEG, 0, 0, 0) + jpg)
+    return payloads
+
+
+# ─── CPU accounting ──────────────────────────────────────────────────────────
+
+
+def _proc_cpu_seconds(pid: int) -> float:
+    """utime + stime of another process (Linux /proc), 0 if unavailable."""
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            fields = f.read().rsplit(")", 1)[1].split()
+        return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+    except (OSError, IndexError, ValueError):
+        return 0.0
+
+
+# ─── Targets ─────────────────────────────────────────────────────────────────
+
+
+def apply_overrides(args):
+    """CLI overrides go through the environment, before settings are imported."""
+    for key, value in (
+        ("PROCTOR_MOTION_THRESHOLD", args.motion_threshold),
+        ("PROCTOR_TRACK_FULL_EVERY", args.track_full_every),
+        ("PROCTOR_RUNNING_MODE", args.running_mode),
+        ("PROCTOR_CASCADE", args.cascade),
+    ):
+        if value is not None:
+            os.environ[key] = str(value)
+
+
+def run_agent(payloads: list, args) -> tuple:
+    apply_overrides(args)
+    from agents.proctor import ProctorAgent
+    from agents.proctor_pool import agent_options
+
+    # Same options as the pool's workers, so both targets run the same pipeline
+    agent = ProctorAgent(**agent_options())
+    for payload in payloads[: args.warmup]:
+        agent.analyze_frame(payload)
+
+    latencies, alerts = [], []
+    cpu_start = time.process_time()
+    wall_start = time.perf_counter()
+    for payload in payloads:
+        started = time.perf_counter()
+        alerts.append(agent.analyze_frame(payload, session_id=1))
+        latencies.append(time.perf_counter() - started)
+        if args.interval_ms:
+            time.sleep(args.interval_ms / 1000)
+    wall = time.perf_counter() - wall_start
+    cpu = time.process_time() - cpu_start
+    agent.release(1)
+    return latencies, alerts, wall, cpu, agent.stats()
+
+
+def create_interview(client) -> int:
+    account = {"name": "Replay", "email": "replay@example.com", "password": "benchmark"}
+    client.post("/api/auth/register", json=account)
+    token = client.post(
+        "/api/auth/login-json", json={"email": account["email"], "password": account["password"]}
+    ).json()["access_token"]
+    response = client.post(
+        "/api/interview/setup",
+        json={"duration_minutes": 10, "interview_type": "technical", "skills": "python"},
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    response.raise_for_status()
+    return response.json()["interview_id"]
+
+
+def run_ws(payloads: list, args) -> tuple:
+    if args.workers is not None:
+        os.environ["PROCTOR_WORKERS"] = str(args.workers)
+    else:
+        # In-process by default so process_time() covers the detector
+        os.environ.setdefault("PROCTOR_WORKERS", "0")
+    os.environ.setdefault("TTS_CACHE_WARM", "0")
+    apply_overrides(args)
+
+    from fastapi.testclient import TestClient
+    from core.config import settings
+
+    # Proctor events are stored per interview — keep them out of the real database
+    workdir = tempfile.mkdtemp(prefix="proctor_replay_")
+    settings.DB_PATH = os.path.join(workdir, "replay.db")
+    settings.CHROMA_PATH = os.path.join(workdir, "chroma")
+
+    from main import app
+    from agents.proctor_pool import proctor_pool
+
+    def send(ws, payload):
+        if isinstance(payload, str):
+            ws.send_text(json.dumps({"image": payload}))
+        else:
+            ws.send_bytes(payload)
+        return ws.receive_json()
+
+    latencies, alerts = [], []
+    with TestClient(app) as client:
+        interview_id = create_interview(client)
+        with client.websocket_connect(f"/ws/proctor/{interview_id}") as ws:
+            for payload in payloads[: args.warmup]:
+                send(ws, payload)
+            worker_pids = [w.pid for w in proctor_pool.workers if not w.in_process and w.pid]
+            children_start = sum(_proc_cpu_seconds(pid) for pid in worker_pids)
+            cpu_start = time.process_time()
+            wall_start = time.perf_counter()
+            # Lock-step: one frame in flight, so the mailbox never drops frames
+            for payload in payloads:
+                started = time.perf_counter()
+                alerts.append(send(ws, payload)["alert"])
+                latencies.append(time.perf_counter() - started)
+                if args.interval_ms:
+                    time.sleep(args.interval_ms / 1000)
+            wall = time.perf_counter() - wall_start
+            cpu = time.process_time() - cpu_start
+            cpu += sum(_proc_cpu_seconds(pid) for pid in worker_pids) - children_start
+        stats = proctor_pool.stats()
+    return latencies, alerts, wall, cpu, stats
+
+
+# ─── Report ──────────────────────────────────────────────────────────────────
+
+
+def summarize(latencies: list, alerts: list, wall: float, cpu: float) -> dict:
+    ms = np.array(latencies) * 1000
+    n = len(latencies)
+    return {
+        "frames": n,
+        "fps": round(n / wall, 2) if wall else 0.0,
+        "p50_ms": round(float(np.percentile(ms, 50)), 2),
+        "p95_ms": round(float(np.percentile(ms, 95)), 2),
+        "p99_ms": round(float(np.percentile(ms, 99)), 2),
+        "cpu_ms_per_frame": round(1000 * cpu / n, 2),
+        "alerts": dict(Counter(alerts).most_common()),
+    }
+
+
+def check_regression(result: dict, baseline: dict, tolerance: float) -> list:
+    failures = []
+    if result["fps"] < baseline["fps"] * (1 - tolerance):
+        failures.append(f"fps {result['fps']} < baseline {baseline['fps']}")
+    for key in ("p95_ms", "cpu_ms_per_frame"):
+        if result[key] > baseline[key] * (1 + tolerance):
+            failures.append(f"{key} {result[key]} > baseline {baseline[key]}")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--frames", help="directory of recorded frames (sorted by name)")
+    source.add_argument("--video", help="recorded video file")
+    parser.add_argument("--target", choices=["agent", "ws"], default="agent")
+    parser.add_argument("--format", choices=["jpeg", "rgb", "base64"], default="jpeg")
+    parser.add_argument("--size", default="640x480", help="frames are resized to WxH")
+    parser.add_argument("--limit", type=int, default=0, help="use at most N frames")
+    parser.add_argument("--repeat", type=int, default=1, help="replay the sequence N times")
+    parser.add_argument("--warmup", type=int, default=5, help="frames sent before timing")
+    parser.add_argument("--interval-ms", type=int, default=0, help="pause between frames")
+    parser.add_argument("--workers", type=int, help="PROCTOR_WORKERS for --target ws")
+    parser.add_argument("--motion-threshold", type=float)
+    parser.add_argument("--track-full-every", type=int)
+    parser.add_argument("--running-mode", choices=["image", "live_stream"])
+    parser.add_argument("--cascade", choices=["0", "1"], help="landmarker second stage")
+    parser.add_argument("--json", help="write the result to this file")
+    parser.add_argument("--baseline", help="compare against a previous --json result")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    args = parser.parse_args()
+
+    frames = load_frames(args)
+    if not frames:
+        sys.exit("No frames found")
+    payloads = encode_frames(frames, args.format) * args.repeat
+
+    run = run_agent if args.target == "agent" else run_ws
+    latencies, alerts, wall, cpu, stats = run(payloads, args)
+    result = summarize(latencies, alerts, wall, cpu)
+    result["target"] = args.target
+    result["format"] = args.format
+    result["stats"] = stats
+
+    print(f"\n📊 Proctor replay — {args.target} / {args.format}")
+    for key in ("frames", "fps", "p50_ms", "p95_ms", "p99_ms", "cpu_ms_per_frame"):
+        print(f"  {key:<18} {result[key]}")
+    print("  alerts:")
+    for alert, count in result["alerts"].items():
+        print(f"    {alert:<16} {count:>6}  ({100 * count / result['frames']:.1f}%)")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(result, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            failures = check_regression(result, json.load(f), args.tolerance)
+        for failure in failures:
+            print(f"❌ Regression: {failure}")
+        if failures:
+            sys.exit(1)
+        print("✅ Within tolerance of baseline")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""
+TTS engine benchmark — synthesis latency per engine for interviewer phrases.
+
+Every phrase is synthesized cold (no cache) into a temp directory. Reports
+p50/p95/mean latency, output size and, where the audio length can be read,
+the real-time factor (synthesis time / audio duration). Engines that are not
+installed are skipped. Run from backend/:
+
+    python benchmarks/tts_engines.py
+    python benchmarks/tts_engines.py --engines espeak,piper --codec wav --repeat 3
+    python benchmarks/tts_engines.py --sample-rate 16000 --json tts.json
+"""
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import wave
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+os.chdir(BACKEND_DIR)
+
+import numpy as np
+
+from agents.interviewer import CLOSE_TEXT, ERROR_FALLBACK, FALLBACK_QUESTIONS
+from agents.tts import ENGINES, SpeechSynthesizer
+
+PHRASES = [
+    *FALLBACK_QUESTIONS,
+    ERROR_FALLBACK,
+    CLOSE_TEXT,
+    "Great, thanks. How would you design a rate limiter for a public API that "
+    "serves both free and paid customers, and what would you store in Redis?",
+]
+
+
+def audio_seconds(path: str) -> float:
+    """Duration of the output, or 0 if it cannot be determined."""
+    try:
+        with wave.open(path) as w:
+            return w.getnframes() / w.getframerate()
+    except (wave.Error, EOFError, OSError):
+        pass
+    if shutil.which("ffprobe"):
+        out = subprocess.run(
+            ["ffprobe", "-v", "error", "-show_entries", "format=duration", "-of", "csv=p=0", path],
+            capture_output=True,
+            text=True,
+        )
+        try:
+            return float(out.stdout.strip())
+        except ValueError:
+            pass
+    return 0.0
+
+
+def bench_engine(name: str, args) -> dict:
+    engine = ENGINES[name](args.voice or "")
+    if not engine.available():
+        return {"engine": name, "skipped": "not available"}
+    synth = SpeechSynthesizer(engine, codec=args.codec or engine.native_ext, sample_rate=args.sample_rate)
+
+    latencies, sizes, seconds, errors = [], [], [], 0
+    with tempfile.TemporaryDirectory() as tmp:
+        for i, phrase in enumerate(PHRASES * args.repeat):
+            path = os.path.join(tmp, f"{i}.{synth.ext}")
+            start = time.perf_counter()
+            try:
+                synth.synthesize(phrase, path)
+            except Exception as e:
+                errors += 1
+                print(f"  {name}: {e}")
+                continue
+            latencies.append(time.perf_counter() - start)
+            sizes.append(os.path.getsize(path))
+            seconds.append(audio_seconds(path))
+
+    if not latencies:
+        return {"engine": name, "skipped": f"all {errors} syntheses failed"}
+    ms = np.array(latencies) * 1000
+    audio_total = sum(seconds)
+    return {
+        "engine": name,
+        "codec": synth.codec,
+        "sample_rate": synth.sample_rate or "native",
+        "phrases": len(latencies),
+        "errors": errors,
+        "p50_ms": round(float(np.percentile(ms, 50)), 1),
+        "p95_ms": round(float(np.percentile(ms, 95)), 1),
+        "mean_ms": round(float(ms.mean()), 1),
+        "kb_per_phrase": round(sum(sizes) / len(sizes) / 1024, 1),
+        "rtf": round(sum(latencies) / audio_total, 3) if audio_total else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--engines", default=",".join(ENGINES), help="comma-separated")
+    parser.add_argument("--voice", help="engine voice (default: engine's own)")
+    parser.add_argument("--codec", choices=["mp3", "wav", "opus"], help="default: engine native")
+    parser.add_argument("--sample-rate", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--json", help="write the results to this file")
+    args = parser.parse_args()
+
+    results = [bench_engine(name.strip(), args) for name in args.engines.split(",")]
+
+    print(f"\n📊 TTS engines — {len(PHRASES) * args.repeat} phrases each")
+    for r in results:
+        if "skipped" in r:
+            print(f"  {r['engine']:<8} skipped ({r['skipped']})")
+            continue
+        print(
+            f"  {r['engine']:<8} p50 {r['p50_ms']:>8} ms  p95 {r['p95_ms']:>8} ms  "
+            f"mean {r['mean_ms']:>8} ms  {r['kb_per_phrase']:>6} KB  rtf {r['rtf']}"
+            f"  ({r['codec']}, {r['sample_rate']}, {r['errors']} errors)"
+        )
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+"""
+Cassette — record/replay of LLM and TTS calls for reproducible benchmarks.
+
+CASSETTE_MODE=record stores every chat completion and every speech synthesis
+in a SQLite file (CASSETTE_PATH), keyed by a hash of the model, messages and
+sampling parameters (or of the voice and text). CASSETTE_MODE=replay serves
+them back without touching Groq or the TTS engine, either with the latency
+measured while recording (streams keep their chunk timing) or, with
+CASSETTE_LATENCY=zero, immediately. A call that was never recorded raises
+CassetteMiss, so the agents fall back just as they would on an API error.
+
+Payloads are zlib-compressed JSON (LLM) or raw audio bytes (TTS).
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from datetime import datetime
+from core.config import settings
+
+MODES = ("off", "record", "replay")
+
+CREATE_CALLS = """
+CREATE TABLE IF NOT EXISTS calls (
+    key TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    latency_s REAL NOT NULL,
+    data BLOB NOT NULL,
+    recorded_at TEXT NOT NULL
+);
+"""
+
+
+class CassetteMiss(LookupError):
+    """Replay mode was asked for a call that is not on the cassette."""
+
+
+def llm_key(model: str, messages: list, max_tokens, temperature) -> str:
+    payload = json.dumps(
+        {"model": model, "messages": messages, "max_tokens": max_tokens, "temperature": temperature},
+        sort_keys=True,
+    )
+    return "llm:" + hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def tts_key(text: str, voice: str) -> str:
+    payload = f"{voice}\n{' '.join(text.split())}"
+    return "tts:" + hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class Cassette:
+    def __init__(self, path: str, mode: str = "off", zero_latency: bool = False):
+        if mode not in MODES:
+            raise ValueError(f"CASSETTE_MODE must be one of {MODES}")
+        self.path = path
+        self.mode = mode
+        self.zero_latency = zero_latency
+        self._conn = None
+        self._lock = threading.Lock()  # TTS records/replays from executor threads
+        self.hits = 0
+        self.misses = 0
+        self.recorded = 0
+
+    @property
+    def recording(self) -> bool:
+        return self.mode == "record"
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == "replay"
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute(CREATE_CALLS)
+            self._conn.commit()
+        return self._conn
+
+    # ─── Storage ─────────────────────────────────────────────────────────────
+
+    def put(self, key: str, kind: str, latency_s: float, data: bytes):
+        with self._lock:
+            self._db().execute(
+                "INSERT OR REPLACE INTO calls (key, kind, latency_s, data, recorded_at) VALUES (?, ?, ?, ?, ?)",
+                (key, kind, latency_s, zlib.compress(data), datetime.utcnow().isoformat()),
+            )
+            self._conn.commit()
+            self.recorded += 1
+
+    def get(self, key: str) -> tuple:
+        """Returns (latency_s, data). Raises CassetteMiss."""
+        with self._lock:
+            row = self._db().execute(
+                "SELECT latency_s, data FROM calls WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                raise CassetteMiss(key)
+            self.hits += 1
+        return row[0], zlib.decompress(row[1])
+
+    def delay(self, seconds: float) -> float:
+        return 0.0 if self.zero_latency else seconds
+
+    # ─── LLM ─────────────────────────────────────────────────────────────────
+
+    def record_llm(self, key: str, latency_s: float, result: dict, chunks: list = None):
+        """result: {"text", "prompt_tokens", ...}; chunks: [(offset_s, delta), ...] of a stream."""
+        payload = dict(result, chunks=chunks or [(latency_s, result["text"])])
+        self.put(key, "llm", latency_s, json.dumps(payload).encode("utf-8"))
+
+    def replay_llm(self, key: str) -> tuple:
+        """Returns (latency_s, payload) for a recorded completion."""
+        latency_s, data = self.get(key)
+        return self.delay(latency_s), json.loads(data)
+
+    # ─── TTS ─────────────────────────────────────────────────────────────────
+
+    def wrap_synthesize(self, synthesize, voice: str):
+        """Wrap a synthesize(text, path) function so it records or replays."""
+        if self.mode == "off":
+            return synthesize
+
+        def recorded(text: str, path: str):
+            key = tts_key(text, voice)
+            if self.replaying:
+                latency_s, audio = self.get(key)
+                time.sleep(self.delay(latency_s))
+                with open(path, "wb") as f:
+                    f.write(audio)
+                return
+            start = time.perf_counter()
+            synthesize(text, path)
+            latency_s = time.perf_counter() - start
+            if os.path.exists(path):
+                with open(path, "rb") as f:
+                    self.put(key, "tts", latency_s, f.read())
+
+        return recorded
+
+    def stats(self) -> dict:
+        counts = {}
+        if self.mode != "off" and os.path.exists(self.path):
+            with self._lock:
+                counts = dict(
+                    self._db().execute("SELECT kind, COUNT(*) FROM calls GROUP BY kind").fetchall()
+                )
+        return {
+            "mode": self.mode,
+            "path": self.path,
+            "zero_latency": self.zero_latency,
+            "entries": counts,
+            "recorded": self.recorded,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+cassette = Cassette(
+    path=settings.CASSETTE_PATH,
+    mode=settings.CASSETTE_MODE,
+    zero_latency=settings.CASSETTE_LATENCY == "zero",
+)
@@ -21,10 +21,146 @@ class Settings:
     DB_PATH: str = str(backend_dir / "interview_sim.db")
     CHROMA_PATH: str = str(backend_dir / "chroma_db")
 
+    # OpenAI/Groq-compatible endpoint to use instead of api.groq.com, e.g. the
+    # local stand-in (benchmarks/groq_standin.py); no gsk_ key is needed then
+    LLM_BASE_URL: str = os.getenv("LLM_BASE_URL", "")
+
+    # Record/replay of LLM and TTS calls (off | record | replay); replay uses the
+    # recorded latency, or none with CASSETTE_LATENCY=zero
+    CASSETTE_MODE: str = os.getenv("CASSETTE_MODE", "off")
+    CASSETTE_PATH: str = os.getenv("CASSETTE_PATH", str(backend_dir / "cassettes" / "default.db"))
+    CASSETTE_LATENCY: str = os.getenv("CASSETTE_LATENCY", "recorded")
+
+    # Shared async LLM client — HTTP connection pool and timeouts
+    LLM_MAX_CONNECTIONS: int = int(os.getenv("LLM_MAX_CONNECTIONS", "100"))
+    LLM_MAX_KEEPALIVE: int = int(os.getenv("LLM_MAX_KEEPALIVE", "20"))
+    LLM_KEEPALIVE_EXPIRY_S: float = float(os.getenv("LLM_KEEPALIVE_EXPIRY_S", "30"))
+    LLM_TIMEOUT_S: float = float(os.getenv("LLM_TIMEOUT_S", "60"))
+    LLM_CONNECT_TIMEOUT_S: float = float(os.getenv("LLM_CONNECT_TIMEOUT_S", "5"))
+    LLM_MAX_RETRIES: int = int(os.getenv("LLM_MAX_RETRIES", "2"))
+    # LLM scheduler: per-model requests/min and tokens/min ("model=rpm/tpm,..."),
+    # set to your Groq account's limits. Batch calls (reports, summaries) leave
+    # INTERACTIVE_RESERVE of both buckets to live interview turns.
+    LLM_RATE_LIMITS: dict = {
+        model: tuple(float(v) for v in limits.split("/"))
+        for model, limits in (
+            item.split("=")
+            for item in os.getenv(
+                "LLM_RATE_LIMITS", "llama-3.3-70b-versatile=30/12000,llama-3.1-8b-instant=30/6000"
+            ).split(",")
+            if item
+        )
+    }
+    LLM_DEFAULT_RPM: float = float(os.getenv("LLM_DEFAULT_RPM", "30"))
+    LLM_DEFAULT_TPM: float = float(os.getenv("LLM_DEFAULT_TPM", "6000"))
+    LLM_INTERACTIVE_RESERVE: float = float(os.getenv("LLM_INTERACTIVE_RESERVE", "0.3"))
+    LLM_QUEUE_TIMEOUT_INTERACTIVE_S: float = float(os.getenv("LLM_QUEUE_TIMEOUT_INTERACTIVE_S", "15"))
+    LLM_QUEUE_TIMEOUT_BATCH_S: float = float(os.getenv("LLM_QUEUE_TIMEOUT_BATCH_S", "300"))
+    # Conversation history: the last KEEP_TURNS exchanges are sent verbatim and
+    # older ones are folded into a rolling summary, SUMMARIZE_EVERY turns at a
+    # time. History is trimmed to a per-model token budget ("model=tokens,...").
+    HISTORY_KEEP_TURNS: int = int(os.getenv("HISTORY_KEEP_TURNS", "4"))
+    HISTORY_SUMMARIZE_EVERY: int = int(os.getenv("HISTORY_SUMMARIZE_EVERY", "2"))
+    HISTORY_SUMMARY_MODEL: str = os.getenv("HISTORY_SUMMARY_MODEL", "llama-3.1-8b-instant")
+    HISTORY_TOKEN_BUDGETS: dict = {
+        model: int(tokens)
+        for model, tokens in (
+            item.split("=")
+            for item in os.getenv("HISTORY_TOKEN_BUDGETS", "llama-3.3-70b-versatile=3000").split(",")
+            if item
+        )
+    }
+    HISTORY_DEFAULT_TOKEN_BUDGET: int = int(os.getenv("HISTORY_DEFAULT_TOKEN_BUDGET", "3000"))
+    # Log each turn's prompt size (it is always returned as prompt_tokens)
+    LOG_PROMPT_TOKENS: bool = os.getenv("LOG_PROMPT_TOKENS", "0") == "1"
+    # In-memory chat state per interview (write-through to SQLite)
+    SESSION_TTL_S: float = float(os.getenv("SESSION_TTL_S", "1800"))
+    SESSION_MAX_ENTRIES: int = int(os.getenv("SESSION_MAX_ENTRIES", "1000"))
+
+    # Per-answer scoring: each answer is graded in the background during the
+    # interview; at the end the report waits up to ANSWER_SCORE_WAIT_S for
+    # stragglers, then only aggregates and writes a short summary
+    ANSWER_SCORING: bool = os.getenv("ANSWER_SCORING", "1") == "1"
+    ANSWER_SCORE_MODEL: str = os.getenv("ANSWER_SCORE_MODEL", "llama-3.1-8b-instant")
+    ANSWER_SCORE_WAIT_S: float = float(os.getenv("ANSWER_SCORE_WAIT_S", "20"))
+
+    # Report job queue — background workers, attempts per job, first retry delay
+    # (doubled on every further attempt)
+    REPORT_WORKERS: int = int(os.getenv("REPORT_WORKERS", "2"))
+    REPORT_MAX_ATTEMPTS: int = int(os.getenv("REPORT_MAX_ATTEMPTS", "3"))
+    REPORT_RETRY_BASE_S: float = float(os.getenv("REPORT_RETRY_BASE_S", "10"))
+
+    # Proctoring — number of face-detection worker processes (0 = in-process thread)
+    PROCTOR_WORKERS: int = int(
+        os.getenv("PROCTOR_WORKERS", str(min(4, os.cpu_count() or 1)))
+    )
+    # Suggested client capture interval, adapted per socket to detection latency
+    PROCTOR_START_INTERVAL_MS: int = int(os.getenv("PROCTOR_START_INTERVAL_MS", "1500"))
+    PROCTOR_MIN_INTERVAL_MS: int = int(os.getenv("PROCTOR_MIN_INTERVAL_MS", "500"))
+    PROCTOR_MAX_INTERVAL_MS: int = int(os.getenv("PROCTOR_MAX_INTERVAL_MS", "5000"))
+    PROCTOR_RATE_HEADROOM: float = float(os.getenv("PROCTOR_RATE_HEADROOM", "1.5"))
+    # Motion gate: re-detect only when this fraction of a 32x24 thumbnail changed
+    # (0 disables), or when the cached verdict is older than the max age
+    PROCTOR_MOTION_THRESHOLD: float = float(os.getenv("PROCTOR_MOTION_THRESHOLD", "0.02"))
+    PROCTOR_MAX_VERDICT_AGE_S: float = float(os.getenv("PROCTOR_MAX_VERDICT_AGE_S", "5"))
+    # ROI tracking: full-frame detection every N detector runs (<= 1 disables),
+    # otherwise search a crop padded by this fraction of the last face bbox.
+    # Only the full pass sees NO_FACE / MULTIPLE_PEOPLE, so it also runs at
+    # least every FULL_MAX_S seconds (bounding how late a second person is
+    # reported) and whenever the crop's detection score drops below MIN_SCORE.
+    PROCTOR_TRACK_FULL_EVERY: int = int(os.getenv("PROCTOR_TRACK_FULL_EVERY", "10"))
+    PROCTOR_TRACK_FULL_MAX_S: float = float(os.getenv("PROCTOR_TRACK_FULL_MAX_S", "2"))
+    PROCTOR_TRACK_MIN_SCORE: float = float(os.getenv("PROCTOR_TRACK_MIN_SCORE", "0.8"))
+    PROCTOR_TRACK_MARGIN: float = float(os.getenv("PROCTOR_TRACK_MARGIN", "0.6"))
+    # MediaPipe running mode for server-side detection: "image" or "live_stream"
+    PROCTOR_RUNNING_MODE: str = os.getenv("PROCTOR_RUNNING_MODE", "image")
+    # Gaze cascade: run face_landmarker.task only when the bbox centre is within
+    # BAND_PX of a gaze threshold or detector confidence is below MIN_SCORE
+    PROCTOR_CASCADE: bool = os.getenv("PROCTOR_CASCADE", "1") == "1"
+    PROCTOR_CASCADE_BAND_PX: float = float(os.getenv("PROCTOR_CASCADE_BAND_PX", "40"))
+    PROCTOR_CASCADE_MIN_SCORE: float = float(os.getenv("PROCTOR_CASCADE_MIN_SCORE", "0.75"))
+    # Proctor event store: batch flush interval/size, and the gap that splits
+    # repeated events of one type into separate intervals
+    PROCTOR_EVENTS_FLUSH_S: float = float(os.getenv("PROCTOR_EVENTS_FLUSH_S", "2"))
+    PROCTOR_EVENTS_MAX_BUFFER: int = int(os.getenv("PROCTOR_EVENTS_MAX_BUFFER", "500"))
+    PROCTOR_EVENTS_GAP_S: float = float(os.getenv("PROCTOR_EVENTS_GAP_S", "10"))
+    # Text-to-speech: engine "gtts" (network), "espeak" or "piper" (local CLIs);
+    # voice is engine specific (gtts lang, espeak voice, piper .onnx model).
+    # Output is transcoded with ffmpeg when codec/sample rate (0 = native) differ.
+    TTS_ENGINE: str = os.getenv("TTS_ENGINE", "gtts")
+    TTS_VOICE: str = os.getenv("TTS_VOICE", "")
+    TTS_PIPER_MODEL: str = os.getenv("TTS_PIPER_MODEL", "")
+    # TTS_CODEC: "mp3", "wav" or "opus" (Ogg/Opus at TTS_OPUS_BITRATE, far smaller for speech)
+    TTS_CODEC: str = os.getenv("TTS_CODEC", "mp3")
+    TTS_OPUS_BITRATE: str = os.getenv("TTS_OPUS_BITRATE", "24k")
+    TTS_SAMPLE_RATE: int = int(os.getenv("TTS_SAMPLE_RATE", "0"))
+    # Sentence-pipelined TTS for streamed replies: voice each sentence as soon
+    # as it is generated (segments shorter than MIN_CHARS are merged forward)
+    TTS_PIPELINE: bool = os.getenv("TTS_PIPELINE", "0") == "1"
+    TTS_PIPELINE_MIN_CHARS: int = int(os.getenv("TTS_PIPELINE_MIN_CHARS", "24"))
+    # Synthesize fixed phrases (closing line, fallback questions) at startup
+    TTS_CACHE_WARM: bool = os.getenv("TTS_CACHE_WARM", "1") == "1"
+    # Lazy audio: replies return an /api/audio URL at once and speech is
+    # synthesized by TTS_WORKERS background threads; the endpoint waits for it
+    TTS_LAZY: bool = os.getenv("TTS_LAZY", "1") == "1"
+    TTS_WORKERS: int = int(os.getenv("TTS_WORKERS", "4"))
+    AUDIO_WAIT_TIMEOUT_S: float = float(os.getenv("AUDIO_WAIT_TIMEOUT_S", "30"))
+    # Audio files are content-addressed, so browsers may cache them forever
+    AUDIO_CACHE_MAX_AGE_S: int = int(os.getenv("AUDIO_CACHE_MAX_AGE_S", "31536000"))
+    # Retention for static/audio + static/reports: files unused for MAX_AGE_DAYS
+    # are deleted, then least-recently-used ones until the total fits MAX_MB
+    # (0 disables either limit). Audio of in-progress interviews is never evicted.
+    STORAGE_MAX_MB: float = float(os.getenv("STORAGE_MAX_MB", "1024"))
+    STORAGE_MAX_AGE_DAYS: float = float(os.getenv("STORAGE_MAX_AGE_DAYS", "30"))
+    STORAGE_SWEEP_INTERVAL_S: float = float(os.getenv("STORAGE_SWEEP_INTERVAL_S", "600"))
+    STORAGE_TOUCH_EVERY_S: float = float(os.getenv("STORAGE_TOUCH_EVERY_S", "60"))
+
 
 settings = Settings()
 
-if settings.GROQ_API_KEY and settings.GROQ_API_KEY.startswith("gsk_"):
+if settings.LLM_BASE_URL:
+    print(f"🧪 LLM calls go to {settings.LLM_BASE_URL}")
+elif settings.GROQ_API_KEY and settings.GROQ_API_KEY.startswith("gsk_"):
     print("✅ Groq API Key loaded")
 else:
     print(f"❌ Groq API Key NOT FOUND at: {env_path}")
@@ -61,6 +61,99 @@ CREATE TABLE IF NOT EXISTS interview_reports (
 """
 
 
+CREATE_PROCTOR_EVENTS = """
+CREATE TABLE IF NOT EXISTS proctor_events (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    interview_id INTEGER NOT NULL,
+    event_type TEXT NOT NULL,
+    started_at TIMESTAMP NOT NULL,
+    ended_at TIMESTAMP NOT NULL,
+    count INTEGER DEFAULT 1,
+    FOREIGN KEY(interview_id) REFERENCES interviews(id)
+);
+"""
+
+CREATE_PROCTOR_EVENTS_INDEX = """
+CREATE INDEX IF NOT EXISTS idx_proctor_events_interview
+ON proctor_events(interview_id, started_at);
+"""
+
+CREATE_INTERVIEW_ASSETS = """
+CREATE TABLE IF NOT EXISTS interview_assets (
+    interview_id INTEGER NOT NULL,
+    path TEXT NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY(interview_id, path),
+    FOREIGN KEY(interview_id) REFERENCES interviews(id)
+);
+"""
+
+CREATE_INTERVIEW_ASSETS_INDEX = """
+CREATE INDEX IF NOT EXISTS idx_interview_assets_path ON interview_assets(path);
+"""
+
+CREATE_INTERVIEW_SUMMARIES = """
+CREATE TABLE IF NOT EXISTS interview_summaries (
+    interview_id INTEGER PRIMARY KEY,
+    summary TEXT NOT NULL DEFAULT '',
+    covered_message_id INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY(interview_id) REFERENCES interviews(id)
+);
+"""
+
+CREATE_ANSWER_SCORES = """
+CREATE TABLE IF NOT EXISTS answer_scores (
+    message_id INTEGER PRIMARY KEY,
+    interview_id INTEGER NOT NULL,
+    technical_score REAL NOT NULL,
+    communication_score REAL NOT NULL,
+    hr_score REAL NOT NULL,
+    strength TEXT DEFAULT '',
+    improvement TEXT DEFAULT '',
+    note TEXT DEFAULT '',
+    scored_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY(interview_id) REFERENCES interviews(id),
+    FOREIGN KEY(message_id) REFERENCES interview_messages(id)
+);
+"""
+
+CREATE_ANSWER_SCORES_INDEX = """
+CREATE INDEX IF NOT EXISTS idx_answer_scores_interview ON answer_scores(interview_id);
+"""
+
+CREATE_REPORT_JOBS = """
+CREATE TABLE IF NOT EXISTS report_jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    interview_id INTEGER NOT NULL UNIQUE,
+    status TEXT NOT NULL DEFAULT 'queued',
+    stage TEXT NOT NULL DEFAULT 'queued',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    error TEXT DEFAULT '',
+    next_attempt_at REAL NOT NULL DEFAULT 0,
+    report_id INTEGER,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY(interview_id) REFERENCES interviews(id)
+);
+"""
+
+CREATE_REPORT_JOBS_INDEX = """
+CREATE INDEX IF NOT EXISTS idx_report_jobs_status ON report_jobs(status, next_attempt_at);
+"""
+
+CREATE_TTS_REQUESTS = """
+CREATE TABLE IF NOT EXISTS tts_requests (
+    name TEXT PRIMARY KEY,
+    text TEXT NOT NULL,
+    voice TEXT NOT NULL,
+    failures INTEGER NOT NULL DEFAULT 0,
+    retry_at REAL NOT NULL DEFAULT 0,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+"""
+
+
 def init_db():
     conn = sqlite3.connect(settings.DB_PATH, check_same_thread=False)
     conn.row_factory = sqlite3.Row
@@ -69,17 +162,33 @@ def init_db():
     c.execute(CREATE_INTERVIEWS)
     c.execute(CREATE_MESSAGES)
     c.execute(CREATE_REPORTS)
+    c.execute(CREATE_PROCTOR_EVENTS)
+    c.execute(CREATE_PROCTOR_EVENTS_INDEX)
+    c.execute(CREATE_INTERVIEW_ASSETS)
+    c.execute(CREATE_INTERVIEW_ASSETS_INDEX)
+    c.execute(CREATE_INTERVIEW_SUMMARIES)
+    c.execute(CREATE_ANSWER_SCORES)
+    c.execute(CREATE_ANSWER_SCORES_INDEX)
+    c.execute(CREATE_REPORT_JOBS)
+    c.execute(CREATE_REPORT_JOBS_INDEX)
+    c.execute(CREATE_TTS_REQUESTS)
     conn.commit()
     conn.close()
     print(f"✅ Database initialized at {settings.DB_PATH}")
 
 
-def get_db():
-    """Each request gets its own SQLite connection — thread safe."""
+def connect() -> sqlite3.Connection:
+    """Open a configured connection (for background workers outside a request)."""
     conn = sqlite3.connect(settings.DB_PATH, check_same_thread=False)
     conn.row_factory = sqlite3.Row
     conn.execute("PRAGMA journal_mode=WAL")  # WAL allows concurrent reads+writes
     conn.execute("PRAGMA foreign_keys=ON")
+    return conn
+
+
+def get_db():
+    """Each request gets its own SQLite connection — thread safe."""
+    conn = connect()
     try:
         yield conn
     finally:
@@ -0,0 +1,210 @@
+"""
+Shared async LLM client — one pooled AsyncGroq client used by every agent.
+
+Keep-alive connections are reused across requests, so concurrent chats share a
+bounded HTTP connection pool instead of each agent blocking on its own client.
+Every call is admitted by the LLM scheduler first (per-model rate limits,
+interactive turns ahead of batch work). With CASSETTE_MODE set, completions
+are recorded to or replayed from the cassette (core/cassette.py).
+"""
+
+import asyncio
+import time
+import httpx
+from core.config import settings
+from core.cassette import cassette, llm_key
+from core.llm_scheduler import llm_scheduler, BATCH
+
+# Completion size assumed for admission when a call sets no max_tokens
+DEFAULT_COMPLETION_TOKENS = 512
+
+
+def estimate_tokens(messages: list) -> int:
+    """Rough prompt size (~4 characters per token plus per-message overhead)."""
+    return sum(len(m["content"]) // 4 + 4 for m in messages)
+
+
+def _usage(usage) -> dict:
+    if usage is None:
+        return {}
+    return {
+        "prompt_tokens": usage.prompt_tokens,
+        "completion_tokens": usage.completion_tokens,
+    }
+
+
+class LLMClient:
+    def __init__(self):
+        self.api_key = settings.GROQ_API_KEY.strip()
+        self.base_url = settings.LLM_BASE_URL.strip() or None
+        self.enabled = bool(
+            self.base_url or self.api_key.startswith("gsk_") or cassette.replaying
+        )
+        self._client = None
+
+    @property
+    def client(self):
+        """The AsyncGroq client, created on first use."""
+        if self._client is None:
+            from groq import AsyncGroq
+
+            http_client = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=settings.LLM_MAX_CONNECTIONS,
+                    max_keepalive_connections=settings.LLM_MAX_KEEPALIVE,
+                    keepalive_expiry=settings.LLM_KEEPALIVE_EXPIRY_S,
+                ),
+                timeout=httpx.Timeout(
+                    settings.LLM_TIMEOUT_S, connect=settings.LLM_CONNECT_TIMEOUT_S
+                ),
+            )
+            self._client = AsyncGroq(
+                api_key=self.api_key or "standin",
+                base_url=self.base_url,
+                max_retries=settings.LLM_MAX_RETRIES,
+                http_client=http_client,
+            )
+        return self._client
+
+    @staticmethod
+    def _params(model, messages, max_tokens, temperature) -> dict:
+        params = {"model": model, "messages": messages}
+        if max_tokens is not None:
+            params["max_tokens"] = max_tokens
+        if temperature is not None:
+            params["temperature"] = temperature
+        return params
+
+    @staticmethod
+    async def _admit(model: str, messages: list, max_tokens: int, priority: str) -> int:
+        """Wait for the scheduler; returns the token estimate that was charged."""
+        estimate = estimate_tokens(messages) + (max_tokens or DEFAULT_COMPLETION_TOKENS)
+        await llm_scheduler.acquire(model, estimate, priority)
+        return estimate
+
+    @staticmethod
+    def _failed(model: str, estimate: int, error: Exception):
+        """Refund the tokens of a failed call; on a 429 pause the model."""
+        llm_scheduler.settle(model, estimate, 0)
+        if getattr(error, "status_code", None) == 429:
+            headers = getattr(getattr(error, "response", None), "headers", None) or {}
+            try:
+                retry_after = float(headers.get("retry-after", ""))
+            except ValueError:
+                retry_after = 5.0
+            llm_scheduler.backoff(model, retry_after)
+
+    async def complete(
+        self,
+        model: str,
+        messages: list,
+        max_tokens: int = None,
+        temperature: float = None,
+        priority: str = BATCH,
+    ) -> dict:
+        """Run one chat completion. Returns {"text", "prompt_tokens", "completion_tokens"}."""
+        params = self._params(model, messages, max_tokens, temperature)
+        key = llm_key(model, messages, max_tokens, temperature)
+        if cassette.replaying:
+            latency_s, payload = cassette.replay_llm(key)
+            await asyncio.sleep(latency_s)
+            return {k: v for k, v in payload.items() if k != "chunks"}
+
+        estimate = await self._admit(model, messages, max_tokens, priority)
+        start = time.perf_counter()
+        try:
+            completion = await self.client.chat.completions.create(**params)
+        except Exception as e:
+            self._failed(model, estimate, e)
+            raise
+        result = {"text": completion.choices[0].message.content}
+        result.update(_usage(completion.usage))
+        if "prompt_tokens" in result:
+            llm_scheduler.settle(
+                model, estimate, result["prompt_tokens"] + result["completion_tokens"]
+            )
+        if cassette.recording:
+            cassette.record_llm(key, time.perf_counter() - start, result)
+        return result
+
+    async def chat(
+        self,
+        model: str,
+        messages: list,
+        max_tokens: int = None,
+        temperature: float = None,
+        priority: str = BATCH,
+    ) -> str:
+        """Run one chat completion and return the message text."""
+        return (await self.complete(model, messages, max_tokens, temperature, priority))["text"]
+
+    async def stream_chat(
+        self,
+        model: str,
+        messages: list,
+        max_tokens: int = None,
+        temperature: float = None,
+        usage: dict = None,
+        priority: str = BATCH,
+    ):
+        """
+        Run one chat completion, yielding content deltas as they arrive. If a
+        usage dict is given it receives the token counts from the final chunk.
+        """
+        params = self._params(model, messages, max_tokens, temperature)
+        key = llm_key(model, messages, max_tokens, temperature)
+        if cassette.replaying:
+            async for delta in self._replay_stream(key, usage):
+                yield delta
+            return
+
+        estimate = await self._admit(model, messages, max_tokens, priority)
+        counted = {}
+        chunks = []  # (offset_s, delta) for the cassette
+        start = time.perf_counter()
+        try:
+            stream = await self.client.chat.completions.create(**params, stream=True)
+            async for chunk in stream:
+                # Groq reports usage on the last chunk under x_groq
+                chunk_usage = getattr(chunk, "usage", None) or getattr(
+                    getattr(chunk, "x_groq", None), "usage", None
+                )
+                if chunk_usage is not None:
+                    counted = _usage(chunk_usage)
+                    if usage is not None:
+                        usage.update(counted)
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if delta:
+                    chunks.append((time.perf_counter() - start, delta))
+                    yield delta
+        except Exception as e:
+            if not counted:
+                self._failed(model, estimate, e)
+            raise
+        if counted:
+            llm_scheduler.settle(
+                model, estimate, counted["prompt_tokens"] + counted["completion_tokens"]
+            )
+        if cassette.recording:
+            result = dict(counted, text="".join(delta for _, delta in chunks))
+            cassette.record_llm(key, time.perf_counter() - start, result, chunks)
+
+    @staticmethod
+    async def _replay_stream(key: str, usage: dict = None):
+        """Yield a recorded completion's chunks, at their recorded offsets unless zero-latency."""
+        latency_s, payload = cassette.replay_llm(key)
+        start = time.perf_counter()
+        for offset, delta in payload["chunks"]:
+            if latency_s:
+                await asyncio.sleep(max(offset - (time.perf_counter() - start), 0.0))
+            yield delta
+        if usage is not None:
+            usage.update({k: v for k, v in payload.items() if k not in ("text", "chunks")})
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.close()
+            self._client = None
+
+
+llm_client = LLMClient()
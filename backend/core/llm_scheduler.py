@@ -0,0 +1,251 @@
+"""
+LLMScheduler — admission control for Groq calls, per model.
+
+Each model has two token buckets refilled continuously: requests/min and
+tokens/min. A call is admitted once both buckets can cover it (its token cost
+is estimated up front and corrected from the reported usage afterwards).
+
+Calls are queued in two priority classes. Interactive calls (live interview
+turns) are always considered first and may drain the buckets completely;
+batch calls (scoring, learning paths, resume analysis, summaries) are only
+admitted while more than LLM_INTERACTIVE_RESERVE of both buckets is left, so
+a burst of report generation cannot starve candidates mid-interview. Queued
+calls give up after a per-class timeout (LLMQueueTimeout), and a 429 from the
+API pauses admission for that model until its Retry-After has passed.
+"""
+
+import asyncio
+import time
+from collections import deque
+from core.config import settings
+
+INTERACTIVE = "interactive"
+BATCH = "batch"
+PRIORITIES = (INTERACTIVE, BATCH)
+
+# Waits kept per class for percentile metrics
+WAIT_SAMPLES = 1000
+
+
+class LLMQueueTimeout(Exception):
+    """A call waited longer than its class's queue timeout for admission."""
+
+
+class TokenBucket:
+    def __init__(self, per_minute: float):
+        self.capacity = per_minute
+        self.rate = per_minute / 60.0
+        self.level = per_minute
+        self.updated = time.monotonic()
+
+    def refill(self, now: float):
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def required(self, amount: float, keep: float = 0.0) -> float:
+        """
+        Level needed to take amount while leaving `keep` (a fraction of capacity).
+        Capped at a full bucket, so a request that could never leave the reserve
+        (or is bigger than the bucket) is let through once the bucket is full.
+        """
+        return min(amount + keep * self.capacity, self.capacity)
+
+    def has(self, amount: float, keep: float = 0.0) -> bool:
+        return self.level >= self.required(amount, keep)
+
+    def seconds_until(self, amount: float, keep: float = 0.0) -> float:
+        needed = self.required(amount, keep) - self.level
+        return max(needed / self.rate, 0.0) if self.rate else float("inf")
+
+
+class _Limits:
+    def __init__(self, rpm: float, tpm: float):
+        self.requests = TokenBucket(rpm)
+        self.tokens = TokenBucket(tpm)
+        self.paused_until = 0.0
+
+    def refill(self, now: float):
+        self.requests.refill(now)
+        self.tokens.refill(now)
+
+    def can_admit(self, tokens: int, keep: float) -> bool:
+        return self.requests.has(1, keep) and self.tokens.has(tokens, keep)
+
+    def seconds_until(self, now: float, tokens: int, keep: float) -> float:
+        return max(
+            self.paused_until - now,
+            self.requests.seconds_until(1, keep),
+            self.tokens.seconds_until(tokens, keep),
+        )
+
+    def take(self, tokens: int):
+        self.requests.level -= 1
+        self.tokens.level -= tokens
+
+
+class _Waiter:
+    __slots__ = ("model", "tokens", "priority", "future", "enqueued")
+
+    def __init__(self, model: str, tokens: int, priority: str, future):
+        self.model = model
+        self.tokens = tokens
+        self.priority = priority
+        self.future = future
+        self.enqueued = time.monotonic()
+
+
+class _ClassStats:
+    def __init__(self):
+        self.admitted = 0
+        self.timed_out = 0
+        self.waits = deque(maxlen=WAIT_SAMPLES)
+
+    def snapshot(self, queued: int) -> dict:
+        waits = sorted(self.waits)
+
+        def pct(p):
+            return round(1000 * waits[min(int(p * len(waits)), len(waits) - 1)], 1) if waits else 0.0
+
+        return {
+            "queued": queued,
+            "admitted": self.admitted,
+            "timed_out": self.timed_out,
+            "wait_p50_ms": pct(0.50),
+            "wait_p95_ms": pct(0.95),
+            "wait_max_ms": round(1000 * waits[-1], 1) if waits else 0.0,
+        }
+
+
+class LLMScheduler:
+    def __init__(
+        self,
+        limits: dict,
+        default_rpm: float,
+        default_tpm: float,
+        interactive_reserve: float,
+        queue_timeouts: dict,
+    ):
+        self.limits = limits  # model -> (rpm, tpm)
+        self.default_rpm = default_rpm
+        self.default_tpm = default_tpm
+        self.interactive_reserve = interactive_reserve
+        self.queue_timeouts = queue_timeouts
+        self._models = {}  # model -> _Limits
+        self._queues = {p: deque() for p in PRIORITIES}
+        self._stats = {p: _ClassStats() for p in PRIORITIES}
+        self._timer = None
+
+    def _limits_for(self, model: str) -> _Limits:
+        if model not in self._models:
+            rpm, tpm = self.limits.get(model, (self.default_rpm, self.default_tpm))
+            self._models[model] = _Limits(rpm, tpm)
+        return self._models[model]
+
+    # ─── Admission ───────────────────────────────────────────────────────────
+
+    async def acquire(self, model: str, tokens: int, priority: str = BATCH):
+        """Wait until the call may be sent. Raises LLMQueueTimeout."""
+        if priority not in self._queues:
+            raise ValueError(f"priority must be one of {PRIORITIES}")
+        future = asyncio.get_running_loop().create_future()
+        waiter = _Waiter(model, tokens, priority, future)
+        self._queues[priority].append(waiter)
+        self._dispatch()
+        try:
+            await asyncio.wait_for(asyncio.shield(future), self.queue_timeouts[priority])
+        except asyncio.TimeoutError:
+            if not future.done():
+                future.cancel()
+                self._queues[priority].remove(waiter)
+                self._stats[priority].timed_out += 1
+                raise LLMQueueTimeout(
+                    f"{priority} call to {model} waited over {self.queue_timeouts[priority]}s"
+                )
+        except asyncio.CancelledError:
+            if not future.done():
+                future.cancel()
+                self._queues[priority].remove(waiter)
+            else:
+                # Admitted just as the caller went away — hand the slot back
+                self.settle(model, tokens, 0, requests=1)
+            raise
+
+    def settle(self, model: str, estimated: int, actual: int, requests: int = 0):
+        """Correct the token bucket once the real usage is known."""
+        limits = self._limits_for(model)
+        limits.tokens.level = min(limits.tokens.capacity, limits.tokens.level + estimated - actual)
+        limits.requests.level = min(limits.requests.capacity, limits.requests.level + requests)
+        self._dispatch()
+
+    def backoff(self, model: str, seconds: float):
+        """The API answered 429: hold every call to this model for a while."""
+        limits = self._limits_for(model)
+        limits.paused_until = max(limits.paused_until, time.monotonic() + seconds)
+        print(f"⏳ LLM rate limited on {model} — pausing {seconds:.1f}s")
+
+    def _dispatch(self):
+        now = time.monotonic()
+        for limits in self._models.values():
+            limits.refill(now)
+
+        next_wake = None
+        blocked = set()  # models whose head-of-line waiter could not be admitted
+        for priority in PRIORITIES:
+            keep = 0.0 if priority == INTERACTIVE else self.interactive_reserve
+            queue = self._queues[priority]
+            for waiter in list(queue):
+                if waiter.model in blocked:
+                    continue
+                limits = self._limits_for(waiter.model)
+                limits.refill(now)
+                if now >= limits.paused_until and limits.can_admit(waiter.tokens, keep):
+                    limits.take(waiter.tokens)
+                    queue.remove(waiter)
+                    stats = self._stats[priority]
+                    stats.admitted += 1
+                    stats.waits.append(now - waiter.enqueued)
+                    waiter.future.set_result(None)
+                    continue
+                # Keep FIFO per model, and batch never jumps queued interactive calls
+                blocked.add(waiter.model)
+                delay = limits.seconds_until(now, waiter.tokens, keep)
+                next_wake = delay if next_wake is None else min(next_wake, delay)
+
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if next_wake is not None:
+            self._timer = asyncio.get_running_loop().call_later(
+                max(next_wake, 0.01), self._dispatch
+            )
+
+    # ─── Metrics ─────────────────────────────────────────────────────────────
+
+    def stats(self) -> dict:
+        now = time.monotonic()
+        models = {}
+        for model, limits in self._models.items():
+            limits.refill(now)
+            models[model] = {
+                "requests_available": round(limits.requests.level, 1),
+                "requests_per_minute": limits.requests.capacity,
+                "tokens_available": round(limits.tokens.level),
+                "tokens_per_minute": limits.tokens.capacity,
+                "paused_s": round(max(limits.paused_until - now, 0.0), 1),
+            }
+        return {
+            "classes": {p: self._stats[p].snapshot(len(self._queues[p])) for p in PRIORITIES},
+            "models": models,
+        }
+
+
+llm_scheduler = LLMScheduler(
+    limits=settings.LLM_RATE_LIMITS,
+    default_rpm=settings.LLM_DEFAULT_RPM,
+    default_tpm=settings.LLM_DEFAULT_TPM,
+    interactive_reserve=settings.LLM_INTERACTIVE_RESERVE,
+    queue_timeouts={
+        INTERACTIVE: settings.LLM_QUEUE_TIMEOUT_INTERACTIVE_S,
+        BATCH: settings.LLM_QUEUE_TIMEOUT_BATCH_S,
+    },
+)
@@ -0,0 +1,240 @@
+"""
+ProctorEventStore — buffered, run-length-encoded proctoring events per interview.
+
+Consecutive identical events for an interview are folded into one interval
+(started_at, ended_at, count). Runs are buffered in memory and written to the
+indexed proctor_events table in batches by a background flusher. Runs for
+an interview that no longer exists are dropped; other failed writes are
+retried up to FLUSH_RETRIES times.
+"""
+
+import sqlite3
+import threading
+from datetime import datetime
+from core.config import settings
+from core.database import connect
+
+# Flushes a run may fail (e.g. "database is locked") before it is dropped
+FLUSH_RETRIES = 5
+
+
+class _Run:
+    __slots__ = (
+        "row_id",
+        "interview_id",
+        "event_type",
+        "started_at",
+        "ended_at",
+        "count",
+        "dirty",
+        "failures",
+    )
+
+    def __init__(self, interview_id: int, event_type: str, at: datetime):
+        self.row_id = None
+        self.interview_id = interview_id
+        self.event_type = event_type
+        self.started_at = at
+        self.ended_at = at
+        self.count = 1
+        self.dirty = False
+        self.failures = 0
+
+
+class ProctorEventStore:
+    def __init__(self, flush_interval: float, max_buffer: int, gap_seconds: float):
+        self.flush_interval = flush_interval
+        self.max_buffer = max_buffer
+        # Same-type events further apart than this start a new interval
+        self.gap_seconds = gap_seconds
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._open = {}  # interview_id -> current _Run
+        self._dirty = []  # runs changed since the last flush
+        self._stop = threading.Event()
+        self._wake = threading.Event()  # buffer full: flush now
+        self._thread = None
+        self.dropped = 0
+
+    # ─── Write path ──────────────────────────────────────────────────────────
+
+    def record(self, interview_id: int, event_type: str, at: datetime = None):
+        at = at or datetime.utcnow()
+        with self._lock:
+            run = self._open.get(interview_id)
+            if (
+                run is not None
+                and run.event_type == event_type
+                and (at - run.ended_at).total_seconds() <= self.gap_seconds
+            ):
+                run.ended_at = at
+                run.count += 1
+            else:
+                run = _Run(interview_id, event_type, at)
+                self._open[interview_id] = run
+            if not run.dirty:
+                run.dirty = True
+                self._dirty.append(run)
+            pending = len(self._dirty)
+        if pending >= self.max_buffer:
+            # Never write from the caller (the proctor socket's event loop)
+            self._wake.set()
+
+    def close(self, interview_id: int):
+        """End the current interval, e.g. when the proctor socket disconnects."""
+        with self._lock:
+            self._open.pop(interview_id, None)
+
+    def flush(self):
+        with self._flush_lock:
+            with self._lock:
+                batch, self._dirty = self._dirty, []
+                rows = []
+                for run in batch:
+                    run.dirty = False
+                    rows.append(
+                        (
+                            run,
+                            run.row_id,
+                            run.event_type,
+                            run.started_at.isoformat(),
+                            run.ended_at.isoformat(),
+                            run.count,
+                        )
+                    )
+            if not rows:
+                return
+
+            conn = connect()
+            try:
+                new_ids = []
+                orphans = []  # runs whose interview is gone — never retried
+                updates = []
+                for run, row_id, event_type, started_at, ended_at, count in rows:
+                    if row_id is not None:
+                        updates.append((ended_at, count, row_id))
+                        continue
+                    try:
+                        cursor = conn.execute(
+                            """INSERT INTO proctor_events (interview_id, event_type, started_at, ended_at, count)
+                               SELECT ?, ?, ?, ?, ? WHERE EXISTS (SELECT 1 FROM interviews WHERE id = ?)""",
+                            (run.interview_id, event_type, started_at, ended_at, count, run.interview_id),
+                        )
+                    except sqlite3.IntegrityError:
+                        orphans.append(run)
+                        continue
+                    if cursor.rowcount:
+                        new_ids.append((run, cursor.lastrowid))
+                    else:
+                        orphans.append(run)
+                if updates:
+                    conn.executemany(
+                        "UPDATE proctor_events SET ended_at = ?, count = ? WHERE id = ?",
+                        updates,
+                    )
+                conn.commit()
+            except Exception as e:
+                print(f"Proctor event flush error: {e}")
+                # Put the batch back so the next flush retries it, a few times
+                with self._lock:
+                    for run, *_ in rows:
+                        run.failures += 1
+                        if run.failures > FLUSH_RETRIES:
+                            self._forget(run)
+                        elif not run.dirty:
+                            run.dirty = True
+                            self._dirty.append(run)
+                return
+            finally:
+                conn.close()
+
+            with self._lock:
+                for run, row_id in new_ids:
+                    run.row_id = row_id
+                    run.failures = 0
+                for run in orphans:
+                    self._forget(run)
+
+    def _forget(self, run: _Run):
+        """Drop a run that cannot be stored (caller holds _lock)."""
+        self.dropped += 1
+        if self._open.get(run.interview_id) is run:
+            del self._open[run.interview_id]
+
+    # ─── Read path ───────────────────────────────────────────────────────────
+
+    def timeline(self, interview_id: int) -> list:
+        """Ordered intervals for an interview, including still-buffered events."""
+        self.flush()
+        conn = connect()
+        try:
+            rows = conn.execute(
+                """SELECT event_type, started_at, ended_at, count,
+                   ROUND((julianday(ended_at) - julianday(started_at)) * 86400, 1) AS duration_seconds
+                   FROM proctor_events WHERE interview_id = ? ORDER BY started_at, id""",
+                (interview_id,),
+            ).fetchall()
+        finally:
+            conn.close()
+        return [dict(r) for r in rows]
+
+    def summary(self, interview_id: int) -> dict:
+        """Per event type: number of intervals, raw event count and total seconds."""
+        self.flush()
+        conn = connect()
+        try:
+            rows = conn.execute(
+                """SELECT event_type, COUNT(*) AS occurrences, SUM(count) AS events,
+                   SUM((julianday(ended_at) - julianday(started_at)) * 86400) AS total_seconds
+                   FROM proctor_events WHERE interview_id = ? GROUP BY event_type""",
+                (interview_id,),
+            ).fetchall()
+        finally:
+            conn.close()
+        return {
+            r["event_type"]: {
+                "occurrences": r["occurrences"],
+                "events": r["events"],
+                "total_seconds": round(r["total_seconds"] or 0, 1),
+            }
+            for r in rows
+        }
+
+    def delete(self, db, interview_id: int):
+        """Drop an interview's events (buffered and stored) using the caller's db."""
+        with self._flush_lock:
+            with self._lock:
+                self._open.pop(interview_id, None)
+                self._dirty = [r for r in self._dirty if r.interview_id != interview_id]
+            db.execute("DELETE FROM proctor_events WHERE interview_id = ?", (interview_id,))
+
+    # ─── Background flusher ──────────────────────────────────────────────────
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+        self.flush()
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            if not self._stop.is_set():
+                self.flush()
+
+
+proctor_events = ProctorEventStore(
+    flush_interval=settings.PROCTOR_EVENTS_FLUSH_S,
+    max_buffer=settings.PROCTOR_EVENTS_MAX_BUFFER,
+    gap_seconds=settings.PROCTOR_EVENTS_GAP_S,
+)
@@ -0,0 +1,222 @@
+"""
+StorageManager — retention for generated files in static/audio and static/reports.
+
+A background sweep deletes files that have not been used for STORAGE_MAX_AGE_DAYS
+and then evicts least-recently-used files until the directories fit within
+STORAGE_MAX_MB. "Used" is the file's atime, which the /static mount refreshes
+on every successful download (TrackedStaticFiles).
+
+Files listed in interview_assets for an interview that is still in progress
+are pinned and never evicted. Report PDFs are rebuilt from the stored report
+on download, so evicting them is safe.
+"""
+
+import os
+import threading
+import time
+from fastapi.staticfiles import StaticFiles
+from core.config import settings
+from core.database import connect
+
+MANAGED_DIRS = [os.path.join("static", "audio"), os.path.join("static", "reports")]
+
+# Interviews whose assets must stay on disk
+PINNED_STATUSES = ("setup", "active")
+
+# Leftover temp files from interrupted writes are removed after this long
+STALE_TMP_SECONDS = 3600
+
+
+def _rel(path: str) -> str:
+    """Normalize to the 'static/…' form stored in the DB."""
+    return os.path.normpath(path).replace(os.sep, "/")
+
+
+class StorageManager:
+    def __init__(self, max_bytes: int, max_age_seconds: float, interval: float, touch_every: float):
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_seconds
+        self.interval = interval
+        # Downloads refresh atime at most this often per file
+        self.touch_every = touch_every
+        self._stop = threading.Event()
+        self._thread = None
+        self._sweep_lock = threading.Lock()
+        self.last_sweep = {}
+
+    # ─── Tracking ────────────────────────────────────────────────────────────
+
+    def track(self, db, interview_id: int, *paths: str):
+        """Record files an interview uses, so they are pinned while it runs."""
+        db.executemany(
+            "INSERT OR IGNORE INTO interview_assets (interview_id, path) VALUES (?, ?)",
+            [(interview_id, _rel(p)) for p in paths if p],
+        )
+
+    def touch(self, path: str):
+        """Mark a file as used now (LRU clock)."""
+        try:
+            st = os.stat(path)
+            now = time.time()
+            if now - st.st_atime >= self.touch_every:
+                os.utime(path, (now, st.st_mtime))
+        except OSError:
+            pass
+
+    # ─── Cleanup ─────────────────────────────────────────────────────────────
+
+    def delete_interview(self, db, interview_id: int) -> int:
+        """
+        Remove an interview's files (except ones other interviews still use)
+        and its asset rows, using the caller's db. Returns files deleted.
+        """
+        rows = db.execute(
+            """SELECT path FROM interview_assets a WHERE interview_id = ?
+               AND NOT EXISTS (SELECT 1 FROM interview_assets b
+                               WHERE b.path = a.path AND b.interview_id != a.interview_id)""",
+            (interview_id,),
+        ).fetchall()
+        paths = [r["path"] for r in rows]
+        report = db.execute(
+            "SELECT pdf_path FROM interview_reports WHERE interview_id = ?", (interview_id,)
+        ).fetchone()
+        if report and report["pdf_path"]:
+            paths.append(report["pdf_path"])
+        db.execute("DELETE FROM interview_assets WHERE interview_id = ?", (interview_id,))
+
+        deleted = 0
+        for path in paths:
+            try:
+                os.remove(path)
+                deleted += 1
+            except OSError:
+                pass
+        return deleted
+
+    def _pinned(self) -> set:
+        conn = connect()
+        try:
+            rows = conn.execute(
+                f"""SELECT DISTINCT a.path FROM interview_assets a
+                   JOIN interviews i ON i.id = a.interview_id
+                   WHERE i.status IN ({",".join("?" * len(PINNED_STATUSES))})""",
+                PINNED_STATUSES,
+            ).fetchall()
+        finally:
+            conn.close()
+        return {r["path"] for r in rows}
+
+    def sweep(self) -> dict:
+        """One retention pass: age limit first, then LRU down to the size limit."""
+        with self._sweep_lock:
+            now = time.time()
+            pinned = self._pinned()
+            files = []  # (last_used, size, path)
+            removed = freed = 0
+            for directory in MANAGED_DIRS:
+                if not os.path.isdir(directory):
+                    continue
+                for entry in os.scandir(directory):
+                    if not entry.is_file():
+                        continue
+                    st = entry.stat()
+                    path = _rel(entry.path)
+                    if entry.name.endswith(".tmp"):
+                        # In-flight writes are left alone unless long abandoned
+                        if now - st.st_mtime > STALE_TMP_SECONDS and self._remove(path):
+                            removed += 1
+                            freed += st.st_size
+                        continue
+                    files.append((max(st.st_atime, st.st_mtime), st.st_size, path))
+
+            total = sum(size for _, size, _ in files)
+            files.sort()
+            for last_used, size, path in files:
+                if path in pinned:
+                    continue
+                expired = self.max_age_seconds and now - last_used > self.max_age_seconds
+                over = self.max_bytes and total > self.max_bytes
+                if not (expired or over):
+                    # Sorted oldest first: nothing later is expired either
+                    break
+                if self._remove(path):
+                    removed += 1
+                    freed += size
+                    total -= size
+
+            self.last_sweep = {
+                "at": now,
+                "files": len(files) - removed,
+                "bytes": total,
+                "removed": removed,
+                "freed_bytes": freed,
+                "pinned": len(pinned),
+            }
+            if removed:
+                print(f"🧹 Storage sweep: removed {removed} file(s), freed {freed / 1e6:.1f} MB")
+            return self.last_sweep
+
+    @staticmethod
+    def _remove(path: str) -> bool:
+        try:
+            os.remove(path)
+            return True
+        except OSError:
+            return False
+
+    def stats(self) -> dict:
+        return {
+            "max_bytes": self.max_bytes,
+            "max_age_seconds": self.max_age_seconds,
+            "last_sweep": self.last_sweep,
+        }
+
+    # ─── Background sweeper ──────────────────────────────────────────────────
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _run(self):
+        while True:
+            try:
+                self.sweep()
+            except Exception as e:
+                print(f"Storage sweep error: {e}")
+            if self._stop.wait(self.interval):
+                return
+
+
+class TrackedStaticFiles(StaticFiles):
+    """
+    StaticFiles that refreshes a file's access time whenever it is served.
+    Audio is named by a hash of its content, so it is marked immutable;
+    ETag/If-None-Match and Range requests are handled by Starlette's FileResponse.
+    """
+
+    async def get_response(self, path: str, scope):
+        response = await super().get_response(path, scope)
+        if response.status_code in (200, 206, 304):
+            storage.touch(os.path.join(self.directory, path))
+            if _rel(path).startswith("audio/"):
+                response.headers["Cache-Control"] = (
+                    f"public, max-age={settings.AUDIO_CACHE_MAX_AGE_S}, immutable"
+                )
+        return response
+
+
+storage = StorageManager(
+    max_bytes=int(settings.STORAGE_MAX_MB * 1024 * 1024),
+    max_age_seconds=settings.STORAGE_MAX_AGE_DAYS * 86400,
+    interval=settings.STORAGE_SWEEP_INTERVAL_S,
+    touch_every=settings.STORAGE_TOUCH_EVERY_S,
+)
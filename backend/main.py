@@ -1,21 +1,30 @@
+import asyncio
 import os
+import threading
+import time
 from pathlib import Path
 from dotenv import load_dotenv
 from fastapi import FastAPI, WebSocket
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
 
 load_dotenv(dotenv_path=Path(__file__).parent / ".env")
 
 from core.config import settings
 from core.database import init_db
+from core.llm import llm_client
+from core.llm_scheduler import llm_scheduler
+from core.cassette import cassette
+from core.proctor_events import proctor_events
+from core.storage import storage, TrackedStaticFiles
 from routers.auth_router import router as auth_router
-from routers.interview_router import (
-    router as interview_router,
-    proctor,
-    warning_counters,
-)
+from agents.proctor_pool import proctor_pool
+from agents.proctor_stream import ProctorStream, InvalidMessage, proctor_streams
+from agents.interviewer import interviewer
+from routers.interview_router import router as interview_router, warning_counters
 from routers.report_router import router as report_router
+from routers.audio_router import router as audio_router
+from agents.tts_cache import tts_cache
+from agents.report_jobs import report_jobs
 
 # ─── App ─────────────────────────────────────────────────────────────────────
 
@@ -39,7 +48,7 @@ os.makedirs("static/audio", exist_ok=True)
 os.makedirs("static/reports", exist_ok=True)
 os.makedirs("uploads", exist_ok=True)
 
-app.mount("/static", StaticFiles(directory="static"), name="static")
+app.mount("/static", TrackedStaticFiles(directory="static"), name="static")
 
 # ─── Startup ─────────────────────────────────────────────────────────────────
 
@@ -47,14 +56,35 @@ app.mount("/static", StaticFiles(directory="static"), name="static")
 @app.on_event("startup")
 def startup():
     init_db()
+    proctor_pool.start()
+    proctor_events.start()
+    storage.start()
+    report_jobs.start()
+    if settings.TTS_CACHE_WARM:
+        # gTTS is a network call per phrase — never hold up startup for it
+        threading.Thread(target=interviewer.warm_audio_cache, daemon=True).start()
+    if cassette.mode != "off":
+        print(f"📼 Cassette {cassette.mode}: {cassette.path}")
     print(f"🚀 {settings.PROJECT_NAME} v{settings.VERSION} started")
 
 
+@app.on_event("shutdown")
+async def shutdown():
+    proctor_pool.shutdown()
+    proctor_events.stop()
+    storage.stop()
+    await report_jobs.stop()
+    tts_cache.shutdown()
+    cassette.close()
+    await llm_client.aclose()
+
+
 # ─── Routers ─────────────────────────────────────────────────────────────────
 
 app.include_router(auth_router)
 app.include_router(interview_router)
 app.include_router(report_router)
+app.include_router(audio_router)
 
 # ─── Root ─────────────────────────────────────────────────────────────────────
 
@@ -74,13 +104,61 @@ def root():
 @app.websocket("/ws/proctor/{interview_id}")
 async def proctoring_socket(websocket: WebSocket, interview_id: int):
     await websocket.accept()
-    while True:
-        try:
-            data = await websocket.receive_json()
-            alert = proctor.analyze_frame(data["image"])
+    stream = ProctorStream(interview_id)
+    proctor_streams.add(stream)
+    reader = asyncio.create_task(stream.receive(websocket))
+    try:
+        while True:
+            # Latest frame wins — anything older was dropped by the mailbox
+            frame = await stream.mailbox.get()
+            if frame is None:
+                break
+            error = None
+            if isinstance(frame, InvalidMessage):
+                # Same verdict as an undecodable binary frame from the pool
+                alert, error = "INVALID", frame.error
+            else:
+                started = time.perf_counter()
+                alert = await proctor_pool.analyze(interview_id, frame)
+                stream.record(time.perf_counter() - started, proctor_pool.load())
+            if alert != "PENDING":
+                proctor_events.record(interview_id, alert)
             count = warning_counters.get(interview_id, 0)
-            await websocket.send_json(
-                {"alert": alert, "warning_count": count, "terminate": count >= 3}
-            )
-        except Exception:
-            break
+            reply = {
+                "alert": alert,
+                "warning_count": count,
+                "terminate": count >= 3,
+                "analysis_interval_ms": stream.interval_ms,
+                "dropped_frames": stream.mailbox.dropped,
+            }
+            if error:
+                reply["error"] = error
+            await websocket.send_json(reply)
+    except Exception:
+        pass
+    finally:
+        reader.cancel()
+        proctor_streams.discard(stream)
+        proctor_pool.release(interview_id)
+        proctor_events.close(interview_id)
+
+
+@app.get("/api/proctor/stats")
+def proctor_stats():
+    """Per-worker throughput/queue depth and per-socket frame counters."""
+    return {
+        **proctor_pool.stats(),
+        "sockets": [stream.stats() for stream in proctor_streams],
+    }
+
+
+@app.get("/api/storage/stats")
+def storage_stats():
+    """Retention limits and the result of the last storage sweep."""
+    return storage.stats()
+
+
+@app.get("/api/llm/stats")
+def llm_stats():
+    """LLM admission queues per priority class and remaining rate-limit budget per model."""
+    return llm_scheduler.stats()
@@ -0,0 +1,65 @@
+"""
+Audio router — serves interviewer speech that may still be being synthesized.
+"""
+
+import asyncio
+import math
+import os
+import re
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import JSONResponse
+
+from core.config import settings
+from core.storage import TrackedStaticFiles
+from agents.tts_cache import tts_cache
+from agents.interviewer import interviewer
+
+router = APIRouter(prefix="/api/audio", tags=["audio"])
+
+# Same mount logic as /static (ETag, Range, immutable caching, LRU touch)
+_static = TrackedStaticFiles(directory="static", check_dir=False)
+
+AUDIO_NAME = re.compile(r"^[0-9a-f]{32}\.(mp3|wav|ogg)$")
+
+
+@router.get("/{name}")
+async def get_audio(name: str, request: Request, wait: bool = True):
+    """
+    Serve an audio file by name. If it is still being synthesized, wait for it
+    (up to AUDIO_WAIT_TIMEOUT_S), or with ?wait=0 answer 202 + Retry-After.
+    A requested file whose synthesis never finished (e.g. the server restarted)
+    is synthesized again from its stored text; after a failed synthesis the
+    answer is 202 until its retry is due.
+    """
+    if not AUDIO_NAME.match(name):
+        raise HTTPException(404, "Audio not found")
+    path = os.path.join("static", "audio", name)
+
+    if not os.path.exists(path):
+        job = tts_cache.pending(name)
+        if job is None:
+            retry_in = await asyncio.to_thread(interviewer.resume_audio, name)
+            if retry_in:
+                return JSONResponse(
+                    {"status": "pending"},
+                    status_code=202,
+                    headers={"Retry-After": str(math.ceil(retry_in))},
+                )
+            job = tts_cache.pending(name)
+        if job is not None:
+            if not wait:
+                return JSONResponse(
+                    {"status": "pending"}, status_code=202, headers={"Retry-After": "1"}
+                )
+            try:
+                await asyncio.wait_for(
+                    asyncio.shield(asyncio.wrap_future(job)), settings.AUDIO_WAIT_TIMEOUT_S
+                )
+            except asyncio.TimeoutError:
+                return JSONResponse(
+                    {"status": "pending"}, status_code=202, headers={"Retry-After": "1"}
+                )
+        if not os.path.exists(path):
+            raise HTTPException(404, "Audio not available")
+
+    return await _static.get_response(f"audio/{name}", request.scope)
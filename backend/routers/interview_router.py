@@ -2,32 +2,38 @@
 Interview router — setup, start, chat, warning, end, history.
 """
 
+import asyncio
 import json
 import sqlite3
 import os
 from datetime import datetime
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, WebSocket
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from typing import Optional
 
-from core.database import get_db
+from core.database import get_db, connect
 from core.auth import get_current_user
 from core.config import settings
-from agents.interviewer import interviewer
+from core.proctor_events import proctor_events
+from core.storage import storage
+from agents.interviewer import interviewer, CLOSE_TEXT
+from agents.history import history_manager
+from agents.sessions import ChatSession, chat_sessions
 from agents.screener import ScreenerAgent
 from agents.rag_store import rag_store
-from agents.scorer import scorer
-from agents.learning_path import learning_path_agent
-from agents.report_generator import report_generator
-from agents.proctor import ProctorAgent
+from agents.scorer import scorer, is_gradable
+from agents.report_jobs import report_jobs, QUEUED
 
 router = APIRouter(prefix="/api/interview", tags=["interview"])
 screener = ScreenerAgent()
-proctor = ProctorAgent()
 
 # In-memory proctor warning counters: {interview_id: count}
 warning_counters = {}
 
+# Keep proxies from buffering the token stream
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
 # ─── Setup ───────────────────────────────────────────────────────────────────
 
 
@@ -98,8 +104,8 @@ async def start_interview(
 
     # First AI message
     greet = "Hello! Please start the interview by telling me a bit about the candidate."
-    ai_text = interviewer.get_response(history, greet)
-    audio_path = interviewer.text_to_audio(ai_text)
+    ai_text = await interviewer.get_response(history, greet)
+    audio_path = await _speak(ai_text)
 
     # Store in DB
     db.execute(
@@ -110,13 +116,15 @@ async def start_interview(
         "INSERT INTO interview_messages (interview_id, role, content) VALUES (?, 'ai', ?)",
         (interview_id, ai_text),
     )
+    storage.track(db, interview_id, audio_path)
     db.commit()
+    chat_sessions.drop(interview_id)
 
     warning_counters[interview_id] = 0
 
     return {
         "question": ai_text,
-        "audio_url": f"{settings.BASE_URL}/{audio_path}",
+        "audio_url": _audio_url(audio_path),
         "round": 1,
         "is_finished": False,
         "interview_id": interview_id,
@@ -126,6 +134,97 @@ async def start_interview(
 # ─── Chat ────────────────────────────────────────────────────────────────────
 
 
+async def _speak(text: str) -> str:
+    """
+    Start speech for text and return its static/audio path. With TTS_LAZY the
+    file is synthesized in the background and served via /api/audio once ready.
+    """
+    if settings.TTS_LAZY:
+        # Records the request in the database before handing it to the TTS pool
+        return await asyncio.to_thread(interviewer.request_audio, text)
+    return await asyncio.to_thread(interviewer.text_to_audio, text)
+
+
+def _audio_url(path: str) -> str:
+    if settings.TTS_LAZY:
+        return f"{settings.BASE_URL}/api/audio/{os.path.basename(path)}"
+    return f"{settings.BASE_URL}/{path}"
+
+
+def _turn_timing(interview: dict, elapsed_seconds: int) -> tuple:
+    """Returns (remaining_seconds, time_warning, is_finished) for this turn."""
+    duration_seconds = interview["duration_minutes"] * 60
+    remaining_seconds = max(0, duration_seconds - elapsed_seconds)
+    return remaining_seconds, 0 < remaining_seconds <= 60, remaining_seconds == 0
+
+
+def _prompt_tokens(interview_id: int, new_round: int, usage: dict) -> int:
+    """Prompt size of this turn (from the API when reported, else estimated)."""
+    tokens = usage.get("prompt_tokens") or usage.get("estimated_prompt_tokens", 0)
+    if settings.LOG_PROMPT_TOKENS:
+        print(f"📝 Interview {interview_id} round {new_round}: {tokens} prompt tokens")
+    return tokens
+
+
+def _save_answer(db: sqlite3.Connection, session: ChatSession, answer: str) -> int:
+    """Store the candidate's answer and queue its grading. Returns the message id."""
+    question = session.last_question()
+    message_id = session.add_message(db, "user", answer)
+    if settings.ANSWER_SCORING and is_gradable(answer):
+        interview = session.interview
+        scorer.schedule_answer(
+            session.interview_id,
+            message_id,
+            question,
+            answer,
+            interview["interview_type"],
+            interview["skills"],
+        )
+    return message_id
+
+
+def _save_ai_turn(
+    db: sqlite3.Connection, session: ChatSession, ai_text: str, audio_paths: list
+) -> int:
+    """Store the interviewer's reply and advance the round. Returns the message id."""
+    message_id = session.add_message(db, "ai", ai_text)
+    session.set_round(db, session.round + 1)
+    storage.track(db, session.interview_id, *audio_paths)
+    db.commit()
+    return message_id
+
+
+async def _close_on_timeout(interview_id: int, interview: dict, db: sqlite3.Connection) -> dict:
+    """Time's up — store the closing message, complete the interview, queue its report."""
+    audio_path = await _speak(CLOSE_TEXT)
+    cursor = db.execute(
+        "INSERT INTO interview_messages (interview_id, role, content) VALUES (?, 'ai', ?)",
+        (interview_id, CLOSE_TEXT),
+    )
+    storage.track(db, interview_id, audio_path)
+    db.execute(
+        "UPDATE interviews SET status='completed', ended_at=? WHERE id=?",
+        (datetime.utcnow().isoformat(), interview_id),
+    )
+    db.commit()
+    chat_sessions.drop(interview_id)
+    job_id = report_jobs.enqueue(db, interview_id)
+    return {
+        "question": CLOSE_TEXT,
+        "message_id": cursor.lastrowid,
+        "audio_url": _audio_url(audio_path),
+        "round": interview["round"] + 1,
+        "is_finished": True,
+        "time_remaining": 0,
+        "report_job_id": job_id,
+        "report_status": QUEUED,
+    }
+
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
 @router.post("/chat")
 async def chat(
     interview_id: int = Form(...),
@@ -134,96 +233,147 @@ async def chat(
     current_user: dict = Depends(get_current_user),
     db: sqlite3.Connection = Depends(get_db),
 ):
-    interview = db.execute(
-        "SELECT * FROM interviews WHERE id = ? AND user_id = ?",
-        (interview_id, current_user["id"]),
-    ).fetchone()
-    if not interview:
+    session = chat_sessions.get(db, interview_id, current_user["id"])
+    if not session:
         raise HTTPException(404, "Interview not found")
-    interview = dict(interview)
+    interview = session.interview
 
-    duration_seconds = interview["duration_minutes"] * 60
-    remaining_seconds = max(0, duration_seconds - elapsed_seconds)
-    time_warning = 0 < remaining_seconds <= 60
-    is_finished = remaining_seconds == 0
+    remaining_seconds, time_warning, is_finished = _turn_timing(interview, elapsed_seconds)
 
-    # Save user message
-    db.execute(
-        "INSERT INTO interview_messages (interview_id, role, content) VALUES (?, 'user', ?)",
-        (interview_id, user_answer),
-    )
+    # History up to this answer — the interviewer appends the answer itself
+    history = None if is_finished else session.history()
 
-    if is_finished:
-        # Time's up — end gracefully
-        close_text = "Time is up! Thank you for your responses today. Your interview session has ended. Your detailed report will be ready shortly."
-        audio_path = interviewer.text_to_audio(close_text)
-        db.execute(
-            "INSERT INTO interview_messages (interview_id, role, content) VALUES (?, 'ai', ?)",
-            (interview_id, close_text),
-        )
-        db.execute(
-            "UPDATE interviews SET status='completed', ended_at=? WHERE id=?",
-            (datetime.utcnow().isoformat(), interview_id),
-        )
-        db.commit()
-        _generate_report(interview_id, current_user, interview, db)
-        return {
-            "question": close_text,
-            "audio_url": f"{settings.BASE_URL}/{audio_path}",
-            "round": interview["round"] + 1,
-            "is_finished": True,
-            "time_remaining": 0,
-        }
+    # Save user message and grade it in the background
+    _save_answer(db, session, user_answer)
+    db.commit()
 
-    # Rebuild history from DB
-    msgs = db.execute(
-        "SELECT role, content FROM interview_messages WHERE interview_id = ? ORDER BY id",
-        (interview_id,),
-    ).fetchall()
-    system_prompt = interviewer.build_system_prompt(
-        interview["interview_type"], interview["skills"], interview["duration_minutes"]
-    )
-    history = [{"role": "system", "content": system_prompt}]
-    for m in msgs:
-        role = "assistant" if m["role"] == "ai" else m["role"]
-        history.append({"role": role, "content": m["content"]})
+    if is_finished:
+        return await _close_on_timeout(interview_id, interview, db)
 
     # RAG context
     resume_context = rag_store.retrieve_context(current_user["id"], user_answer)
 
     # Get AI response
-    ai_text = interviewer.get_response(
+    usage = {}
+    ai_text = await interviewer.get_response(
         history,
         user_answer,
         resume_context=resume_context,
         time_warning=time_warning,
         is_last=time_warning,
+        usage=usage,
     )
-    audio_path = interviewer.text_to_audio(ai_text)
-
-    new_round = interview["round"] + 1
-    db.execute(
-        "INSERT INTO interview_messages (interview_id, role, content) VALUES (?, 'ai', ?)",
-        (interview_id, ai_text),
-    )
-    db.execute("UPDATE interviews SET round=? WHERE id=?", (new_round, interview_id))
-    db.commit()
+    audio_path = await _speak(ai_text)
+    message_id = _save_ai_turn(db, session, ai_text, [audio_path])
+    new_round = session.round
 
     return {
         "question": ai_text,
-        "audio_url": f"{settings.BASE_URL}/{audio_path}",
+        "message_id": message_id,
+        "audio_url": _audio_url(audio_path),
         "round": new_round,
         "is_finished": False,
         "time_remaining": remaining_seconds,
         "time_warning": time_warning,
+        "prompt_tokens": _prompt_tokens(interview_id, new_round, usage),
     }
 
 
+@router.post("/chat/stream")
+async def chat_stream(
+    interview_id: int = Form(...),
+    user_answer: str = Form(...),
+    elapsed_seconds: int = Form(0),
+    current_user: dict = Depends(get_current_user),
+    db: sqlite3.Connection = Depends(get_db),
+):
+    """
+    Same turn as /chat, streamed as Server-Sent Events:
+      event: token  {"text": ...}            — reply text as the model produces it
+      event: audio  {"index", "audio_url"}   — per-sentence audio, in order (TTS_PIPELINE)
+      event: done   {message_id, audio_url, round, is_finished, ...} — once saved
+    """
+    session = chat_sessions.get(db, interview_id, current_user["id"])
+    if not session:
+        raise HTTPException(404, "Interview not found")
+    interview = session.interview
+
+    remaining_seconds, time_warning, is_finished = _turn_timing(interview, elapsed_seconds)
+    history = None if is_finished else session.history()
+
+    # Commit the answer now — its grading and the reply are saved on their own
+    # connections, since the request's db may already be closed while streaming.
+    _save_answer(db, session, user_answer)
+    db.commit()
+
+    if is_finished:
+        result = await _close_on_timeout(interview_id, interview, db)
+
+        async def closing():
+            yield _sse("token", {"text": result["question"]})
+            yield _sse("done", {**result, "audio_segments": [result["audio_url"]]})
+
+        return StreamingResponse(closing(), media_type="text/event-stream", headers=SSE_HEADERS)
+
+    resume_context = rag_store.retrieve_context(current_user["id"], user_answer)
+
+    async def events():
+        parts = []
+        usage = {}
+        speech = interviewer.speech_pipeline() if settings.TTS_PIPELINE else None
+        async for delta in interviewer.stream_response(
+            history,
+            user_answer,
+            resume_context=resume_context,
+            time_warning=time_warning,
+            is_last=time_warning,
+            usage=usage,
+        ):
+            parts.append(delta)
+            yield _sse("token", {"text": delta})
+            if speech:
+                speech.feed(delta)
+                for index, path in speech.ready():
+                    yield _sse("audio", {"index": index, "audio_url": _audio_url(path)})
+
+        ai_text = "".join(parts)
+        if speech:
+            async for index, path in speech.finish():
+                yield _sse("audio", {"index": index, "audio_url": _audio_url(path)})
+            audio_paths = speech.segments
+        else:
+            audio_paths = [await _speak(ai_text)]
+        segments = [_audio_url(p) for p in audio_paths]
+        conn = connect()
+        try:
+            message_id = _save_ai_turn(conn, session, ai_text, audio_paths)
+        finally:
+            conn.close()
+        new_round = session.round
+
+        yield _sse(
+            "done",
+            {
+                "question": ai_text,
+                "message_id": message_id,
+                "audio_url": segments[0] if segments else None,
+                "audio_segments": segments,
+                "round": new_round,
+                "is_finished": False,
+                "time_remaining": remaining_seconds,
+                "time_warning": time_warning,
+                "prompt_tokens": _prompt_tokens(interview_id, new_round, usage),
+            },
+        )
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers=SSE_HEADERS)
+
+
 # ─── Warning ─────────────────────────────────────────────────────────────────
 
 
 @router.post("/warning/{interview_id}")
-def add_warning(
+async def add_warning(
     interview_id: int,
     current_user: dict = Depends(get_current_user),
     db: sqlite3.Connection = Depends(get_db),
@@ -237,6 +387,7 @@ def add_warning(
 
     warning_counters[interview_id] = warning_counters.get(interview_id, 0) + 1
     count = warning_counters[interview_id]
+    proctor_events.record(interview_id, "WARNING")
 
     db.execute(
         "UPDATE interviews SET warning_count = ? WHERE id = ?", (count, interview_id)
@@ -250,11 +401,14 @@ def add_warning(
             (datetime.utcnow().isoformat(), interview_id),
         )
         db.commit()
-        _generate_report(interview_id, current_user, dict(interview), db)
+        chat_sessions.drop(interview_id)
+        job_id = report_jobs.enqueue(db, interview_id)
         return {
             "warning_count": count,
             "terminate": True,
             "message": "Interview terminated due to 3 proctoring violations.",
+            "report_job_id": job_id,
+            "report_status": QUEUED,
         }
 
     return {"warning_count": count, "terminate": False}
@@ -264,27 +418,33 @@ def add_warning(
 
 
 @router.post("/end/{interview_id}")
-def end_interview(
+async def end_interview(
     interview_id: int,
     current_user: dict = Depends(get_current_user),
     db: sqlite3.Connection = Depends(get_db),
 ):
+    """
+    Complete the interview and queue its report. The report is generated in the
+    background, so no report_id is returned: poll GET /api/report/{interview_id}
+    (202 while report_job_id is queued or running), as after a timeout or an
+    auto-termination.
+    """
     interview = db.execute(
         "SELECT * FROM interviews WHERE id = ? AND user_id = ?",
         (interview_id, current_user["id"]),
     ).fetchone()
     if not interview:
         raise HTTPException(404, "Interview not found")
-    interview = dict(interview)
 
     db.execute(
         "UPDATE interviews SET status='completed', ended_at=? WHERE id=?",
         (datetime.utcnow().isoformat(), interview_id),
     )
     db.commit()
+    chat_sessions.drop(interview_id)
 
-    report_id = _generate_report(interview_id, current_user, interview, db)
-    return {"message": "Interview ended", "report_id": report_id}
+    job_id = report_jobs.enqueue(db, interview_id)
+    return {"message": "Interview ended", "report_job_id": job_id, "report_status": QUEUED}
 
 
 # ─── History ─────────────────────────────────────────────────────────────────
@@ -340,8 +500,14 @@ def delete_interview(
     if not interview:
         raise HTTPException(404, "Interview not found")
 
-    # Delete messages, report, and interview record
+    # Delete answer scores, messages, report, proctoring events, files, and interview record
+    scorer.delete(db, interview_id)
     db.execute("DELETE FROM interview_messages WHERE interview_id = ?", (interview_id,))
+    proctor_events.delete(db, interview_id)
+    storage.delete_interview(db, interview_id)
+    history_manager.delete(db, interview_id)
+    report_jobs.delete(db, interview_id)
+    chat_sessions.drop(interview_id)
     db.execute("DELETE FROM interview_reports WHERE interview_id = ?", (interview_id,))
     db.execute("DELETE FROM interviews WHERE id = ?", (interview_id,))
     db.commit()
@@ -351,88 +517,3 @@ def delete_interview(
 # ─── WebSocket Proctor ───────────────────────────────────────────────────────
 
 # Note: WebSocket is registered in main.py for flexibility
-
-# ─── Internal helper ─────────────────────────────────────────────────────────
-
-
-def _generate_report(
-    interview_id: int, current_user: dict, interview: dict, db: sqlite3.Connection
-) -> int:
-    """Score interview, generate learning path and PDF. Returns report DB id."""
-    try:
-        # Get transcript
-        msgs = db.execute(
-            "SELECT role, content FROM interview_messages WHERE interview_id = ? ORDER BY id",
-            (interview_id,),
-        ).fetchall()
-        transcript = [{"role": m["role"], "content": m["content"]} for m in msgs]
-
-        # Score
-        scores = scorer.score_interview(
-            transcript,
-            interview.get("interview_type", "mixed"),
-            interview.get("skills", ""),
-        )
-
-        # Learning path
-        lp = learning_path_agent.generate(
-            scores,
-            interview.get("skills", ""),
-            interview.get("interview_type", "mixed"),
-            scores.get("improvements", []),
-        )
-
-        # PDF
-        pdf_path = report_generator.generate(
-            current_user, interview, scores, transcript, lp
-        )
-
-        # Save to DB
-        existing = db.execute(
-            "SELECT id FROM interview_reports WHERE interview_id = ?", (interview_id,)
-        ).fetchone()
-        if existing:
-            db.execute(
-                """UPDATE interview_reports SET
-                overall_score=?, technical_score=?, communication_score=?, hr_score=?,
-                strengths=?, improvements=?, summary=?, learning_path=?, pdf_path=?
-                WHERE interview_id=?""",
-                (
-                    scores["overall_score"],
-                    scores["technical_score"],
-                    scores["communication_score"],
-                    scores["hr_score"],
-                    json.dumps(scores["strengths"]),
-                    json.dumps(scores["improvements"]),
-                    scores["summary"],
-                    json.dumps(lp),
-                    pdf_path,
-                    interview_id,
-                ),
-            )
-            db.commit()
-            return existing["id"]
-        else:
-            cursor = db.execute(
-                """INSERT INTO interview_reports
-                (interview_id, overall_score, technical_score, communication_score, hr_score,
-                 strengths, improvements, summary, learning_path, pdf_path)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-                (
-                    interview_id,
-                    scores["overall_score"],
-                    scores["technical_score"],
-                    scores["communication_score"],
-                    scores["hr_score"],
-                    json.dumps(scores["strengths"]),
-                    json.dumps(scores["improvements"]),
-                    scores["summary"],
-                    json.dumps(lp),
-                    pdf_path,
-                ),
-            )
-            db.commit()
-            return cursor.lastrowid
-    except Exception as e:
-        print(f"Report generation error: {e}")
-        return -1
@@ -1,11 +1,16 @@
 import json
+import os
 import sqlite3
+from pathlib import Path
 from fastapi import APIRouter, Depends, HTTPException
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, JSONResponse
 
 from core.database import get_db
 from core.auth import get_current_user
 from core.config import settings
+from core.proctor_events import proctor_events
+from agents.report_generator import report_generator
+from agents.report_jobs import report_jobs, QUEUED, RUNNING, FAILED
 
 router = APIRouter(prefix="/api/report", tags=["report"])
 
@@ -25,6 +30,15 @@ def get_report(
         raise HTTPException(404, "Interview not found")
     interview = dict(interview)
 
+    # Still being generated: 202 with the job's progress; failed for good: 500
+    job = report_jobs.get(db, interview_id)
+    if job and job["status"] in (QUEUED, RUNNING):
+        return JSONResponse(
+            report_jobs.describe(job), status_code=202, headers={"Retry-After": "2"}
+        )
+    if job and job["status"] == FAILED:
+        return JSONResponse(report_jobs.describe(job), status_code=500)
+
     report = db.execute(
         "SELECT * FROM interview_reports WHERE interview_id = ?", (interview_id,)
     ).fetchone()
@@ -50,6 +64,7 @@ def get_report(
         "interview": interview,
         "report": report,
         "transcript": [dict(m) for m in msgs],
+        "proctoring": proctor_events.summary(interview_id),
         "user": {
             "name": current_user["name"],
             "email": current_user["email"],
@@ -58,6 +73,26 @@ def get_report(
     }
 
 
+@router.get("/{interview_id}/proctoring")
+def get_proctoring_timeline(
+    interview_id: int,
+    current_user: dict = Depends(get_current_user),
+    db: sqlite3.Connection = Depends(get_db),
+):
+    interview = db.execute(
+        "SELECT id FROM interviews WHERE id = ? AND user_id = ?",
+        (interview_id, current_user["id"]),
+    ).fetchone()
+    if not interview:
+        raise HTTPException(404, "Interview not found")
+
+    return {
+        "interview_id": interview_id,
+        "summary": proctor_events.summary(interview_id),
+        "timeline": proctor_events.timeline(interview_id),
+    }
+
+
 @router.get("/{interview_id}/download")
 def download_pdf(
     interview_id: int,
@@ -72,7 +107,7 @@ def download_pdf(
         raise HTTPException(404, "Interview not found")
 
     report = db.execute(
-        "SELECT pdf_path FROM interview_reports WHERE interview_id = ?", (interview_id,)
+        "SELECT * FROM interview_reports WHERE interview_id = ?", (interview_id,)
     ).fetchone()
     if not report or not report["pdf_path"]:
         raise HTTPException(404, "PDF report not available yet")
@@ -80,11 +115,24 @@ def download_pdf(
     pdf_path = report["pdf_path"]
     if not pdf_path.startswith("/"):
         # relative path from backend dir
-        import os
-        from pathlib import Path
+        pdf_path = str(Path(__file__).parent.parent / pdf_path)
 
-        backend_dir = Path(__file__).parent.parent
-        pdf_path = str(backend_dir / pdf_path)
+    if not os.path.exists(pdf_path):
+        # Evicted by storage retention — rebuild it from the stored report
+        report = dict(report)
+        for field in ["strengths", "improvements", "learning_path"]:
+            try:
+                report[field] = json.loads(report[field] or "[]")
+            except Exception:
+                report[field] = []
+        msgs = db.execute(
+            "SELECT role, content FROM interview_messages WHERE interview_id = ? ORDER BY id",
+            (interview_id,),
+        ).fetchall()
+        transcript = [{"role": m["role"], "content": m["content"]} for m in msgs]
+        report_generator.generate(
+            current_user, dict(interview), report, transcript, report["learning_path"]
+        )
 
     return FileResponse(
         pdf_path,
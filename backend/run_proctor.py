@@ -1,74 +1,162 @@
 import cv2
 import mediapipe as mp
-import time, os, subprocess, threading
+import numpy as np
+import time, subprocess, threading
 
-# Global flag for thread safety
-alert_msg = ""
+WIDTH, HEIGHT = 640, 480
+DETECT_WIDTH, DETECT_HEIGHT = 320, 240
+DETECT_EVERY = 20  # analyze one frame in 20 to save CPU
 
-def detection_worker(face_model):
-    global alert_msg
+
+class FrameRing:
+    """Fixed-size ring of preallocated frames filled by a single capture thread.
+
+    Readers pin the newest slot while they use it and the writer never fills a
+    pinned slot (or the newest one), so readers work on the buffer in place.
+    """
+
+    def __init__(self, slots=4, shape=(HEIGHT, WIDTH, 3)):
+        self.frames = np.zeros((slots,) + shape, np.uint8)
+        self.pins = [0] * slots
+        self.latest = -1
+        self.seq = 0
+        self.cond = threading.Condition()
+
+    def writable_slot(self):
+        with self.cond:
+            for step in range(1, len(self.frames)):
+                slot = (self.latest + step) % len(self.frames)
+                if not self.pins[slot]:
+                    return slot
+        return None
+
+    def publish(self, slot):
+        with self.cond:
+            self.latest = slot
+            self.seq += 1
+            self.cond.notify_all()
+
+    def acquire(self, after_seq=0, timeout=0.1):
+        """Pin the newest frame once seq > after_seq. Returns (slot, seq)."""
+        with self.cond:
+            if not self.cond.wait_for(lambda: self.seq > after_seq, timeout):
+                return None, after_seq
+            self.pins[self.latest] += 1
+            return self.latest, self.seq
+
+    def release(self, slot):
+        with self.cond:
+            self.pins[slot] -= 1
+
+
+class AlertState:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._msg = ""
+
+    def set(self, msg):
+        with self._lock:
+            self._msg = msg
+
+    def get(self):
+        with self._lock:
+            return self._msg
+
+
+def capture_worker(cap, ring, stop):
+    while not stop.is_set():
+        slot = ring.writable_slot()
+        if slot is None:
+            time.sleep(0.001)
+            continue
+        target = ring.frames[slot]
+        # Decode straight into the slot; only fall back to a resize if the
+        # camera ignored the requested resolution.
+        success, frame = cap.read(target)
+        if not success: continue
+        if frame.ctypes.data != target.ctypes.data:
+            cv2.resize(frame, (WIDTH, HEIGHT), dst=target)
+        ring.publish(slot)
+
+
+def detection_worker(face_model, ring, alert, stop):
     options = mp.tasks.vision.FaceDetectorOptions(
         base_options=mp.tasks.BaseOptions(model_asset_path=face_model),
         running_mode=mp.tasks.vision.RunningMode.VIDEO
     )
     detector = mp.tasks.vision.FaceDetector.create_from_options(options)
-    
-    # Internal camera for the thread
-    cap_thread = cv2.VideoCapture(0, cv2.CAP_V4L2)
-    cap_thread.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*'MJPG'))
-    cap_thread.set(cv2.CAP_PROP_FRAME_WIDTH, 320)
-    cap_thread.set(cv2.CAP_PROP_FRAME_HEIGHT, 240)
-    
-    ts = 0
-    while True:
-        success, frame = cap_thread.read()
-        if not success: continue
-        ts += 1
-        
-        # Only analyze every 20 frames to save CPU
-        if ts % 20 == 0:
-            rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            mp_img = mp.Image(image_format=mp.ImageFormat.SRGB, data=rgb)
-            try:
-                res = detector.detect_for_video(mp_img, ts)
-                if not res.detections: alert_msg = "NO FACE"
-                elif len(res.detections) > 1: alert_msg = "MULTIPLE PEOPLE"
-                else:
-                    bbox = res.detections[0].bounding_box
-                    cx = bbox.origin_x + bbox.width/2
-                    if cx < 80: alert_msg = "LOOKING LEFT"
-                    elif cx > 240: alert_msg = "LOOKING RIGHT"
-                    else: alert_msg = ""
-            except: pass
-        time.sleep(0.01)
+
+    small = np.empty((DETECT_HEIGHT, DETECT_WIDTH, 3), np.uint8)
+    rgb = np.empty_like(small)
+    seq = 0
+    while not stop.is_set():
+        slot, seq = ring.acquire(seq + DETECT_EVERY - 1)
+        if slot is None: continue
+        try:
+            cv2.resize(ring.frames[slot], (DETECT_WIDTH, DETECT_HEIGHT), dst=small, interpolation=cv2.INTER_AREA)
+        finally:
+            ring.release(slot)
+        cv2.cvtColor(small, cv2.COLOR_BGR2RGB, dst=rgb)
+        mp_img = mp.Image(image_format=mp.ImageFormat.SRGB, data=rgb)
+        try:
+            res = detector.detect_for_video(mp_img, int(time.monotonic() * 1000))
+            if not res.detections: alert.set("NO FACE")
+            elif len(res.detections) > 1: alert.set("MULTIPLE PEOPLE")
+            else:
+                bbox = res.detections[0].bounding_box
+                cx = bbox.origin_x + bbox.width/2
+                if cx < 80: alert.set("LOOKING LEFT")
+                elif cx > 240: alert.set("LOOKING RIGHT")
+                else: alert.set("")
+        except: pass
 
 def run():
-    global alert_msg
     face_model = 'face_detector_full_range.tflite'
-    
-    # Start AI worker in background
-    threading.Thread(target=detection_worker, args=(face_model,), daemon=True).start()
-    
-    # Main Window Thread
+
+    # Single camera handle shared through the ring buffer
     cap = cv2.VideoCapture(0, cv2.CAP_V4L2)
     cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*'MJPG'))
-    cap.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
-    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
-    
-    while cap.isOpened():
-        success, frame = cap.read()
-        if not success: continue
+    cap.set(cv2.CAP_PROP_FRAME_WIDTH, WIDTH)
+    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, HEIGHT)
+
+    ring = FrameRing()
+    alert = AlertState()
+    stop = threading.Event()
+
+    # Start capture and AI workers in background
+    threads = [
+        threading.Thread(target=capture_worker, args=(cap, ring, stop), daemon=True),
+        threading.Thread(target=detection_worker, args=(face_model, ring, alert, stop), daemon=True),
+    ]
+    for t in threads: t.start()
 
-        if alert_msg:
-            # High-visibility red bar
-            cv2.rectangle(frame, (0,0), (640,60), (0,0,255), -1)
-            cv2.putText(frame, alert_msg, (50, 45), cv2.FONT_HERSHEY_DUPLEX, 1, (255,255,255), 2)
-            # Background beep
-            subprocess.Popen("ffplay -f lavfi -i 'sine=frequency=1000:duration=0.1' -nodisp -autoexit -loglevel quiet > /dev/null 2>&1 || true", shell=True)
+    # Main Window Thread
+    display = np.empty((HEIGHT, WIDTH, 3), np.uint8)
+    seq = 0
+    while cap.isOpened():
+        slot, seq = ring.acquire(seq)
+        if slot is not None:
+            alert_msg = alert.get()
+            if alert_msg:
+                # Draw on a private copy — the slot may be shared with the detector
+                np.copyto(display, ring.frames[slot])
+                ring.release(slot)
+                # High-visibility red bar
+                cv2.rectangle(display, (0,0), (640,60), (0,0,255), -1)
+                cv2.putText(display, alert_msg, (50, 45), cv2.FONT_HERSHEY_DUPLEX, 1, (255,255,255), 2)
+                # Background beep
+                subprocess.Popen("ffplay -f lavfi -i 'sine=frequency=1000:duration=0.1' -nodisp -autoexit -loglevel quiet > /dev/null 2>&1 || true", shell=True)
+                cv2.imshow('PROCTORING_SHIELD', display)
+            else:
+                try:
+                    cv2.imshow('PROCTORING_SHIELD', ring.frames[slot])
+                finally:
+                    ring.release(slot)
 
-        cv2.imshow('PROCTORING_SHIELD', frame)
         if cv2.waitKey(1) & 0xFF == ord('q'): break
-    
+
+    stop.set()
+    for t in threads: t.join(timeout=1)
     cap.release()
     cv2.destroyAllWindows()
 
@@ -0,0 +1,46 @@
+"""
+Shared fixtures — each test runs against its own throwaway SQLite database.
+"""
+
+import pytest
+from core.config import settings
+from core.database import connect, init_db
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    """Connection to a fresh, initialized database (settings.DB_PATH points at it)."""
+    monkeypatch.setattr(settings, "DB_PATH", str(tmp_path / "test.db"))
+    init_db()
+    conn = connect()
+    yield conn
+    conn.close()
+
+
+@pytest.fixture
+def interview_id(db) -> int:
+    """An interview (and its user) that rows can reference."""
+    user_id = db.execute(
+        "INSERT INTO users (name, email, password_hash) VALUES ('Test', 'test@example.com', 'x')"
+    ).lastrowid
+    interview_id = db.execute(
+        "INSERT INTO interviews (user_id, status, interview_type, skills) VALUES (?, 'active', 'technical', 'python')",
+        (user_id,),
+    ).lastrowid
+    db.commit()
+    return interview_id
+
+
+@pytest.fixture
+def add_message(db, interview_id):
+    """add_message(role, content) -> message id, for the interview fixture."""
+
+    def add(role: str, content: str) -> int:
+        message_id = db.execute(
+            "INSERT INTO interview_messages (interview_id, role, content) VALUES (?, ?, ?)",
+            (interview_id, role, content),
+        ).lastrowid
+        db.commit()
+        return message_id
+
+    return add
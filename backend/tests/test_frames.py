@@ -0,0 +1,60 @@
+import base64
+
+import cv2
+import numpy as np
+
+from agents.proctor import (
+    FORMAT_GRAY,
+    FORMAT_JPEG,
+    FORMAT_RGB,
+    FORMAT_RGBA,
+    FRAME_HEADER,
+    decode_frame,
+)
+
+RED = (255, 0, 0)
+
+
+def frame(fmt: int, body: bytes, width: int = 0, height: int = 0) -> bytes:
+    return FRAME_HEADER.pack(fmt, 0, width, height) + body
+
+
+def red_jpeg() -> bytes:
+    bgr = np.zeros((24, 32, 3), np.uint8)
+    bgr[:] = RED[::-1]
+    ok, encoded = cv2.imencode(".jpg", bgr)
+    assert ok
+    return encoded.tobytes()
+
+
+def test_binary_jpeg_decodes_to_rgb():
+    rgb = decode_frame(frame(FORMAT_JPEG, red_jpeg()))
+    assert rgb.shape == (24, 32, 3)
+    assert np.allclose(rgb[12, 16], RED, atol=8)
+
+
+def test_legacy_base64_data_url_decodes_to_rgb():
+    data_url = "data:image/jpeg;base64," + base64.b64encode(red_jpeg()).decode()
+    rgb = decode_frame(data_url)
+    assert rgb.shape == (24, 32, 3)
+    assert np.allclose(rgb[12, 16], RED, atol=8)
+
+
+def test_raw_frames_decode_without_a_codec():
+    rgb = np.arange(4 * 3 * 3, dtype=np.uint8).reshape(3, 4, 3)
+    assert np.array_equal(decode_frame(frame(FORMAT_RGB, rgb.tobytes(), 4, 3)), rgb)
+
+    rgba = np.dstack([rgb, np.full((3, 4), 255, np.uint8)])
+    assert np.array_equal(decode_frame(frame(FORMAT_RGBA, rgba.tobytes(), 4, 3)), rgb)
+
+    gray = np.full((3, 4), 7, np.uint8)
+    decoded = decode_frame(frame(FORMAT_GRAY, gray.tobytes(), 4, 3))
+    assert decoded.shape == (3, 4, 3)
+    assert (decoded == 7).all()
+
+
+def test_malformed_frames_decode_to_none():
+    assert decode_frame(b"\x00\x00") is None  # shorter than the header
+    assert decode_frame(frame(FORMAT_RGB, b"\x00" * 10, 4, 3)) is None  # wrong size
+    assert decode_frame(frame(9, b"\x00" * 36, 4, 3)) is None  # unknown format
+    assert decode_frame(frame(FORMAT_JPEG, b"not a jpeg")) is None
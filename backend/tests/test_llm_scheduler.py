@@ -0,0 +1,34 @@
+import asyncio
+
+from core.llm_scheduler import BATCH, INTERACTIVE, LLMScheduler, TokenBucket
+
+
+def make_scheduler(tpm: float = 6000) -> LLMScheduler:
+    return LLMScheduler(
+        limits={"m": (30, tpm)},
+        default_rpm=30,
+        default_tpm=tpm,
+        interactive_reserve=0.3,
+        queue_timeouts={INTERACTIVE: 1.0, BATCH: 1.0},
+    )
+
+
+def test_bucket_predicates_agree_in_reserve_band():
+    bucket = TokenBucket(6000)
+    # Between (1 - reserve) * capacity and capacity: only a full bucket admits it
+    assert bucket.has(5000, keep=0.3)
+    assert bucket.seconds_until(5000, keep=0.3) == 0.0
+    bucket.level = 5999
+    assert not bucket.has(5000, keep=0.3)
+    assert bucket.seconds_until(5000, keep=0.3) > 0.0
+
+
+def test_batch_call_in_reserve_band_is_admitted():
+    async def run():
+        scheduler = make_scheduler()
+        await asyncio.wait_for(scheduler.acquire("m", 5000, BATCH), 0.5)
+        return scheduler.stats()["classes"][BATCH]
+
+    stats = asyncio.run(run())
+    assert stats["admitted"] == 1
+    assert stats["timed_out"] == 0
@@ -0,0 +1,84 @@
+import sqlite3
+from datetime import datetime, timedelta
+
+from core import proctor_events as proctor_events_module
+from core.proctor_events import FLUSH_RETRIES, ProctorEventStore
+
+T0 = datetime(2026, 1, 1, 12, 0, 0)
+
+
+def make_store(max_buffer: int = 100) -> ProctorEventStore:
+    return ProctorEventStore(flush_interval=60, max_buffer=max_buffer, gap_seconds=10)
+
+
+def at(seconds: float) -> datetime:
+    return T0 + timedelta(seconds=seconds)
+
+
+def test_repeated_events_are_stored_as_intervals(db, interview_id):
+    store = make_store()
+    for second in (0, 2, 4):
+        store.record(interview_id, "NO_FACE", at(second))
+    store.record(interview_id, "OK", at(5))
+    store.record(interview_id, "OK", at(30))  # beyond the gap: a new interval
+
+    timeline = store.timeline(interview_id)
+    assert [(e["event_type"], e["count"]) for e in timeline] == [
+        ("NO_FACE", 3),
+        ("OK", 1),
+        ("OK", 1),
+    ]
+    assert timeline[0]["duration_seconds"] == 4.0
+    assert store.summary(interview_id)["OK"] == {"occurrences": 2, "events": 2, "total_seconds": 0.0}
+
+
+def test_flushed_interval_is_extended_in_place(db, interview_id):
+    store = make_store()
+    store.record(interview_id, "LOOKING_LEFT", at(0))
+    store.flush()
+    store.record(interview_id, "LOOKING_LEFT", at(3))
+    store.flush()
+
+    rows = db.execute("SELECT count, ended_at FROM proctor_events").fetchall()
+    assert [(r["count"], r["ended_at"]) for r in rows] == [(2, at(3).isoformat())]
+
+
+def test_unknown_interview_is_dropped_without_blocking_the_batch(db, interview_id):
+    store = make_store()
+    store.record(interview_id + 1000, "NO_FACE", at(0))
+    store.record(interview_id, "NO_FACE", at(0))
+    store.flush()
+
+    assert store.dropped == 1
+    assert store._dirty == []
+    rows = db.execute("SELECT interview_id FROM proctor_events").fetchall()
+    assert [r["interview_id"] for r in rows] == [interview_id]
+
+
+def test_transient_errors_are_retried_a_bounded_number_of_times(db, interview_id, monkeypatch):
+    class LockedConnection:
+        def execute(self, *args):
+            raise sqlite3.OperationalError("database is locked")
+
+        def close(self):
+            pass
+
+    monkeypatch.setattr(proctor_events_module, "connect", LockedConnection)
+    store = make_store()
+    store.record(interview_id, "NO_FACE", at(0))
+    for _ in range(FLUSH_RETRIES):
+        store.flush()
+        assert len(store._dirty) == 1
+    store.flush()
+    assert store._dirty == []
+    assert store.dropped == 1
+
+
+def test_full_buffer_wakes_the_flusher_instead_of_writing(db, interview_id):
+    store = make_store(max_buffer=2)
+    store.record(interview_id, "NO_FACE", at(0))
+    assert not store._wake.is_set()
+    store.record(interview_id, "OK", at(1))
+
+    assert store._wake.is_set()
+    assert db.execute("SELECT COUNT(*) FROM proctor_events").fetchone()[0] == 0
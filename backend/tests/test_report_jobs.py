@@ -0,0 +1,93 @@
+import asyncio
+
+import pytest
+
+from agents import report_jobs as report_jobs_module
+from agents.learning_path import learning_path_agent
+from agents.report_jobs import DONE, FAILED, QUEUED, RUNNING, ReportJobQueue, generate_report
+from agents.scorer import scorer
+from core.config import settings
+from core.llm import llm_client
+
+
+def make_queue(workers: int = 0) -> ReportJobQueue:
+    return ReportJobQueue(workers=workers, max_attempts=2, retry_base_s=30)
+
+
+def run_next(queue: ReportJobQueue):
+    job, wait = queue._claim()
+    assert job is not None, f"no job due (next in {wait}s)"
+    asyncio.run(queue._run(job))
+
+
+def test_job_is_done_once_the_report_is_generated(db, interview_id, monkeypatch):
+    stages = []
+
+    async def generate(conn, job_interview_id, on_stage):
+        on_stage("pdf")
+        stages.append(job_interview_id)
+        return 42
+
+    monkeypatch.setattr(report_jobs_module, "generate_report", generate)
+    queue = make_queue()
+    queue.enqueue(db, interview_id)
+    run_next(queue)
+
+    job = queue.get(db, interview_id)
+    assert stages == [interview_id]
+    assert (job["status"], job["stage"], job["attempts"], job["report_id"]) == (DONE, DONE, 1, 42)
+
+
+def test_failed_job_is_retried_with_backoff_then_marked_failed(db, interview_id, monkeypatch):
+    async def generate(conn, job_interview_id, on_stage):
+        raise RuntimeError("LLM unavailable")
+
+    monkeypatch.setattr(report_jobs_module, "generate_report", generate)
+    queue = make_queue()
+    queue.enqueue(db, interview_id)
+
+    run_next(queue)
+    job = queue.get(db, interview_id)
+    assert (job["status"], job["attempts"], job["error"]) == (QUEUED, 1, "LLM unavailable")
+    job_now, wait = queue._claim()
+    assert job_now is None and wait > 0  # backing off
+
+    db.execute("UPDATE report_jobs SET next_attempt_at = 0")
+    db.commit()
+    run_next(queue)
+    job = queue.get(db, interview_id)
+    assert (job["status"], job["attempts"]) == (FAILED, 2)
+
+
+def test_start_requeues_jobs_interrupted_by_a_restart(db, interview_id):
+    queue = make_queue()
+    queue.enqueue(db, interview_id)
+    job, _ = queue._claim()
+    assert queue.get(db, interview_id)["status"] == RUNNING
+
+    async def restart():
+        queue.start()
+        await queue.stop()
+
+    asyncio.run(restart())
+    assert queue.get(db, interview_id)["status"] == QUEUED
+
+
+@pytest.mark.parametrize("answer_scoring", [True, False])
+def test_llm_failure_fails_the_report_instead_of_using_mock_scores(
+    db, interview_id, add_message, monkeypatch, answer_scoring
+):
+    async def chat(*args, **kwargs):
+        raise RuntimeError("LLM unavailable")
+
+    # Per-answer grades, or (without them) the whole-transcript score
+    monkeypatch.setattr(settings, "ANSWER_SCORING", answer_scoring)
+    monkeypatch.setattr(scorer, "enabled", True)
+    monkeypatch.setattr(learning_path_agent, "enabled", True)
+    monkeypatch.setattr(llm_client, "chat", chat)
+    add_message("ai", "Tell me about a project.")
+    add_message("user", "I built an order service.")
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(generate_report(db, interview_id))
+    assert db.execute("SELECT COUNT(*) FROM interview_reports").fetchone()[0] == 0
@@ -0,0 +1,100 @@
+import asyncio
+import json
+
+import pytest
+
+from agents import scorer as scorer_module
+from agents.scorer import TIME_EXPIRED_ANSWER, ScorerAgent, is_gradable
+
+GRADE = {
+    "technical_score": 80,
+    "communication_score": 70,
+    "hr_score": 60,
+    "strength": "clear examples",
+    "improvement": "more depth",
+    "note": "Solid answer.",
+}
+
+
+@pytest.fixture
+def scorer():
+    agent = ScorerAgent()
+    agent.enabled = True
+    return agent
+
+
+def fake_llm(monkeypatch, replies):
+    """Each call returns the next reply; an Exception reply is raised."""
+    replies = iter(replies)
+
+    async def chat(*args, **kwargs):
+        reply = next(replies)
+        if isinstance(reply, Exception):
+            raise reply
+        return reply
+
+    monkeypatch.setattr(scorer_module.llm_client, "chat", chat)
+
+
+def answer_score(technical, communication, hr, strength="", improvement="", note=""):
+    return {
+        "technical_score": technical,
+        "communication_score": communication,
+        "hr_score": hr,
+        "strength": strength,
+        "improvement": improvement,
+        "note": note,
+    }
+
+
+def test_time_up_placeholder_is_not_gradable():
+    assert is_gradable("I used FastAPI.")
+    assert not is_gradable(TIME_EXPIRED_ANSWER)
+    assert not is_gradable("   ")
+
+
+def test_aggregate_averages_answers(scorer, monkeypatch):
+    fake_llm(monkeypatch, ["Overall a good interview."])
+    answers = [
+        answer_score(90, 80, 70, strength="system design", improvement="pace"),
+        answer_score(50, 60, 40, strength="honesty", improvement="sql depth"),
+    ]
+
+    scores = asyncio.run(scorer.aggregate(answers, "technical", "python"))
+
+    assert scores["technical_score"] == 70
+    assert scores["communication_score"] == 70
+    assert scores["hr_score"] == 55
+    assert scores["overall_score"] == 65
+    # Strengths from the best answer first, improvements from the weakest first
+    assert scores["strengths"] == ["system design", "honesty"]
+    assert scores["improvements"] == ["sql depth", "pace"]
+    assert scores["summary"] == "Overall a good interview."
+
+
+def test_finish_answers_grades_missing_answers_but_not_time_up(
+    scorer, monkeypatch, db, interview_id, add_message
+):
+    fake_llm(monkeypatch, [json.dumps(GRADE)])
+    add_message("ai", "Tell me about a project.")
+    answer_id = add_message("user", "I built an order service.")
+    add_message("ai", "How did you test it?")
+    add_message("user", TIME_EXPIRED_ANSWER)
+
+    scores = asyncio.run(scorer.finish_answers(db, interview_id, "technical", "python"))
+
+    assert [s["message_id"] for s in scores] == [answer_id]
+    assert scores[0]["technical_score"] == 80
+
+
+def test_finish_answers_raises_when_an_answer_stays_ungraded(
+    scorer, monkeypatch, db, interview_id, add_message
+):
+    fake_llm(monkeypatch, [json.dumps(GRADE), RuntimeError("LLM unavailable")])
+    add_message("ai", "Question one?")
+    add_message("user", "Answer one.")
+    add_message("ai", "Question two?")
+    add_message("user", "Answer two.")
+
+    with pytest.raises(RuntimeError, match="1 of 2 answers"):
+        asyncio.run(scorer.finish_answers(db, interview_id, "technical", "python"))
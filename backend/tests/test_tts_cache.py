@@ -0,0 +1,76 @@
+import os
+import time
+
+import pytest
+
+from agents.tts_cache import RESYNTH_MAX_FAILURES, TTSCache
+
+VOICE = "test-voice"
+
+
+@pytest.fixture
+def cache(db, tmp_path):
+    cache = TTSCache(directory=str(tmp_path / "audio"), workers=1)
+    yield cache
+    cache.shutdown()
+
+
+def write_audio(text: str, path: str):
+    with open(path, "wb") as f:
+        f.write(b"ID3" + text.encode("utf-8"))
+
+
+def fail(text: str, path: str):
+    raise RuntimeError("TTS unavailable")
+
+
+def drain(cache: TTSCache):
+    """Wait for background syntheses, including their completion callbacks."""
+    cache._executor.shutdown(wait=True)
+    cache._executor = None
+
+
+def test_submit_synthesizes_in_background_and_forgets_the_text(cache):
+    path = cache.submit("Hello   there.", VOICE, write_audio)
+    name = os.path.basename(path)
+    drain(cache)
+
+    with open(path, "rb") as f:
+        assert f.read() == b"ID3Hello there."
+    assert cache.pending(name) is None
+    assert cache.requested(name, VOICE) is None
+    # Same text again is a cache hit, no new job
+    assert cache.submit("Hello there.", VOICE, fail) == path
+    assert cache.pending(name) is None
+
+
+def test_failed_synthesis_keeps_the_text_and_backs_off(cache):
+    name = os.path.basename(cache.submit("Hello there.", VOICE, fail))
+    drain(cache)
+
+    request = cache.requested(name, VOICE)
+    assert request["text"] == "Hello there."
+    assert request["retry_at"] > time.time()
+    assert cache.requested(name, "another-voice") is None
+
+
+def test_text_is_dropped_after_repeated_failures(cache):
+    for _ in range(RESYNTH_MAX_FAILURES):
+        name = os.path.basename(cache.submit("Hello there.", VOICE, fail))
+        drain(cache)
+    assert cache.requested(name, VOICE) is None
+
+
+def test_lost_synthesis_can_be_restarted_from_the_stored_text(cache):
+    name = os.path.basename(cache.submit("Hello there.", VOICE, fail))
+    drain(cache)
+
+    # After a restart only the database remembers the request
+    restarted = TTSCache(directory=cache.directory, workers=1)
+    request = restarted.requested(name, VOICE)
+    path = restarted.submit(request["text"], VOICE, write_audio)
+    drain(restarted)
+
+    assert os.path.basename(path) == name
+    assert os.path.exists(path)
+    assert restarted.requested(name, VOICE) is None
@@ -105,35 +105,46 @@ export default function InterviewPage({ user, config, onFinished }) {
     // ── WebSocket Proctoring ─────────────────────────────────────────────────
     useEffect(() => {
         const ws = new WebSocket(`ws://localhost:8000/ws/proctor/${interviewId}`);
+        let captureInterval = 1500; // server adapts this to its analysis rate
+        let captureTimer = null;
         ws.onmessage = (e) => {
             const data = JSON.parse(e.data);
+            if (data.analysis_interval_ms) captureInterval = data.analysis_interval_ms;
             setAlertStatus(data.alert);
             if (data.terminate) {
                 handleTerminate('proctoring_violation');
                 return;
             }
             // Count warnings for non-OK, non-ERROR
-            if (data.alert !== 'OK' && data.alert !== 'ERROR' && data.alert !== 'INVALID') {
+            if (!['OK', 'ERROR', 'INVALID', 'PENDING'].includes(data.alert)) {
                 triggerWarning();
             }
         };
         ws.onerror = () => { };
         socketRef.current = ws;
 
-        const interval = setInterval(() => {
+        const captureFrame = () => {
             if (videoRef.current?.readyState === 4 && socketRef.current?.readyState === 1) {
                 const ctx = canvasRef.current?.getContext('2d');
                 if (ctx) {
                     ctx.drawImage(videoRef.current, 0, 0, 320, 240);
-                    socketRef.current.send(
-                        JSON.stringify({ image: canvasRef.current.toDataURL('image/jpeg') })
-                    );
+                    // Binary frame: 6-byte header (format=JPEG, width, height) + JPEG bytes
+                    canvasRef.current.toBlob((blob) => {
+                        if (!blob || socketRef.current?.readyState !== 1) return;
+                        const header = new DataView(new ArrayBuffer(6));
+                        header.setUint8(0, 0);
+                        header.setUint16(2, 320, true);
+                        header.setUint16(4, 240, true);
+                        socketRef.current.send(new Blob([header.buffer, blob]));
+                    }, 'image/jpeg', 0.8);
                 }
             }
-        }, 1500);
+            captureTimer = setTimeout(captureFrame, captureInterval);
+        };
+        captureTimer = setTimeout(captureFrame, captureInterval);
 
         return () => {
-            clearInterval(interval);
+            clearTimeout(captureTimer);
             socketRef.current?.close();
         };
     }, [interviewId]);
@@ -220,6 +231,56 @@ export default function InterviewPage({ user, config, onFinished }) {
         }, 4000);
     };
 
+    // ── Streaming chat (SSE over fetch) ───────────────────────────────────────
+    const streamChat = async (formData, onToken, onAudio) => {
+        const res = await fetch(`${API_BASE}/api/interview/chat/stream`, {
+            method: 'POST',
+            headers: authHeaders(),
+            body: formData,
+        });
+        if (!res.ok || !res.body) throw new Error(`chat stream failed: ${res.status}`);
+
+        const reader = res.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = '';
+        for (;;) {
+            const { value, done } = await reader.read();
+            if (done) break;
+            buffer += decoder.decode(value, { stream: true });
+            let sep;
+            while ((sep = buffer.indexOf('\n\n')) !== -1) {
+                const block = buffer.slice(0, sep);
+                buffer = buffer.slice(sep + 2);
+                const event = /^event: (.*)$/m.exec(block)?.[1];
+                const data = JSON.parse(/^data: (.*)$/m.exec(block)?.[1] || '{}');
+                if (event === 'token') onToken(data.text);
+                else if (event === 'audio') onAudio?.(data.audio_url);
+                else if (event === 'done') return data;
+            }
+        }
+        throw new Error('chat stream ended early');
+    };
+
+    // Plays audio segments back to back in the order they were queued
+    const segmentPlayer = () => {
+        const queue = [];
+        let count = 0;
+        let playing = false;
+        const playNext = () => {
+            const url = queue.shift();
+            if (!url) { playing = false; return; }
+            playing = true;
+            const audio = new Audio(url);
+            audio.onended = playNext;
+            audio.onerror = playNext;
+            audio.play().catch(playNext);
+        };
+        return {
+            enqueue: (url) => { count += 1; queue.push(url); if (!playing) playNext(); },
+            count: () => count,
+        };
+    };
+
     // ── Voice Answer ──────────────────────────────────────────────────────────
     const submitVoiceAnswer = () => {
         const SR = window.SpeechRecognition || window.webkitSpeechRecognition;
@@ -245,15 +306,20 @@ export default function InterviewPage({ user, config, onFinished }) {
             formData.append('elapsed_seconds', elapsedRef.current);
 
             try {
-                const res = await axios.post(`${API_BASE}/api/interview/chat`, formData, { headers: authHeaders() });
-                const aiText = res.data.question;
-                setQuestion(aiText);
-                setRound(res.data.round);
-                setTranscript(prev => [...prev, { role: 'ai', text: aiText }]);
-                const audio = new Audio(res.data.audio_url);
-                audio.play().catch(() => { });
-
-                if (res.data.is_finished) {
+                // Stream the reply so the question appears word by word
+                let aiText = '';
+                const player = segmentPlayer();
+                setTranscript(prev => [...prev, { role: 'ai', text: '' }]);
+                const done = await streamChat(formData, (delta) => {
+                    aiText += delta;
+                    setQuestion(aiText);
+                    setTranscript(prev => [...prev.slice(0, -1), { role: 'ai', text: aiText }]);
+                }, player.enqueue);
+                setRound(done.round);
+                // Sentence segments may already be playing; queue whatever is left
+                done.audio_segments.slice(player.count()).forEach(player.enqueue);
+
+                if (done.is_finished) {
                     setPhase('finished');
                     clearInterval(timerRef.current);
                     streamRef.current?.getTracks().forEach(t => t.stop());
@@ -261,7 +327,7 @@ export default function InterviewPage({ user, config, onFinished }) {
                 } else {
                     setPhase('interviewing');
                 }
-                if (res.data.time_warning) setTimeWarning(true);
+                if (done.time_warning) setTimeWarning(true);
             } catch (err) {
                 setPhase('interviewing');
                 showToast('Failed to send answer. Backend running?', 'error');
@@ -287,10 +353,11 @@ export default function InterviewPage({ user, config, onFinished }) {
         LOOKING_LEFT: 'Looking away!',
         LOOKING_RIGHT: 'Looking away!',
         INVALID: 'Invalid frame',
+        PENDING: 'Proctoring: Starting…',
         ERROR: 'Proctoring error',
     }[alertStatus] || alertStatus;
 
-    const isAlert = alertStatus !== 'OK';
+    const isAlert = alertStatus !== 'OK' && alertStatus !== 'PENDING';
     const timerClass = timeLeft <= 0
         ? 'danger'
         : timeLeft <= 60 ? 'warning' : '';
@@ -19,6 +19,7 @@ const scoreColors = ['#6366f1', '#10b981', '#f59e0b', '#ec4899'];
 export default function ReportPage({ user, interviewId, onBack, onNewInterview }) {
     const [data, setData] = useState(null);
     const [loading, setLoading] = useState(true);
+    const [job, setJob] = useState(null);
     const [activeTab, setActiveTab] = useState('overview');
     const { showToast, ToastNode } = useToast();
 
@@ -29,6 +30,13 @@ export default function ReportPage({ user, interviewId, onBack, onNewInterview }
     const fetchReport = async () => {
         try {
             const res = await axios.get(`${API_BASE}/api/report/${interviewId}`, { headers: authHeaders() });
+            if (res.status === 202) {
+                // Report job queued or running — show its stage and poll again
+                setJob(res.data);
+                setTimeout(fetchReport, 2000);
+                return;
+            }
+            setJob(null);
             setData(res.data);
         } catch (err) {
             if (err.response?.status === 404) {
@@ -36,10 +44,17 @@ export default function ReportPage({ user, interviewId, onBack, onNewInterview }
                 setTimeout(fetchReport, 3000);
                 return;
             }
-            showToast('Failed to load report', 'error');
-        } finally {
-            setLoading(false);
+            showToast(err.response?.data?.status === 'failed' ? 'Report generation failed' : 'Failed to load report', 'error');
         }
+        setLoading(false);
+    };
+
+    const jobStages = {
+        queued: 'Waiting in the report queue…',
+        starting: 'Starting…',
+        scoring: 'Scoring your answers…',
+        learning_path: 'Creating your learning path…',
+        pdf: 'Rendering the PDF report…',
     };
 
     const downloadPDF = async () => {
@@ -73,7 +88,9 @@ export default function ReportPage({ user, interviewId, onBack, onNewInterview }
                 <div style={{ flex: 1, display: 'flex', flexDirection: 'column', alignItems: 'center', justifyContent: 'center', gap: 20 }}>
                     <Spinner large />
                     <div style={{ color: 'var(--text-secondary)', fontSize: '1rem' }}>Generating your personalized report…</div>
-                    <div style={{ color: 'var(--text-muted)', fontSize: '0.82rem' }}>Analyzing answers and creating learning path</div>
+                    <div style={{ color: 'var(--text-muted)', fontSize: '0.82rem' }}>
+                        {job ? `${jobStages[job.stage] || job.stage}${job.attempts > 1 ? ` (attempt ${job.attempts})` : ''}` : 'Analyzing answers and creating learning path'}
+                    </div>
                 </div>
             </div>
         );